@@ -0,0 +1,36 @@
+# Boot phase timings for the cold-start report
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class StartupTimer:
+    """Records how long each boot phase (imports, schema check, ...) took"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    def record(self, name: str, started: float):
+        self.phases[name] = time.perf_counter() - started
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started)
+
+    def report(self) -> Dict:
+        return {
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+            "total_ms": round(sum(self.phases.values()) * 1000, 1),
+        }
+
+    def print_report(self):
+        report = self.report()
+        phases = ", ".join(f"{name} {ms:.0f}ms" for name, ms in report["phases_ms"].items())
+        print(f"⏱️  Startup took {report['total_ms']:.0f}ms ({phases})")
+
+
+startup_timer = StartupTimer()
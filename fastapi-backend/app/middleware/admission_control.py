@@ -0,0 +1,139 @@
+import asyncio
+import json
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class RouteBudget:
+    """Concurrency slots and a bounded wait queue for one group of routes"""
+
+    def __init__(self, name: str, concurrency: int, queue: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.active = 0
+        self.waiting = 0
+        self.shed = 0
+        self.service_time = 0.0  # Moving average of seconds per request, for Retry-After
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created on first use so it binds to the serving event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from queue depth and service time"""
+        return max(1, math.ceil(self.service_time * (self.waiting + 1) / self.concurrency))
+
+    def record(self, seconds: float):
+        self.service_time = seconds if not self.service_time else 0.8 * self.service_time + 0.2 * seconds
+
+    def stats(self) -> Dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue": self.queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "shed": self.shed,
+        }
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware limiting concurrent requests per route group.
+
+    Each budget admits ``concurrency`` requests at a time and lets up to
+    ``queue`` more wait. Requests beyond the queue, or waiting longer than
+    ``queue_timeout``, are shed with ``503`` and ``Retry-After`` so expensive
+    routes cannot starve the cheap ones of the event loop and DB pool.
+    Paths under ``exempt_prefixes`` pass straight through; they are for
+    routes such as ``/api/batch`` whose sub-requests are admitted one by one
+    against their own budgets (holding a slot for the batch while its parts
+    wait for slots could deadlock the budget).
+    """
+
+    def __init__(
+        self,
+        app,
+        budgets: Dict[str, Dict],
+        queue_timeout: float = 5.0,
+        enabled: bool = True,
+        exempt_prefixes: Iterable[str] = (),
+    ):
+        self.app = app
+        self.enabled = enabled
+        self.queue_timeout = queue_timeout
+        self.exempt_prefixes = tuple(exempt_prefixes)
+        self.budgets = {
+            name: RouteBudget(name, config["concurrency"], config["queue"])
+            for name, config in budgets.items()
+        }
+        # Longest prefix first so specific groups win over "/api"
+        self.prefixes: List[Tuple[str, RouteBudget]] = sorted(
+            ((prefix, self.budgets[name]) for name, config in budgets.items() for prefix in config["prefixes"]),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        admission_controllers.append(self)
+
+    def budget_for(self, path: str) -> Optional[RouteBudget]:
+        if path.startswith(self.exempt_prefixes):
+            return None
+        for prefix, budget in self.prefixes:
+            if path.startswith(prefix):
+                return budget
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        budget = self.budget_for(scope["path"])
+        if budget is None:
+            return await self.app(scope, receive, send)
+
+        semaphore = budget.semaphore
+        if semaphore.locked():
+            if budget.waiting >= budget.queue:
+                return await self._shed(budget, send)
+            budget.waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                return await self._shed(budget, send)
+            finally:
+                budget.waiting -= 1
+        else:
+            await semaphore.acquire()
+
+        budget.active += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            budget.record(time.perf_counter() - started)
+            budget.active -= 1
+            semaphore.release()
+
+    async def _shed(self, budget: RouteBudget, send):
+        budget.shed += 1
+        body = json.dumps({"detail": "Server is busy, please retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(budget.retry_after()).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def stats(self) -> Dict[str, Dict]:
+        return {name: budget.stats() for name, budget in self.budgets.items()}
+
+
+# Instances built by the app's middleware stack, for reporting
+admission_controllers: List[AdmissionControlMiddleware] = []
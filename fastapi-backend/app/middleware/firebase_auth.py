@@ -1,31 +1,48 @@
-import firebase_admin
-from firebase_admin import auth, credentials
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
+import threading
 from typing import Optional
 from app.core.config import settings
 
+_firebase_lock = threading.Lock()
+_firebase_initialized = False
+
 # Initialize Firebase Admin SDK
 def initialize_firebase():
-    """Initialize Firebase Admin SDK if not already initialized"""
-    if not firebase_admin._apps:
-        try:
-            # Try to use service account file
-            if os.path.exists(settings.FIREBASE_CREDENTIALS_PATH):
-                cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_PATH)
-                firebase_admin.initialize_app(cred)
-            else:
-                # Use default credentials (for deployed environments)
-                firebase_admin.initialize_app()
-            print("✅ Firebase Admin SDK initialized")
-        except Exception as e:
-            print(f"❌ Failed to initialize Firebase: {e}")
-            # For development, you might want to continue without Firebase
-            pass
+    """Initialize Firebase Admin SDK if not already initialized (attempted once per process)"""
+    global _firebase_initialized
+    if _firebase_initialized:
+        return
+
+    with _firebase_lock:
+        if _firebase_initialized:
+            return
+        import firebase_admin
+        from firebase_admin import credentials
+
+        if not firebase_admin._apps:
+            try:
+                # Try to use service account file
+                if os.path.exists(settings.FIREBASE_CREDENTIALS_PATH):
+                    cred = credentials.Certificate(settings.FIREBASE_CREDENTIALS_PATH)
+                    firebase_admin.initialize_app(cred)
+                else:
+                    # Use default credentials (for deployed environments)
+                    firebase_admin.initialize_app()
+                print("✅ Firebase Admin SDK initialized")
+            except Exception as e:
+                print(f"❌ Failed to initialize Firebase: {e}")
+                # For development, you might want to continue without Firebase
+                pass
+        _firebase_initialized = True
+
+def get_firebase_auth():
+    """Firebase auth module, imported and initialized on the first authenticated request"""
+    from firebase_admin import auth
 
-# Initialize Firebase on import
-initialize_firebase()
+    initialize_firebase()
+    return auth
 
 # Security scheme
 security = HTTPBearer()
@@ -44,6 +61,7 @@ async def verify_firebase_token(
     """
     Verify Firebase ID token and return user information
     """
+    auth = get_firebase_auth()
     try:
         # Verify the ID token
         decoded_token = auth.verify_id_token(credentials.credentials)
@@ -62,12 +80,12 @@ async def verify_firebase_token(
         
         return FirebaseUser(uid=uid, email=email, name=name, picture=picture)
         
-    except firebase_admin.auth.InvalidIdTokenError:
+    except auth.InvalidIdTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication token"
         )
-    except firebase_admin.auth.ExpiredIdTokenError:
+    except auth.ExpiredIdTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication token has expired"
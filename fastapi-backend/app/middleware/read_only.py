@@ -0,0 +1,31 @@
+import json
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadOnlyMiddleware:
+    """ASGI middleware rejecting writes while serving a read-only snapshot.
+
+    ``exempt`` prefixes (the batch endpoint) may still POST; their
+    sub-requests pass through this middleware again on their own.
+    """
+
+    def __init__(self, app, exempt=("/api/batch",)):
+        self.app = app
+        self.exempt = tuple(exempt)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or scope["path"].startswith(self.exempt):
+            return await self.app(scope, receive, send)
+
+        body = json.dumps({"detail": "This server is a read-only snapshot"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 405,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"allow", b"GET, HEAD, OPTIONS"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
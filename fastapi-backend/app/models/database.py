@@ -1,31 +1,75 @@
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, inspect, text, MetaData, Table, Column, String, DateTime, select, delete, insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 import asyncio
+import hashlib
+import os
+from contextvars import ContextVar
+from datetime import datetime
 from app.core.config import settings
 
 # Create sync engine for compatibility
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+if settings.SNAPSHOT_PATH:
+    # Immutable snapshot: SQLite skips locking and change detection entirely
+    SQLALCHEMY_DATABASE_URL = f"sqlite:///file:{os.path.abspath(settings.SNAPSHOT_PATH)}?mode=ro&immutable=1&uri=true"
+else:
+    SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 engine = create_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create async engine for better performance
-if settings.DATABASE_URL.startswith("sqlite"):
-    ASYNC_DATABASE_URL = settings.DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///")
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    ASYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///")
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
 else:
     ASYNC_DATABASE_URL = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-async_engine = create_async_engine(ASYNC_DATABASE_URL)
+    # Pooled connections are reused across requests instead of reconnecting per call
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+    )
 AsyncSessionLocal = async_sessionmaker(
     async_engine, class_=AsyncSession, expire_on_commit=False
 )
 
+if settings.SNAPSHOT_PATH:
+    def _snapshot_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA mmap_size = {settings.SNAPSHOT_MMAP_SIZE}")
+        cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+    event.listen(engine, "connect", _snapshot_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _snapshot_pragmas)
+
 # Base class for models
 Base = declarative_base()
 metadata = MetaData()
 
+# Fingerprint of the model metadata applied to this database (kept outside Base.metadata)
+schema_version = Table(
+    "schema_version",
+    metadata,
+    Column("version", String(64), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+# Set by POST /api/batch so its read-only sub-requests reuse one session
+shared_session: ContextVar = ContextVar("shared_session", default=None)
+
 # Dependency to get DB session
 def get_db():
+    shared = shared_session.get()
+    if shared is not None:
+        # Closed by whoever shared it
+        yield shared
+        return
     db = SessionLocal()
     try:
         yield db
@@ -42,7 +86,65 @@ async def create_tables():
     async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+def schema_fingerprint() -> str:
+    """Hash of every table, column, type and index declared on the models"""
+    parts = []
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        parts.append(table.name)
+        parts.extend(f"{c.name}:{c.type}:{c.nullable}" for c in table.columns)
+        parts.extend(sorted(str(i.name) for i in table.indexes))
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+def existing_index_names(connection) -> set:
+    if connection.dialect.name == "sqlite":
+        # The SQLite inspector leaves out expression indexes
+        return set(connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+    inspector = inspect(connection)
+    return {index["name"] for table in inspector.get_table_names() for index in inspector.get_indexes(table)}
+
+def create_missing_indexes(connection):
+    """Create declared indexes that do not exist yet.
+
+    ``create_all`` skips existing tables, so it never adds an index declared
+    after its table was first created.
+    """
+    existing = existing_index_names(connection)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+
+async def ensure_schema() -> bool:
+    """Create tables only when the models changed since the last boot.
+
+    Reads one row from ``schema_version`` instead of inspecting every table.
+    Returns True when tables and missing indexes were created.
+    """
+    version = schema_fingerprint()
+    try:
+        async with async_engine.connect() as conn:
+            applied = (await conn.execute(select(schema_version.c.version))).scalar()
+    except DBAPIError:
+        applied = None  # First boot: no schema_version table yet
+    if applied == version:
+        return False
+    if settings.SNAPSHOT_PATH:
+        raise RuntimeError(f"Snapshot {settings.SNAPSHOT_PATH} was built for a different schema; rebuild it with snapshot.py")
+
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_missing_indexes)
+        await conn.run_sync(metadata.create_all)
+    try:
+        async with async_engine.begin() as conn:
+            await conn.execute(delete(schema_version))
+            await conn.execute(insert(schema_version).values(version=version, applied_at=datetime.utcnow()))
+    except IntegrityError:
+        pass  # Another worker recorded the same version concurrently
+    return True
+
 # Drop tables (for development)
 async def drop_tables():
     async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(metadata.drop_all)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, ForeignKey, LargeBinary, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -57,6 +57,19 @@ class Substation(BaseModel):
     # Relationships
     county = relationship("County", back_populates="substations")
 
+class SubstationStatus(BaseModel):
+    """Substation status (available capacity / constraints) from Django"""
+    __tablename__ = "substation_statuses"
+    
+    substation_id = Column(Integer, ForeignKey("substations.id"), index=True, nullable=False)
+    status_type = Column(String(50), default="heatmap")  # heatmap, constraint
+    available_capacity = Column(Float, nullable=True)  # Available Capacity (MW)
+    no_of_constraints = Column(Integer, nullable=True)
+    is_active = Column(Boolean, default=True)
+    
+    # Relationships
+    substation = relationship("Substation")
+
 class TransmissionLine(BaseModel):
     """Transmission Line model from Django"""
     __tablename__ = "transmission_lines"
@@ -72,6 +85,10 @@ class TransmissionLine(BaseModel):
 class AverageLMP(BaseModel):
     """Average LMP model from Django"""
     __tablename__ = "average_lmp"
+    __table_args__ = (
+        # Per-substation time range scans (by-substation listing, LMP matrix)
+        Index("ix_average_lmp_substation_time", "substation_id", "time"),
+    )
     
     substation_id = Column(Integer, ForeignKey("substations.id"), nullable=False)
     lmp_type = Column(String(50), default="forecast")  # forecast, actual
@@ -85,3 +102,36 @@ class AverageLMP(BaseModel):
     
     # Relationships
     substation = relationship("Substation")
+
+class Document(BaseModel):
+    """Uploaded document for the assistant, deduplicated by content hash per user"""
+    __tablename__ = "documents"
+    __table_args__ = (
+        UniqueConstraint("firebase_uid", "sha256", name="uq_documents_owner_sha256"),
+    )
+
+    firebase_uid = Column(String, index=True, nullable=False)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=True)
+    size = Column(Integer, nullable=False)  # Size in bytes
+    sha256 = Column(String(64), index=True, nullable=False)
+    storage_path = Column(String(500), nullable=False)
+    status = Column(String(20), default="pending")  # pending, processing, completed, failed
+    chunk_count = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+
+    # Relationships
+    chunks = relationship("DocumentChunk", back_populates="document", cascade="all, delete-orphan", passive_deletes=True)
+
+class DocumentChunk(Base):
+    """Text chunk of a document with its embedding"""
+    __tablename__ = "document_chunks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), index=True, nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+    embedding = Column(LargeBinary, nullable=True)  # float32 vector, see app.services.embedding_service
+
+    # Relationships
+    document = relationship("Document", back_populates="chunks")
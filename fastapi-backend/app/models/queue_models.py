@@ -0,0 +1,46 @@
+from sqlalchemy import Column, String, Text, Numeric, Date, Index, func
+from app.models.database import Base
+
+class QueueProject(Base):
+    """Interconnection queue project (QueueInfo table populated by the ISO loaders)"""
+    __tablename__ = "queueinfo"
+
+    iso_id = Column("isoid", String(20), primary_key=True)
+    queue_id = Column("queueid", String(100), primary_key=True)
+    project_name = Column("projectname", String(255), nullable=True)
+    interconnecting_entity = Column("interconnectingentity", String(255), nullable=True)
+    county = Column("county", String(100), nullable=True)
+    state_name = Column("statename", String(100), nullable=True)
+    interconnection_location = Column("interconnectionlocation", String(255), nullable=True)
+    transmission_owner = Column("transmissionowner", String(255), nullable=True)
+    generation_type = Column("generationtype", String(100), nullable=True)
+    capacity_mw = Column("capacitymw", Numeric(10, 2), nullable=True)
+    summer_capacity = Column("summercapacity", Numeric(10, 2), nullable=True)
+    winter_capacity_mw = Column("wintercapacitymw", Numeric(10, 2), nullable=True)
+    queue_date = Column("queuedate", Date, nullable=True)
+    status = Column("status", String(50), nullable=True)
+    proposed_completion_date = Column("proposedcompletiondate", Date, nullable=True)
+    withdrawn_date = Column("withdrawndate", Date, nullable=True)
+    withdrawal_comment = Column("withdrawalcomment", Text, nullable=True)
+    actual_completion_date = Column("actualcompletiondate", Date, nullable=True)
+    additional_info = Column("additionalinfo", Text, nullable=True)
+
+    # Indexes backing the faceted filters and the keyset-paginated sorts.
+    # Sort indexes end with the primary key so a cursor seek is a row-value range
+    # scan. Each sort has an ASC index (ASC NULLS LAST) and a DESC NULLS LAST
+    # one, since scanning the ASC index backwards would put NULLs first. SQLite
+    # rejects NULLS LAST in index definitions, so those are Postgres-only.
+    __table_args__ = (
+        Index("ix_queueinfo_isoid_upper", func.upper(iso_id)),
+        Index("ix_queueinfo_status_upper", func.upper(status)),
+        Index("ix_queueinfo_generationtype", "generationtype"),
+        Index("ix_queueinfo_statename", "statename"),
+        Index("ix_queueinfo_queuedate_pk", "queuedate", "isoid", "queueid"),
+        Index("ix_queueinfo_capacitymw_pk", "capacitymw", "isoid", "queueid"),
+        Index("ix_queueinfo_proposedcompletiondate_pk", "proposedcompletiondate", "isoid", "queueid"),
+        Index("ix_queueinfo_projectname_pk", "projectname", "isoid", "queueid"),
+        Index("ix_queueinfo_queuedate_pk_desc", queue_date.desc().nulls_last(), iso_id.desc(), queue_id.desc()).ddl_if(dialect="postgresql"),
+        Index("ix_queueinfo_capacitymw_pk_desc", capacity_mw.desc().nulls_last(), iso_id.desc(), queue_id.desc()).ddl_if(dialect="postgresql"),
+        Index("ix_queueinfo_proposedcompletiondate_pk_desc", proposed_completion_date.desc().nulls_last(), iso_id.desc(), queue_id.desc()).ddl_if(dialect="postgresql"),
+        Index("ix_queueinfo_projectname_pk_desc", project_name.desc().nulls_last(), iso_id.desc(), queue_id.desc()).ddl_if(dialect="postgresql"),
+    )
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, EmailStr, validator
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, Field, validator
+from typing import Any, Optional, List
+from datetime import date, datetime
+from decimal import Decimal
 from uuid import UUID
 
 # Base schemas
@@ -46,6 +47,9 @@ class SubstationCreate(BaseModel):
     interconnecting_entity: Optional[str] = None
     substation_type: Optional[str] = "transmission"
 
+class SubstationBulkItem(SubstationCreate):
+    id: Optional[int] = None  # Upsert key; omit to insert a new record
+
 class SubstationResponse(BaseResponse):
     name: str
     code: Optional[str]
@@ -67,6 +71,9 @@ class TransmissionLineCreate(BaseModel):
     circuit: Optional[str] = None
     line_type: Optional[str] = None
 
+class TransmissionLineBulkItem(TransmissionLineCreate):
+    id: Optional[int] = None  # Upsert key; omit to insert a new record
+
 class TransmissionLineResponse(BaseResponse):
     name: str
     voltage: float
@@ -98,6 +105,19 @@ class AverageLMPResponse(BaseResponse):
     time: Optional[datetime]
     # Note: substation relationship loaded separately to avoid circular imports
 
+class AverageLMPSeries(BaseModel):
+    substation_id: int
+    values: List[Optional[float]]
+
+class AverageLMPMatrix(BaseModel):
+    bucket: str
+    field: str
+    times: List[datetime]
+    series: List[AverageLMPSeries]
+
+class AverageLMPMatrixResponse(BaseModel):
+    data: AverageLMPMatrix
+
 # API Response schemas
 class HealthResponse(BaseModel):
     status: str
@@ -115,3 +135,109 @@ class SubstationCompareResponse(BaseModel):
 
 class SubstationMappingsResponse(BaseModel):
     data: dict
+
+class SubstationHeatmapResponse(BaseModel):
+    data: dict
+
+class SubstationAutocompleteItem(BaseModel):
+    id: int
+    name: str
+    code: Optional[str]
+    voltage: Optional[float]
+    study_region: Optional[str]
+    utility_area: Optional[str]
+    has_lmp: bool
+    has_status: bool
+
+class SubstationAutocompleteResponse(BaseModel):
+    data: List[SubstationAutocompleteItem]
+
+# Bulk upsert schemas
+class BulkItemResult(BaseModel):
+    index: int
+    status: str  # created, updated, error
+    id: Optional[int] = None
+    errors: Optional[list] = None
+
+class BulkUpsertSummary(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[BulkItemResult]
+
+class BulkUpsertResponse(BaseModel):
+    data: BulkUpsertSummary
+
+# Batch schemas
+class BatchRequestItem(BaseModel):
+    id: Optional[str] = None  # Echoed back to match responses to requests
+    method: str = Field("GET", pattern="^(GET|POST|PUT|DELETE)$")
+    url: str = Field(..., description="Path and query string, e.g. /api/substations/1?fields=name")
+    body: Optional[Any] = None  # Sent as JSON
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem] = Field(..., min_length=1)
+
+class BatchResponseItem(BaseModel):
+    id: Optional[str]
+    status: int
+    body: Optional[Any]
+
+class BatchResponse(BaseModel):
+    data: List[BatchResponseItem]
+
+# Queue project schemas (keys kept compatible with the prototype QueueInfo API)
+class QueueProjectResponse(BaseModel):
+    iso_id: str = Field(serialization_alias="IsoID")
+    queue_id: str = Field(serialization_alias="QueueID")
+    project_name: Optional[str] = Field(None, serialization_alias="ProjectName")
+    interconnecting_entity: Optional[str] = Field(None, serialization_alias="InterconnectingEntity")
+    county: Optional[str] = Field(None, serialization_alias="County")
+    state_name: Optional[str] = Field(None, serialization_alias="StateName")
+    interconnection_location: Optional[str] = Field(None, serialization_alias="InterconnectionLocation")
+    transmission_owner: Optional[str] = Field(None, serialization_alias="TransmissionOwner")
+    generation_type: Optional[str] = Field(None, serialization_alias="GenerationType")
+    capacity_mw: Optional[Decimal] = Field(None, serialization_alias="CapacityMW")
+    summer_capacity: Optional[Decimal] = Field(None, serialization_alias="SummerCapacity")
+    winter_capacity_mw: Optional[Decimal] = Field(None, serialization_alias="WinterCapacityMW")
+    queue_date: Optional[date] = Field(None, serialization_alias="QueueDate")
+    status: Optional[str] = Field(None, serialization_alias="Status")
+    proposed_completion_date: Optional[date] = Field(None, serialization_alias="ProposedCompletionDate")
+    withdrawn_date: Optional[date] = Field(None, serialization_alias="WithdrawnDate")
+    withdrawal_comment: Optional[str] = Field(None, serialization_alias="WithdrawalComment")
+    actual_completion_date: Optional[date] = Field(None, serialization_alias="ActualCompletionDate")
+    additional_info: Optional[str] = Field(None, serialization_alias="AdditionalInfo")
+
+    class Config:
+        from_attributes = True
+
+class QueueProjectPageResponse(BaseModel):
+    count: Optional[int] = None  # Only computed for the first page
+    next_cursor: Optional[str] = None
+    results: List[QueueProjectResponse]
+
+class QueueProjectFacetsResponse(BaseModel):
+    data: dict
+
+# Document schemas
+class DocumentResponse(BaseResponse):
+    filename: str
+    content_type: Optional[str]
+    size: int
+    sha256: str
+    status: str
+    chunk_count: int
+    error: Optional[str]
+
+class DocumentUploadResponse(BaseModel):
+    data: DocumentResponse
+    duplicate: bool
+
+# Chat schemas
+class ChatMessage(BaseModel):
+    role: str = Field(..., pattern="^(user|assistant)$")
+    content: str
+
+class ChatRequest(BaseModel):
+    message: str = Field(..., min_length=1, max_length=4000)
+    history: List[ChatMessage] = []
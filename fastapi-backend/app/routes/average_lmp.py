@@ -4,8 +4,12 @@ from typing import List, Optional
 from datetime import datetime
 from app.models.database import get_db
 from app.models.models import AverageLMP, Substation
-from app.models.schemas import AverageLMPResponse, AverageLMPCreate
+from app.models.schemas import AverageLMPResponse, AverageLMPCreate, AverageLMPMatrixResponse
 from app.middleware.firebase_auth import verify_firebase_token, FirebaseUser, optional_firebase_token
+from app.core.config import settings
+from app.services.lmp_service import build_matrix, naive_utc, BUCKETS, VALUE_FIELDS, MatrixTooLargeError
+from app.services.autocomplete_service import autocomplete_index
+from app.services.fieldsets import Fieldset, sparse_fields
 
 router = APIRouter()
 
@@ -17,6 +21,7 @@ async def get_average_lmp(
     lmp_type: Optional[str] = Query(None, description="Filter by LMP type (forecast/actual)"),
     start_time: Optional[datetime] = Query(None, description="Start time filter"),
     end_time: Optional[datetime] = Query(None, description="End time filter"),
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(AverageLMPResponse, AverageLMP)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
@@ -47,20 +52,81 @@ async def get_average_lmp(
     # Order by time
     query = query.order_by(AverageLMP.time)
     
+    if fieldset:
+        return fieldset.response(fieldset.apply(query).offset(skip).limit(limit).all())
+    
     average_lmp_data = query.offset(skip).limit(limit).all()
     return average_lmp_data
 
+@router.get("/matrix", response_model=AverageLMPMatrixResponse)
+async def get_average_lmp_matrix(
+    substation_ids: str = Query(..., description="Comma-separated list of substation IDs"),
+    start: datetime = Query(..., description="Start of the time range"),
+    end: datetime = Query(..., description="End of the time range"),
+    bucket: str = Query("hour", pattern=f"^({'|'.join(BUCKETS)})$", description="Time bucket; raw keeps the stored timestamps"),
+    field: str = Query("total_lmp", pattern=f"^({'|'.join(VALUE_FIELDS)})$", description="LMP component to return"),
+    lmp_type: Optional[str] = Query(None, description="Filter by LMP type (forecast/actual)"),
+    user: Optional[FirebaseUser] = Depends(optional_firebase_token),
+    db: Session = Depends(get_db)
+):
+    """Average LMPs for several substations on one shared time axis, with null for missing buckets"""
+    
+    try:
+        ids = list(dict.fromkeys(int(id.strip()) for id in substation_ids.split(",")))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid substation IDs format"
+        )
+    
+    if len(ids) > settings.LMP_MATRIX_MAX_SUBSTATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Please provide at most {settings.LMP_MATRIX_MAX_SUBSTATIONS} substation IDs."
+        )
+    
+    # Aware and naive bounds can't be compared; stored times are naive UTC
+    start, end = naive_utc(start), naive_utc(end)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    
+    found = db.query(Substation.id).filter(Substation.id.in_(ids)).count()
+    if found != len(ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="One or more substations not found"
+        )
+    
+    try:
+        matrix = build_matrix(
+            db, ids, start, end,
+            bucket=bucket, field=field, lmp_type=lmp_type,
+            max_points=settings.LMP_MATRIX_MAX_POINTS,
+        )
+    except MatrixTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return {"data": matrix}
+
 @router.get("/{average_lmp_id}", response_model=AverageLMPResponse)
 async def get_average_lmp_by_id(
     average_lmp_id: int,
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(AverageLMPResponse, AverageLMP)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
     """Get a specific average LMP record by ID"""
     
-    average_lmp = db.query(AverageLMP).filter(
+    query = db.query(AverageLMP).filter(
         AverageLMP.id == average_lmp_id
-    ).first()
+    )
+    average_lmp = fieldset.apply(query).first() if fieldset else query.first()
     
     if not average_lmp:
         raise HTTPException(
@@ -68,6 +134,9 @@ async def get_average_lmp_by_id(
             detail="Average LMP record not found"
         )
     
+    if fieldset:
+        return fieldset.response_one(average_lmp)
+    
     return average_lmp
 
 @router.post("/", response_model=AverageLMPResponse)
@@ -93,6 +162,7 @@ async def create_average_lmp(
     db.add(db_average_lmp)
     db.commit()
     db.refresh(db_average_lmp)
+    autocomplete_index.mark_lmp(db_average_lmp.substation_id)
     
     return db_average_lmp
 
@@ -104,6 +174,7 @@ async def get_average_lmp_by_substation(
     lmp_type: Optional[str] = Query(None, description="Filter by LMP type (forecast/actual)"),
     start_time: Optional[datetime] = Query(None, description="Start time filter"),
     end_time: Optional[datetime] = Query(None, description="End time filter"),
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(AverageLMPResponse, AverageLMP)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
@@ -132,5 +203,8 @@ async def get_average_lmp_by_substation(
     # Order by time
     query = query.order_by(AverageLMP.time)
     
+    if fieldset:
+        return fieldset.response(fieldset.apply(query).offset(skip).limit(limit).all())
+    
     average_lmp_data = query.offset(skip).limit(limit).all()
     return average_lmp_data
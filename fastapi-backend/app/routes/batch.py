@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import Response
+from app.core.config import settings
+from app.models.schemas import BatchRequest, BatchResponse
+from app.services.batch_service import run_batch
+
+router = APIRouter()
+
+@router.post("/", response_model=BatchResponse)
+async def batch(
+    batch_request: BatchRequest,
+    request: Request
+):
+    """Run several API requests concurrently and return their responses in one envelope"""
+    
+    if len(batch_request.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} requests are allowed per batch"
+        )
+    
+    payload = await run_batch(request.app, request.scope, batch_request.requests)
+    return Response(content=payload, media_type="application/json")
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from app.models.schemas import ChatRequest
+from app.middleware.firebase_auth import verify_firebase_token, FirebaseUser
+from app.services.chat_service import chat_service, format_sse
+
+router = APIRouter()
+
+@router.post("/stream")
+async def stream_chat(
+    chat_request: ChatRequest,
+    firebase_user: FirebaseUser = Depends(verify_firebase_token)
+):
+    """Stream an answer as Server-Sent Events (token events, then a done event)"""
+
+    history = [message.model_dump() for message in chat_request.history]
+
+    async def event_stream():
+        try:
+            async for event in chat_service.stream_answer(firebase_user.uid, chat_request.message, history):
+                yield format_sse(event)
+        except Exception as e:
+            print(f"❌ Chat backend error: {e}")
+            yield format_sse({"event": "error", "data": {"detail": "Failed to generate a response"}})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,186 @@
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import os
+from app.core.config import settings
+from app.models.database import get_async_db
+from app.models.models import Document, DocumentChunk
+from app.models.schemas import DocumentResponse, DocumentUploadResponse
+from app.middleware.firebase_auth import verify_firebase_token, FirebaseUser
+from app.services.fieldsets import Fieldset, sparse_fields
+from app.services.document_service import (
+    blob_path,
+    document_pipeline,
+    file_extension,
+    find_duplicate,
+    remove_unreferenced_blob,
+    save_upload,
+    store_upload,
+    DocumentTooLargeError,
+    PipelineFullError,
+    SUPPORTED_EXTENSIONS,
+)
+
+router = APIRouter()
+
+@router.post("/upload", response_model=DocumentUploadResponse)
+async def upload_document(
+    file: UploadFile = File(...),
+    firebase_user: FirebaseUser = Depends(verify_firebase_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Upload a document; identical content already uploaded by the user is returned as-is, or retried if it failed"""
+
+    extension = file_extension(file.filename)
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported file type. Allowed: {', '.join(sorted(SUPPORTED_EXTENSIONS))}"
+        )
+
+    try:
+        tmp_path, sha256, size = await save_upload(file, settings.UPLOAD_DIR, settings.MAX_FILE_SIZE)
+    except DocumentTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    finally:
+        await file.close()
+
+    # Content already known for this user: nothing to store or process,
+    # unless its processing failed and it is being uploaded again to retry
+    existing = await find_duplicate(db, firebase_user.uid, sha256)
+    if existing and existing.status != "failed":
+        os.remove(tmp_path)
+        return {"data": existing, "duplicate": True}
+
+    if document_pipeline.is_full():
+        os.remove(tmp_path)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Document processing queue is full, please retry later"
+        )
+
+    storage_path = blob_path(settings.UPLOAD_DIR, sha256, extension)
+    if existing:
+        # (owner, sha256) is unique, so the failed document is reset in place
+        document = existing
+        await db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document.id))
+        document.filename = os.path.basename(file.filename)
+        document.content_type = file.content_type
+        document.storage_path = storage_path
+        document.status = "pending"
+        document.chunk_count = 0
+        document.error = None
+    else:
+        document = Document(
+            firebase_uid=firebase_user.uid,
+            filename=os.path.basename(file.filename),
+            content_type=file.content_type,
+            size=size,
+            sha256=sha256,
+            storage_path=storage_path,
+            status="pending",
+        )
+        db.add(document)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent upload of the same content won the race
+        await db.rollback()
+        os.remove(tmp_path)
+        existing = await find_duplicate(db, firebase_user.uid, sha256)
+        return {"data": existing, "duplicate": True}
+    # Stored only now that the row references it, so a concurrent delete of
+    # the same content either keeps the file or is followed by this write
+    store_upload(tmp_path, storage_path)
+    await db.refresh(document)
+
+    try:
+        document_pipeline.submit(document.id)
+    except PipelineFullError as e:
+        document.status = "failed"
+        document.error = str(e)
+        await db.commit()
+        await db.refresh(document)
+
+    return {"data": document, "duplicate": False}
+
+@router.get("/", response_model=List[DocumentResponse])
+async def get_documents(
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(DocumentResponse, Document)),
+    firebase_user: FirebaseUser = Depends(verify_firebase_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the current user's documents"""
+
+    query = (
+        select(Document)
+        .where(Document.firebase_uid == firebase_user.uid)
+        .order_by(Document.created_at.desc())
+    )
+
+    if fieldset:
+        return fieldset.response(fieldset.fetch_all(await db.execute(fieldset.apply(query))))
+
+    result = await db.execute(query)
+    return result.scalars().all()
+
+@router.get("/{document_id}", response_model=DocumentResponse)
+async def get_document(
+    document_id: int,
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(DocumentResponse, Document)),
+    firebase_user: FirebaseUser = Depends(verify_firebase_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a document and its processing status"""
+
+    if fieldset:
+        query = select(Document).where(Document.id == document_id, Document.firebase_uid == firebase_user.uid)
+        document = fieldset.fetch_first(await db.execute(fieldset.apply(query)))
+        if not document:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document not found"
+            )
+        return fieldset.response_one(document)
+
+    document = await db.get(Document, document_id)
+
+    if not document or document.firebase_uid != firebase_user.uid:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+
+    return document
+
+@router.delete("/{document_id}")
+async def delete_document(
+    document_id: int,
+    firebase_user: FirebaseUser = Depends(verify_firebase_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a document and its chunks"""
+
+    document = await db.get(Document, document_id)
+
+    if not document or document.firebase_uid != firebase_user.uid:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+
+    storage_path = document.storage_path
+    sha256 = document.sha256
+    await db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document.id))
+    await db.delete(document)
+    await db.commit()
+
+    # Stored files are content-addressed; keep them while another user still references them
+    await remove_unreferenced_blob(db, sha256, storage_path)
+
+    return {"message": "Document deleted successfully"}
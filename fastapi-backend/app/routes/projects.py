@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.models.database import get_async_db
+from app.models.schemas import QueueProjectResponse, QueueProjectPageResponse, QueueProjectFacetsResponse
+from app.middleware.firebase_auth import FirebaseUser, optional_firebase_token
+from app.models.queue_models import QueueProject
+from app.services import queue_service
+from app.services.fieldsets import Fieldset, sparse_fields
+
+router = APIRouter()
+
+@router.get("/", response_model=QueueProjectPageResponse)
+async def get_projects(
+    iso: Optional[str] = Query(None, description="Comma-separated ISO/RTO IDs"),
+    project_status: Optional[str] = Query("ACTIVE", alias="status", description="Comma-separated project statuses"),
+    generation_type: Optional[str] = Query(None, description="Comma-separated generation types"),
+    state: Optional[str] = Query(None, description="Comma-separated state names"),
+    sort: str = Query("queue_date", pattern="^(queue_date|capacity_mw|proposed_completion_date|project_name)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(QueueProjectResponse, QueueProject)),
+    user: Optional[FirebaseUser] = Depends(optional_firebase_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get interconnection queue projects with faceted filters and cursor pagination"""
+
+    try:
+        page = await queue_service.list_projects(
+            db,
+            iso=iso,
+            status=project_status,
+            generation_type=generation_type,
+            state=state,
+            sort=sort,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+            fieldset=fieldset,
+        )
+    except queue_service.InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if fieldset:
+        return JSONResponse({**page, "results": fieldset.dump(page["results"])})
+
+    return page
+
+@router.get("/facets", response_model=QueueProjectFacetsResponse)
+async def get_project_facets(
+    iso: Optional[str] = Query(None, description="Comma-separated ISO/RTO IDs"),
+    project_status: Optional[str] = Query("ACTIVE", alias="status", description="Comma-separated project statuses"),
+    generation_type: Optional[str] = Query(None, description="Comma-separated generation types"),
+    state: Optional[str] = Query(None, description="Comma-separated state names"),
+    user: Optional[FirebaseUser] = Depends(optional_firebase_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get project counts per ISO, status, generation type and state"""
+
+    facets = await queue_service.get_facets(
+        db,
+        iso=iso,
+        status=project_status,
+        generation_type=generation_type,
+        state=state,
+    )
+    return {"data": facets}
+
+@router.get("/{iso_id}/{queue_id:path}", response_model=QueueProjectResponse)
+async def get_project(
+    iso_id: str,
+    queue_id: str,
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(QueueProjectResponse, QueueProject)),
+    user: Optional[FirebaseUser] = Depends(optional_firebase_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a specific queue project by ISO and queue ID"""
+
+    project = await queue_service.get_project(db, iso_id, queue_id, fieldset)
+
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    if fieldset:
+        return fieldset.response_one(project)
+
+    return project
@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import Response, JSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.models.database import get_db
 from app.models.models import Substation, County
-from app.models.schemas import SubstationResponse, SubstationCreate, CountyResponse, SubstationCompareResponse, SubstationMappingsResponse, SubstationCompareResponse, SubstationMappingsResponse
+from app.models.schemas import SubstationResponse, SubstationCreate, SubstationBulkItem, CountyResponse, SubstationCompareResponse, SubstationMappingsResponse, SubstationHeatmapResponse, SubstationAutocompleteResponse, BulkUpsertResponse
 from app.middleware.firebase_auth import verify_firebase_token, FirebaseUser, optional_firebase_token
+from app.core.config import settings
+from app.services.heatmap_service import heatmap_cache, get_heatmap, parse_bbox
+from app.services.bulk_service import parse_bulk_body, bulk_upsert, BulkPayloadError
+from app.services.reference_data import reference_data
+from app.services.mappings_service import mappings_cache
+from app.services.autocomplete_service import autocomplete_index
+from app.services.fieldsets import Fieldset, sparse_fields
+from app.services.snapshot_service import snapshot_mode, search_ids, bbox_ids
 
 router = APIRouter()
 
@@ -16,6 +25,8 @@ async def get_substations(
     substation_type: Optional[str] = Query(None, description="Filter by substation type"),
     voltage_min: Optional[float] = Query(None, description="Minimum voltage (kV)"),
     voltage_max: Optional[float] = Query(None, description="Maximum voltage (kV)"),
+    bbox: Optional[str] = Query(None, description="Bounding box as min_lon,min_lat,max_lon,max_lat"),
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(SubstationResponse, Substation)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
@@ -36,12 +47,32 @@ async def get_substations(
     if voltage_max is not None:
         query = query.filter(Substation.voltage <= voltage_max)
     
+    if bbox:
+        try:
+            min_lon, min_lat, max_lon, max_lat = parse_bbox(bbox)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid bbox: {e}"
+            )
+        query = query.filter(
+            Substation.longitude.between(min_lon, max_lon),
+            Substation.latitude.between(min_lat, max_lat),
+        )
+        if snapshot_mode():
+            # The R-tree narrows candidates; the range filter above is exact (R-tree bounds are float32)
+            query = query.filter(Substation.id.in_(bbox_ids((min_lon, min_lat, max_lon, max_lat))))
+    
+    if fieldset:
+        return fieldset.response(fieldset.apply(query).offset(skip).limit(limit).all())
+    
     substations = query.offset(skip).limit(limit).all()
     return substations
 
 @router.get("/compare", response_model=SubstationCompareResponse)
 async def compare_substations(
     substation_ids: str = Query(..., description="Comma-separated list of substation IDs"),
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(SubstationResponse, Substation)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
@@ -62,7 +93,8 @@ async def compare_substations(
             detail="Please provide between 2 and 5 substation IDs."
         )
     
-    substations = db.query(Substation).filter(Substation.id.in_(ids)).all()
+    query = db.query(Substation).filter(Substation.id.in_(ids))
+    substations = fieldset.apply(query).all() if fieldset else query.all()
     
     if len(substations) != len(ids):
         raise HTTPException(
@@ -70,6 +102,9 @@ async def compare_substations(
             detail="One or more substations not found"
         )
     
+    if fieldset:
+        return JSONResponse({"data": fieldset.dump(substations)})
+    
     return {"data": substations}
 
 @router.get("/mappings", response_model=SubstationMappingsResponse)
@@ -79,65 +114,49 @@ async def get_substation_mappings(
 ):
     """Get substation mappings by type, interconnecting entity, study region, and utility area"""
     
-    # Get distinct combinations from the database
-    substations = db.query(
-        Substation.substation_type,
-        Substation.interconnecting_entity,
-        Substation.study_region,
-        Substation.utility_area
-    ).distinct().all()
-    
-    mappings_dict = {}
-    for substation in substations:
-        substation_type = substation.substation_type or "Unknown"
-        interconnecting_entity = substation.interconnecting_entity or "Unknown"
-        study_region = substation.study_region or "Unknown"
-        utility_area = substation.utility_area or "Unknown"
-        
-        if substation_type not in mappings_dict:
-            mappings_dict[substation_type] = {}
-        
-        if interconnecting_entity not in mappings_dict[substation_type]:
-            mappings_dict[substation_type][interconnecting_entity] = {
-                "study_regions": set(),
-                "utility_areas": set(),
-            }
-        
-        mappings_dict[substation_type][interconnecting_entity]["study_regions"].add(study_region)
-        mappings_dict[substation_type][interconnecting_entity]["utility_areas"].add(utility_area)
-    
-    # Convert to the format expected by the frontend
-    mappings = []
-    for substation_type, entities in mappings_dict.items():
-        for interconnecting_entity, data in entities.items():
-            mappings.append([
-                substation_type,
-                interconnecting_entity,
-                list(data["study_regions"]),
-                list(data["utility_areas"]),
-            ])
-    
-    return {
-        "data": {
-            "columns": [
-                "Substation Type",
-                "Interconnecting Entity",
-                "Study Regions",
-                "Utility Areas",
-            ],
-            "rows": mappings,
-        }
-    }
+    return Response(content=mappings_cache.get(db), media_type="application/json")
+
+@router.get("/heatmap", response_model=SubstationHeatmapResponse)
+async def get_substation_heatmap(
+    bbox: str = Query(..., description="Bounding box as min_lon,min_lat,max_lon,max_lat"),
+    zoom: int = Query(..., ge=0, le=settings.HEATMAP_MAX_ZOOM, description="Map zoom level"),
+    user: Optional[FirebaseUser] = Depends(optional_firebase_token),
+    db: Session = Depends(get_db)
+):
+    """Get grid-binned substation counts, max voltage and available capacity for a map view"""
+    
+    try:
+        bounds = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid bbox: {e}"
+        )
+    
+    return {"data": get_heatmap(db, bounds, zoom)}
+
+@router.get("/autocomplete", response_model=SubstationAutocompleteResponse)
+async def autocomplete_substations(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Start of a name word, code or study region"),
+    limit: int = Query(10, ge=1, le=settings.AUTOCOMPLETE_MAX_RESULTS),
+    user: Optional[FirebaseUser] = Depends(optional_firebase_token),
+    db: Session = Depends(get_db)
+):
+    """Suggest substations for a typed prefix, best-covered and highest-voltage first"""
+    
+    return {"data": autocomplete_index.search(db, prefix, limit)}
 
 @router.get("/{substation_id}", response_model=SubstationResponse)
 async def get_substation(
     substation_id: int,
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(SubstationResponse, Substation)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
     """Get a specific substation by ID"""
     
-    substation = db.query(Substation).filter(Substation.id == substation_id).first()
+    query = db.query(Substation).filter(Substation.id == substation_id)
+    substation = fieldset.apply(query).first() if fieldset else query.first()
     
     if not substation:
         raise HTTPException(
@@ -145,6 +164,9 @@ async def get_substation(
             detail="Substation not found"
         )
     
+    if fieldset:
+        return fieldset.response_one(substation)
+    
     return substation
 
 @router.post("/", response_model=SubstationResponse)
@@ -169,9 +191,42 @@ async def create_substation(
     db.add(substation)
     db.commit()
     db.refresh(substation)
+    heatmap_cache.invalidate()
+    mappings_cache.invalidate()
+    autocomplete_index.upsert(substation)
     
     return substation
 
+@router.post("/bulk", response_model=BulkUpsertResponse)
+async def bulk_upsert_substations(
+    request: Request,
+    firebase_user: FirebaseUser = Depends(verify_firebase_token),
+    db: Session = Depends(get_db)
+):
+    """Create or update substations in bulk from a JSON array or NDJSON (requires authentication)"""
+    
+    try:
+        items = parse_bulk_body(await request.body(), request.headers.get("content-type"))
+    except BulkPayloadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items are allowed per request"
+        )
+    
+    result = bulk_upsert(db, Substation, SubstationBulkItem, items, foreign_keys={"county_id": County})
+    if result["created"] or result["updated"]:
+        heatmap_cache.invalidate()
+        mappings_cache.invalidate()
+        autocomplete_index.invalidate()
+    
+    return {"data": result}
+
 @router.put("/{substation_id}", response_model=SubstationResponse)
 async def update_substation(
     substation_id: int,
@@ -204,6 +259,9 @@ async def update_substation(
     
     db.commit()
     db.refresh(substation)
+    heatmap_cache.invalidate()
+    mappings_cache.invalidate()
+    autocomplete_index.upsert(substation)
     
     return substation
 
@@ -225,6 +283,9 @@ async def delete_substation(
     
     db.delete(substation)
     db.commit()
+    heatmap_cache.invalidate()
+    mappings_cache.invalidate()
+    autocomplete_index.remove(substation_id)
     
     return {"message": "Substation deleted successfully"}
 
@@ -236,6 +297,11 @@ async def get_counties(
 ):
     """Get counties with optional state filtering"""
     
+    # Served from the shared-memory reference data when it is loaded
+    payload = reference_data.counties_json(state)
+    if payload is not None:
+        return Response(content=payload, media_type="application/json")
+    
     query = db.query(County)
     
     if state:
@@ -248,29 +314,37 @@ async def get_counties(
 async def search_substations(
     q: str = Query(..., description="Search query"),
     limit: int = Query(20, ge=1, le=100),
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(SubstationResponse, Substation)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
     """Search substations by name, code, or region"""
     
-    # Simple text search - in production you might want to use full-text search
-    substations = (
-        db.query(Substation)
-        .filter(
-            Substation.name.ilike(f"%{q}%") |
-            Substation.code.ilike(f"%{q}%") |
-            Substation.study_region.ilike(f"%{q}%") |
-            Substation.utility_area.ilike(f"%{q}%")
+    if snapshot_mode():
+        # Snapshots carry an FTS5 index: matches words by prefix rather than substrings
+        query = db.query(Substation).filter(Substation.id.in_(search_ids("substations", q))).limit(limit)
+    else:
+        # Simple text search - in production you might want to use full-text search
+        query = (
+            db.query(Substation)
+            .filter(
+                Substation.name.ilike(f"%{q}%") |
+                Substation.code.ilike(f"%{q}%") |
+                Substation.study_region.ilike(f"%{q}%") |
+                Substation.utility_area.ilike(f"%{q}%")
+            )
+            .limit(limit)
         )
-        .limit(limit)
-        .all()
-    )
     
-    return substations
+    if fieldset:
+        return fieldset.response(fieldset.apply(query).all())
+    
+    return query.all()
 
 @router.get("/compare", response_model=SubstationCompareResponse)
 async def compare_substations(
     substation_ids: str = Query(..., description="Comma-separated list of substation IDs"),
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(SubstationResponse, Substation)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
@@ -291,7 +365,8 @@ async def compare_substations(
             detail="Please provide between 2 and 5 substation IDs."
         )
     
-    substations = db.query(Substation).filter(Substation.id.in_(ids)).all()
+    query = db.query(Substation).filter(Substation.id.in_(ids))
+    substations = fieldset.apply(query).all() if fieldset else query.all()
     
     if len(substations) != len(ids):
         raise HTTPException(
@@ -299,6 +374,9 @@ async def compare_substations(
             detail="One or more substations not found"
         )
     
+    if fieldset:
+        return JSONResponse({"data": fieldset.dump(substations)})
+    
     return {"data": substations}
 
 @router.get("/mappings", response_model=SubstationMappingsResponse)
@@ -308,52 +386,4 @@ async def get_substation_mappings(
 ):
     """Get substation mappings by type, interconnecting entity, study region, and utility area"""
     
-    # Get distinct combinations from the database
-    substations = db.query(
-        Substation.substation_type,
-        Substation.interconnecting_entity,
-        Substation.study_region,
-        Substation.utility_area
-    ).distinct().all()
-    
-    mappings_dict = {}
-    for substation in substations:
-        substation_type = substation.substation_type or "Unknown"
-        interconnecting_entity = substation.interconnecting_entity or "Unknown"
-        study_region = substation.study_region or "Unknown"
-        utility_area = substation.utility_area or "Unknown"
-        
-        if substation_type not in mappings_dict:
-            mappings_dict[substation_type] = {}
-        
-        if interconnecting_entity not in mappings_dict[substation_type]:
-            mappings_dict[substation_type][interconnecting_entity] = {
-                "study_regions": set(),
-                "utility_areas": set(),
-            }
-        
-        mappings_dict[substation_type][interconnecting_entity]["study_regions"].add(study_region)
-        mappings_dict[substation_type][interconnecting_entity]["utility_areas"].add(utility_area)
-    
-    # Convert to the format expected by the frontend
-    mappings = []
-    for substation_type, entities in mappings_dict.items():
-        for interconnecting_entity, data in entities.items():
-            mappings.append([
-                substation_type,
-                interconnecting_entity,
-                list(data["study_regions"]),
-                list(data["utility_areas"]),
-            ])
-    
-    return {
-        "data": {
-            "columns": [
-                "Substation Type",
-                "Interconnecting Entity",
-                "Study Regions",
-                "Utility Areas",
-            ],
-            "rows": mappings,
-        }
-    }
+    return Response(content=mappings_cache.get(db), media_type="application/json")
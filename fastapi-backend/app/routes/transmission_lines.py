@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.models.database import get_db
 from app.models.models import TransmissionLine
-from app.models.schemas import TransmissionLineResponse, TransmissionLineCreate
+from app.models.schemas import TransmissionLineResponse, TransmissionLineCreate, TransmissionLineBulkItem, BulkUpsertResponse
 from app.middleware.firebase_auth import verify_firebase_token, FirebaseUser, optional_firebase_token
+from app.core.config import settings
+from app.services.bulk_service import parse_bulk_body, bulk_upsert, BulkPayloadError
+from app.services.fieldsets import Fieldset, sparse_fields
+from app.services.snapshot_service import snapshot_mode, search_ids
 
 router = APIRouter()
 
@@ -16,6 +20,7 @@ async def get_transmission_lines(
     voltage_max: Optional[float] = Query(None, description="Maximum voltage (kV)"),
     utility_area: Optional[str] = Query(None, description="Filter by utility area"),
     line_type: Optional[str] = Query(None, description="Filter by line type"),
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(TransmissionLineResponse, TransmissionLine)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
@@ -36,20 +41,25 @@ async def get_transmission_lines(
     if line_type:
         query = query.filter(TransmissionLine.line_type.ilike(f"%{line_type}%"))
     
+    if fieldset:
+        return fieldset.response(fieldset.apply(query).offset(skip).limit(limit).all())
+    
     transmission_lines = query.offset(skip).limit(limit).all()
     return transmission_lines
 
 @router.get("/{transmission_line_id}", response_model=TransmissionLineResponse)
 async def get_transmission_line(
     transmission_line_id: int,
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(TransmissionLineResponse, TransmissionLine)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
     """Get a specific transmission line by ID"""
     
-    transmission_line = db.query(TransmissionLine).filter(
+    query = db.query(TransmissionLine).filter(
         TransmissionLine.id == transmission_line_id
-    ).first()
+    )
+    transmission_line = fieldset.apply(query).first() if fieldset else query.first()
     
     if not transmission_line:
         raise HTTPException(
@@ -57,6 +67,9 @@ async def get_transmission_line(
             detail="Transmission line not found"
         )
     
+    if fieldset:
+        return fieldset.response_one(transmission_line)
+    
     return transmission_line
 
 @router.post("/", response_model=TransmissionLineResponse)
@@ -74,24 +87,54 @@ async def create_transmission_line(
     
     return db_transmission_line
 
+@router.post("/bulk", response_model=BulkUpsertResponse)
+async def bulk_upsert_transmission_lines(
+    request: Request,
+    firebase_user: FirebaseUser = Depends(verify_firebase_token),
+    db: Session = Depends(get_db)
+):
+    """Create or update transmission lines in bulk from a JSON array or NDJSON (requires authentication)"""
+    
+    try:
+        items = parse_bulk_body(await request.body(), request.headers.get("content-type"))
+    except BulkPayloadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items are allowed per request"
+        )
+    
+    return {"data": bulk_upsert(db, TransmissionLine, TransmissionLineBulkItem, items)}
+
 @router.get("/search/", response_model=List[TransmissionLineResponse])
 async def search_transmission_lines(
     q: str = Query(..., description="Search query"),
     limit: int = Query(20, ge=1, le=100),
+    fieldset: Optional[Fieldset] = Depends(sparse_fields(TransmissionLineResponse, TransmissionLine)),
     user: Optional[FirebaseUser] = Depends(optional_firebase_token),
     db: Session = Depends(get_db)
 ):
     """Search transmission lines by name, circuit, or utility area"""
     
-    transmission_lines = (
-        db.query(TransmissionLine)
-        .filter(
-            TransmissionLine.name.ilike(f"%{q}%") |
-            TransmissionLine.circuit.ilike(f"%{q}%") |
-            TransmissionLine.utility_area.ilike(f"%{q}%")
+    if snapshot_mode():
+        query = db.query(TransmissionLine).filter(TransmissionLine.id.in_(search_ids("transmission_lines", q))).limit(limit)
+    else:
+        query = (
+            db.query(TransmissionLine)
+            .filter(
+                TransmissionLine.name.ilike(f"%{q}%") |
+                TransmissionLine.circuit.ilike(f"%{q}%") |
+                TransmissionLine.utility_area.ilike(f"%{q}%")
+            )
+            .limit(limit)
         )
-        .limit(limit)
-        .all()
-    )
     
-    return transmission_lines
+    if fieldset:
+        return fieldset.response(fieldset.apply(query).all())
+    
+    return query.all()
@@ -0,0 +1,254 @@
+# In-memory prefix index for the substation picker
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import exists, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.models import AverageLMP, Substation, SubstationStatus
+
+# Prefixes matching more keys than this have their top results cached until a write touches them
+CACHED_RANGE_SIZE = 256
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase ASCII with punctuation collapsed to single spaces"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def index_keys(name: Optional[str], code: Optional[str], study_region: Optional[str]) -> List[str]:
+    """Keys a substation is found by: its name from every word on, its code and its region"""
+    keys = set()
+    words = normalize(name).split()
+    for i in range(len(words)):
+        keys.add(" ".join(words[i:]))
+    for value in (code, study_region):
+        key = normalize(value)
+        if key:
+            keys.add(key)
+    return sorted(keys)
+
+
+class AutocompleteIndex:
+    """Sorted array of (normalized key, substation id) pairs searched with bisect.
+
+    Results are ranked by data availability (LMP history, capacity status) and
+    then voltage. Writes in this process update the index incrementally; the
+    whole index is rebuilt after AUTOCOMPLETE_REFRESH_SECONDS to pick up
+    writes handled by other workers. Only the first build runs in a request:
+    later rebuilds run in a background thread while searches keep using the
+    current index, and are swapped in with the writes made meanwhile replayed.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.keys: List[Tuple[str, int]] = []
+        self.entries: Dict[int, Dict] = {}
+        self.entry_keys: Dict[int, List[str]] = {}
+        self.prefix_cache: Dict[str, List[int]] = {}
+        self.built_at: Optional[float] = None
+        self.lock = threading.RLock()
+        self.refresh_thread: Optional[threading.Thread] = None
+        # Writes made while a rebuild is reading, replayed onto its result
+        self.pending_writes: Optional[List[Tuple]] = None
+
+    @staticmethod
+    def _rank(entry: Dict) -> Tuple:
+        availability = 2 * entry["has_lmp"] + entry["has_status"]
+        return (-availability, -(entry["voltage"] or 0), entry["name"], entry["id"])
+
+    def build(self, db: Session):
+        with self.lock:
+            self.pending_writes = []
+        has_lmp = exists().where(AverageLMP.substation_id == Substation.id)
+        has_status = exists().where(
+            SubstationStatus.substation_id == Substation.id,
+            SubstationStatus.is_active.is_(True),
+        )
+        rows = db.execute(
+            select(
+                Substation.id,
+                Substation.name,
+                Substation.code,
+                Substation.voltage,
+                Substation.study_region,
+                Substation.utility_area,
+                has_lmp.label("has_lmp"),
+                has_status.label("has_status"),
+            )
+        ).all()
+
+        entries, entry_keys, keys = {}, {}, []
+        for row in rows:
+            entry = self._entry(row.id, row.name, row.code, row.voltage, row.study_region, row.utility_area,
+                                bool(row.has_lmp), bool(row.has_status))
+            entries[row.id] = entry
+            entry_keys[row.id] = index_keys(row.name, row.code, row.study_region)
+            keys.extend((key, row.id) for key in entry_keys[row.id])
+        keys.sort()
+
+        with self.lock:
+            pending, self.pending_writes = self.pending_writes or [], None
+            self.keys, self.entries, self.entry_keys = keys, entries, entry_keys
+            self.prefix_cache = {}
+            self.built_at = time.monotonic()
+            for write, *args in pending:
+                write(*args)
+
+    def export(self) -> Dict:
+        """Index contents as JSON-compatible data, for persisting"""
+        with self.lock:
+            return {"keys": self.keys, "entries": list(self.entries.values())}
+
+    def restore(self, data: Dict):
+        """Load contents saved by ``export``; per-entry keys are re-derived"""
+        keys = [(key, substation_id) for key, substation_id in data["keys"]]
+        entries = {entry["id"]: entry for entry in data["entries"]}
+        entry_keys: Dict[int, List[str]] = {}
+        for key, substation_id in keys:
+            entry_keys.setdefault(substation_id, []).append(key)
+        with self.lock:
+            self.keys, self.entries, self.entry_keys = keys, entries, entry_keys
+            self.prefix_cache = {}
+            self.built_at = time.monotonic()
+
+    @staticmethod
+    def _entry(id, name, code, voltage, study_region, utility_area, has_lmp, has_status) -> Dict:
+        return {
+            "id": id,
+            "name": name,
+            "code": code,
+            "voltage": voltage,
+            "study_region": study_region,
+            "utility_area": utility_area,
+            "has_lmp": has_lmp,
+            "has_status": has_status,
+        }
+
+    def ensure_fresh(self, db: Session):
+        if self.built_at is None:
+            self.build(db)
+        elif time.monotonic() - self.built_at > self.ttl:
+            self.refresh_in_background()
+
+    def refresh_in_background(self):
+        """Rebuild in a thread with its own session, unless a rebuild is already running"""
+        with self.lock:
+            if self.refresh_thread is not None and self.refresh_thread.is_alive():
+                return
+            self.refresh_thread = threading.Thread(target=self._refresh, name="autocomplete-refresh", daemon=True)
+            self.refresh_thread.start()
+
+    def _refresh(self):
+        try:
+            with SessionLocal() as db:
+                self.build(db)
+        except Exception as e:
+            with self.lock:
+                self.pending_writes = None
+            print(f"❌ Autocomplete index refresh failed: {e}")
+
+    def _ids_for_prefix(self, prefix: str, limit: int) -> List[int]:
+        lo = bisect.bisect_left(self.keys, (prefix,))
+        hi = bisect.bisect_left(self.keys, (prefix + "\uffff",))
+        if hi - lo > CACHED_RANGE_SIZE:
+            cached = self.prefix_cache.get(prefix)
+            if cached is None:
+                cached = self._top(lo, hi, settings.AUTOCOMPLETE_MAX_RESULTS)
+                self.prefix_cache[prefix] = cached
+            return cached[:limit]
+        return self._top(lo, hi, limit)
+
+    def _top(self, lo: int, hi: int, limit: int) -> List[int]:
+        ids = {substation_id for _, substation_id in self.keys[lo:hi]}
+        return heapq.nsmallest(limit, ids, key=lambda i: self._rank(self.entries[i]))
+
+    def search(self, db: Session, prefix: str, limit: int) -> List[Dict]:
+        self.ensure_fresh(db)
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self.lock:
+            return [dict(self.entries[i]) for i in self._ids_for_prefix(prefix, limit)]
+
+    def upsert(self, substation: Substation):
+        """Add or re-index one substation after a write"""
+        keys = index_keys(substation.name, substation.code, substation.study_region)
+        entry = self._entry(
+            substation.id, substation.name, substation.code, substation.voltage,
+            substation.study_region, substation.utility_area, False, False,
+        )
+        with self.lock:
+            if self.built_at is None:
+                return
+            self._record(self._upsert, entry, keys)
+
+    def remove(self, substation_id: int):
+        with self.lock:
+            self._record(self._remove, substation_id)
+
+    def invalidate(self):
+        """Rebuild in the background (after bulk writes, where per-row updates would cost more)"""
+        with self.lock:
+            if self.built_at is None:
+                return
+        self.refresh_in_background()
+
+    def mark_lmp(self, substation_id: int):
+        """Record that a substation now has LMP data"""
+        with self.lock:
+            self._record(self._mark_lmp, substation_id)
+
+    def _record(self, write, *args):
+        """Apply a write now and, while a rebuild is reading, again once it is swapped in"""
+        write(*args)
+        if self.pending_writes is not None:
+            self.pending_writes.append((write, *args))
+
+    def _upsert(self, entry: Dict, keys: List[str]):
+        substation_id = entry["id"]
+        previous = self.entries.get(substation_id)
+        if previous:
+            entry = {**entry, "has_lmp": previous["has_lmp"], "has_status": previous["has_status"]}
+        self._drop_cached_prefixes(self.entry_keys.get(substation_id, []) + keys)
+        self._remove_keys(substation_id)
+        self.entries[substation_id] = entry
+        self.entry_keys[substation_id] = keys
+        for key in keys:
+            bisect.insort(self.keys, (key, substation_id))
+
+    def _remove(self, substation_id: int):
+        self._drop_cached_prefixes(self.entry_keys.get(substation_id, []))
+        self._remove_keys(substation_id)
+        self.entries.pop(substation_id, None)
+
+    def _mark_lmp(self, substation_id: int):
+        entry = self.entries.get(substation_id)
+        if entry and not entry["has_lmp"]:
+            entry["has_lmp"] = True
+            self._drop_cached_prefixes(self.entry_keys.get(substation_id, []))
+
+    def _drop_cached_prefixes(self, keys: List[str]):
+        """Forget cached results for the prefixes of ``keys``; other prefixes cannot have changed"""
+        for prefix in [p for p in self.prefix_cache if any(key.startswith(p) for key in keys)]:
+            del self.prefix_cache[prefix]
+
+    def _remove_keys(self, substation_id: int):
+        for key in self.entry_keys.pop(substation_id, []):
+            position = bisect.bisect_left(self.keys, (key, substation_id))
+            if position < len(self.keys) and self.keys[position] == (key, substation_id):
+                del self.keys[position]
+
+
+autocomplete_index = AutocompleteIndex(ttl=settings.AUTOCOMPLETE_REFRESH_SECONDS)
@@ -0,0 +1,100 @@
+# In-process execution of POST /api/batch sub-requests
+import asyncio
+import json
+from typing import List, Tuple
+from urllib.parse import urlsplit
+
+from app.models.database import SessionLocal, shared_session
+from app.models.schemas import BatchRequestItem
+
+BATCH_PATH = "/api/batch"
+
+# Headers describing the batch body itself rather than the caller
+_SKIPPED_HEADERS = {b"content-length", b"content-type", b"transfer-encoding", b"expect"}
+
+
+def _error(status: int, detail: str) -> Tuple[int, bytes]:
+    return status, json.dumps({"detail": detail}).encode()
+
+
+async def dispatch(app, parent_scope: dict, item: BatchRequestItem, session=None) -> Tuple[int, bytes]:
+    """Run one sub-request through the app stack and return its status and JSON body.
+
+    Sub-requests pass every middleware, read-only checks included, and are
+    admitted against their own route's budget: the batch itself is exempt
+    from admission, so a shed sub-request reports ``503`` in its slot.
+    """
+    url = urlsplit(item.url)
+    if url.scheme or url.netloc or not url.path.startswith("/api/"):
+        return _error(400, "Batch requests must target a relative /api/ path")
+    if url.path.rstrip("/") == BATCH_PATH:
+        return _error(400, "Batch requests cannot be nested")
+
+    body = b"" if item.body is None else json.dumps(item.body).encode()
+    headers = [(k, v) for k, v in parent_scope["headers"] if k not in _SKIPPED_HEADERS]
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+
+    scope = {
+        **parent_scope,
+        "method": item.method,
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": headers,
+    }
+    scope.pop("route", None)
+    scope.pop("endpoint", None)
+    scope.pop("path_params", None)
+
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            # Only reached by streaming responses waiting for a disconnect
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status, content_type, chunks = 500, b"", []
+
+    async def send(message):
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    # Reads share the batch's session; writes get their own so they commit independently
+    if session is not None and item.method == "GET":
+        shared_session.set(session)
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        return _error(500, "Internal server error")
+
+    payload = b"".join(chunks)
+    if not payload:
+        return status, b"null"
+    if not content_type.startswith(b"application/json"):
+        payload = json.dumps(payload.decode("utf-8", "replace")).encode()
+    return status, payload
+
+
+async def run_batch(app, parent_scope: dict, items: List[BatchRequestItem]) -> bytes:
+    """Run sub-requests concurrently and splice their JSON bodies into one envelope"""
+    session = SessionLocal() if any(item.method == "GET" for item in items) else None
+    try:
+        # Each task copies the current context, so setting shared_session stays per sub-request
+        results = await asyncio.gather(*(dispatch(app, parent_scope, item, session) for item in items))
+    finally:
+        if session is not None:
+            session.close()
+
+    parts = []
+    for item, (status, payload) in zip(items, results):
+        head = json.dumps({"id": item.id, "status": status})[:-1].encode()
+        parts.append(head + b', "body": ' + payload + b"}")
+    return b'{"data": [' + b", ".join(parts) + b"]}"
@@ -0,0 +1,161 @@
+# Bulk upsert helpers for catalog sync (e.g. from the Django master)
+import json
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Type
+
+from pydantic import BaseModel as SchemaModel, ValidationError
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+class BulkPayloadError(ValueError):
+    """Raised when a bulk request body cannot be parsed"""
+
+
+def parse_bulk_body(body: bytes, content_type: Optional[str]) -> List:
+    """Parse a JSON array or NDJSON (one JSON object per line) request body"""
+    try:
+        if content_type and "ndjson" in content_type:
+            return [json.loads(line) for line in body.decode().splitlines() if line.strip()]
+        items = json.loads(body)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise BulkPayloadError(f"Invalid JSON: {e}")
+    if not isinstance(items, list):
+        raise BulkPayloadError("Request body must be a JSON array or NDJSON")
+    return items
+
+
+def _upsert_statement(db: Session, model, rows: List[Dict], columns):
+    """Single INSERT ... ON CONFLICT (id) DO UPDATE statement for a batch, updating ``columns``"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(model).values(rows)
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(model).values(rows)
+    else:
+        raise RuntimeError(f"Bulk upsert is not supported on {dialect}")
+    update = {key: stmt.excluded[key] for key in columns}
+    update["updated_at"] = datetime.utcnow()
+    return stmt.on_conflict_do_update(index_elements=[model.id], set_=update)
+
+
+def _sync_id_sequence(db: Session, model):
+    """Move the Postgres id sequence past explicitly inserted IDs"""
+    if db.get_bind().dialect.name == "postgresql":
+        table = model.__tablename__
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+        ))
+
+
+def _write_batch(db: Session, model, batch: List, existing: Set[int]) -> Dict[int, Dict]:
+    """Write validated ``(index, item)`` pairs in one transaction, returning results by index"""
+    results = {}
+    # Items sharing the set of fields the client sent share a statement, so an
+    # update only overwrites the columns its item included
+    with_id: Dict[frozenset, List] = {}
+    for index, item in batch:
+        if item.id is not None:
+            with_id.setdefault(frozenset(item.model_fields_set - {"id"}), []).append((index, item))
+    for columns, group in with_id.items():
+        rows = [item.model_dump() for _, item in group]
+        db.execute(_upsert_statement(db, model, rows, columns))
+        for index, item in group:
+            action = "updated" if item.id in existing else "created"
+            results[index] = {"index": index, "status": action, "id": item.id}
+    if with_id:
+        _sync_id_sequence(db, model)
+
+    without_id = [(index, item) for index, item in batch if item.id is None]
+    if without_id:
+        rows = [item.model_dump(exclude={"id"}) for _, item in without_id]
+        new_ids = db.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+        for (index, _), new_id in zip(without_id, new_ids):
+            results[index] = {"index": index, "status": "created", "id": new_id}
+    db.commit()
+    return results
+
+
+def bulk_upsert(
+    db: Session,
+    model,
+    schema: Type[SchemaModel],
+    raw_items: List,
+    foreign_keys: Optional[Dict[str, object]] = None,
+):
+    """Validate and upsert items, returning one result per input item.
+
+    Items with an ``id`` are upserted on it, updating only the fields they
+    include (the last item wins when an id repeats); items without one are
+    inserted. A batch the database rejects is retried item by item.
+    ``foreign_keys`` maps a field name to the referenced model; all referenced
+    IDs are checked with one query per foreign key.
+    """
+    results: List[Dict] = [None] * len(raw_items)
+    valid = []
+    for index, raw in enumerate(raw_items):
+        try:
+            valid.append((index, schema.model_validate(raw)))
+        except ValidationError as e:
+            results[index] = {"index": index, "status": "error", "errors": e.errors(include_url=False, include_context=False)}
+
+    for field, referenced in (foreign_keys or {}).items():
+        ids = {getattr(item, field) for _, item in valid if getattr(item, field) is not None}
+        known = set(db.execute(select(referenced.id).where(referenced.id.in_(ids))).scalars()) if ids else set()
+        still_valid = []
+        for index, item in valid:
+            value = getattr(item, field)
+            if value is not None and value not in known:
+                results[index] = {"index": index, "status": "error", "errors": [f"Invalid {field}: {value}"]}
+            else:
+                still_valid.append((index, item))
+        valid = still_valid
+
+    # Postgres rejects an ON CONFLICT statement that affects the same row
+    # twice, so only the last item for each id is written
+    last_for_id = {item.id: index for index, item in valid if item.id is not None}
+    unique = []
+    for index, item in valid:
+        if item.id is not None and last_for_id[item.id] != index:
+            superseded_by = last_for_id[item.id]
+            results[index] = {"index": index, "status": "error", "errors": [f"Duplicate id {item.id}, superseded by item {superseded_by}"]}
+        else:
+            unique.append((index, item))
+    valid = unique
+
+    explicit_ids = [item.id for _, item in valid if item.id is not None]
+    existing = set(db.execute(select(model.id).where(model.id.in_(explicit_ids))).scalars()) if explicit_ids else set()
+
+    batch_size = settings.BULK_BATCH_SIZE
+    for start in range(0, len(valid), batch_size):
+        batch = valid[start:start + batch_size]
+        try:
+            written = _write_batch(db, model, batch, existing)
+        except Exception:
+            db.rollback()
+            # One rejected row fails the whole statement; retry row by row so only it is reported
+            written = {}
+            for index, item in batch:
+                try:
+                    written.update(_write_batch(db, model, [(index, item)], existing))
+                except Exception as e:
+                    db.rollback()
+                    written[index] = {"index": index, "status": "error", "errors": [str(e.__cause__ or e)]}
+        for index, result in written.items():
+            results[index] = result
+
+    summary = {"created": 0, "updated": 0, "error": 0}
+    for result in results:
+        summary[result["status"]] += 1
+    return {
+        "created": summary["created"],
+        "updated": summary["updated"],
+        "failed": summary["error"],
+        "results": results,
+    }
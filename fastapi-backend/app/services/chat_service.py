@@ -0,0 +1,180 @@
+# Chat business logic: pluggable LLM backends and a per-user semantic answer cache
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.embedding_service import embed_text, tokenize
+
+SYSTEM_PROMPT = (
+    "You are PowerNOVA's assistant for power grid interconnection. "
+    "Answer questions about substations, transmission lines, LMPs and ISO queues concisely."
+)
+
+
+class LLMBackend(ABC):
+    """Interface for token-streaming language model backends"""
+
+    @abstractmethod
+    async def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        """Yield the answer to ``messages`` token by token"""
+
+
+class StubLLMBackend(LLMBackend):
+    """Deterministic local backend for development and tests"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+
+    async def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        question = messages[-1]["content"]
+        answer = f"This is a stub answer to: {question}"
+        for i, word in enumerate(answer.split(" ")):
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield word if i == 0 else " " + word
+
+
+class OpenAILLMBackend(LLMBackend):
+    """Streams completions from the OpenAI chat completions API"""
+
+    URL = "https://api.openai.com/v1/chat/completions"
+
+    def __init__(self, api_key: str, model: str):
+        self.api_key = api_key
+        self.model = model
+
+    async def stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+        import httpx  # Only needed for this backend; keeps it off the import path at boot
+
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        payload = {"model": self.model, "messages": messages, "stream": True}
+        async with httpx.AsyncClient(timeout=60) as client:
+            async with client.stream("POST", self.URL, headers=headers, json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[len("data: "):]
+                    if data == "[DONE]":
+                        break
+                    delta = json.loads(data)["choices"][0]["delta"].get("content")
+                    if delta:
+                        yield delta
+
+
+def get_llm_backend() -> LLMBackend:
+    if settings.LLM_BACKEND == "openai":
+        if not settings.OPENAI_API_KEY:
+            raise RuntimeError("LLM_BACKEND=openai requires OPENAI_API_KEY")
+        return OpenAILLMBackend(settings.OPENAI_API_KEY, settings.LLM_MODEL)
+    return StubLLMBackend()
+
+
+# Words that do not change what a question asks. Any other word that two
+# questions do not share in the same order (a substation, an ISO, a metric)
+# makes them different questions, however similar their embeddings are.
+FILLER_WORDS = frozenset(
+    "a an the is are was s what whats please tell me show give "
+    "current currently now right of for at in on about".split()
+)
+
+
+def question_terms(question: str) -> Tuple[str, ...]:
+    """The words of a question that change what it asks, in order"""
+    return tuple(token for token in tokenize(question) if token not in FILLER_WORDS)
+
+
+class SemanticCache:
+    """Recent answers per user, looked up by question embedding similarity.
+
+    A cached answer is reused when the question has cosine similarity of at
+    least ``threshold`` to the cached question and the same terms. The hashed
+    bag-of-words embedding alone scores questions about different substations,
+    or with names swapped, above any useful threshold.
+    """
+
+    def __init__(self, threshold: float, max_entries: int, ttl: int):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # (user_id, terms) -> (created_at, embedding, answer)
+        self.entries: "OrderedDict[Tuple[str, Tuple[str, ...]], Tuple[float, np.ndarray, str]]" = OrderedDict()
+
+    def get(self, user_id: str, question: str) -> Optional[str]:
+        key = (user_id, question_terms(question))
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        created_at, embedding, answer = entry
+        if created_at < time.monotonic() - self.ttl:
+            del self.entries[key]
+            return None
+        # Embeddings are normalised, so the dot product is the cosine similarity
+        if float(embedding @ embed_text(question)) < self.threshold:
+            return None
+        self.entries.move_to_end(key)
+        return answer
+
+    def put(self, user_id: str, question: str, answer: str):
+        key = (user_id, question_terms(question))
+        self.entries[key] = (time.monotonic(), embed_text(question), answer)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+class ChatService:
+    def __init__(self, backend: LLMBackend, cache: SemanticCache):
+        self.backend = backend
+        self.cache = cache
+
+    async def stream_answer(
+        self, user_id: str, message: str, history: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[Dict]:
+        """Yield SSE events: ``token`` events followed by a final ``done`` event.
+
+        Only stand-alone questions use the cache, since follow-ups depend on the history.
+        """
+        use_cache = not history
+        if use_cache:
+            cached = self.cache.get(user_id, message)
+            if cached is not None:
+                yield {"event": "token", "data": {"token": cached}}
+                yield {"event": "done", "data": {"cached": True}}
+                return
+
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        messages.extend(history or [])
+        messages.append({"role": "user", "content": message})
+
+        tokens = []
+        async for token in self.backend.stream(messages):
+            tokens.append(token)
+            yield {"event": "token", "data": {"token": token}}
+
+        if use_cache:
+            self.cache.put(user_id, message, "".join(tokens))
+        yield {"event": "done", "data": {"cached": False}}
+
+
+def format_sse(event: Dict) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+chat_service = ChatService(
+    backend=get_llm_backend(),
+    cache=SemanticCache(
+        threshold=settings.CHAT_CACHE_THRESHOLD,
+        max_entries=settings.CHAT_CACHE_SIZE,
+        ttl=settings.CHAT_CACHE_TTL,
+    ),
+)
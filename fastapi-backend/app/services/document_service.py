@@ -0,0 +1,246 @@
+# Document ingestion: streamed upload, content-hash dedupe and background processing
+import asyncio
+import hashlib
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from fastapi import UploadFile
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.database import AsyncSessionLocal
+from app.models.models import Document, DocumentChunk
+from app.services.embedding_service import embed_text, embedding_to_bytes
+
+READ_CHUNK_SIZE = 1024 * 1024  # Bytes read from the upload stream per iteration
+
+SUPPORTED_EXTENSIONS = {".txt", ".md", ".csv", ".json", ".pdf"}
+
+
+class DocumentTooLargeError(Exception):
+    """Raised when an upload exceeds MAX_FILE_SIZE"""
+
+
+class PipelineFullError(Exception):
+    """Raised when the processing queue has no room for another document"""
+
+
+def file_extension(filename: str) -> str:
+    return os.path.splitext(filename or "")[1].lower()
+
+
+async def save_upload(file: UploadFile, upload_dir: str, max_size: int) -> Tuple[str, str, int]:
+    """Stream an upload to a temporary file, hashing it on the way.
+
+    Returns the temporary path, the SHA-256 hex digest and the size in bytes.
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    tmp_path = os.path.join(upload_dir, f".upload-{uuid.uuid4().hex}")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as buffer:
+            while True:
+                data = await file.read(READ_CHUNK_SIZE)
+                if not data:
+                    break
+                size += len(data)
+                if size > max_size:
+                    raise DocumentTooLargeError(f"File exceeds the {max_size} byte limit")
+                digest.update(data)
+                buffer.write(data)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return tmp_path, digest.hexdigest(), size
+
+
+def blob_path(upload_dir: str, sha256: str, extension: str) -> str:
+    """Content-addressed location of an upload"""
+    return os.path.join(upload_dir, sha256[:2], sha256 + extension)
+
+
+def store_upload(tmp_path: str, path: str) -> str:
+    """Move a hashed upload to its content-addressed location.
+
+    Called once the document row is committed. The content is identical, so
+    an existing file is replaced, which also re-creates one that a concurrent
+    delete removed after this upload deduped onto it.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+async def is_referenced(db, sha256: str) -> bool:
+    result = await db.execute(select(Document.id).where(Document.sha256 == sha256).limit(1))
+    return result.first() is not None
+
+
+async def remove_unreferenced_blob(db, sha256: str, path: str):
+    """Delete a stored file once no document references its content.
+
+    The file is moved aside before the last reference check and restored if
+    an upload of the same content committed in the meantime.
+    """
+    if await is_referenced(db, sha256):
+        return
+    removed = f"{path}.{uuid.uuid4().hex}.removed"
+    try:
+        os.replace(path, removed)
+    except FileNotFoundError:
+        return
+    if await is_referenced(db, sha256):
+        os.replace(removed, path)
+    else:
+        os.remove(removed)
+
+
+async def find_duplicate(db, firebase_uid: str, sha256: str) -> Optional[Document]:
+    result = await db.execute(
+        select(Document).where(Document.firebase_uid == firebase_uid, Document.sha256 == sha256)
+    )
+    return result.scalars().first()
+
+
+# The functions below run inside worker processes and must stay picklable
+
+def parse_document(path: str) -> str:
+    if file_extension(path) == ".pdf":
+        from pypdf import PdfReader
+
+        reader = PdfReader(path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8", errors="replace")
+
+
+def chunk_text(text: str, chunk_size: int, overlap: int) -> List[str]:
+    """Split text into overlapping chunks, preferring whitespace boundaries"""
+    text = text.strip()
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            boundary = text.rfind(" ", start + chunk_size // 2, end)
+            if boundary != -1:
+                end = boundary
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+
+def process_document(path: str, chunk_size: int, overlap: int) -> List[Tuple[str, bytes]]:
+    """Parse, chunk and embed a stored document"""
+    text = parse_document(path)
+    return [
+        (chunk, embedding_to_bytes(embed_text(chunk)))
+        for chunk in chunk_text(text, chunk_size, overlap)
+    ]
+
+
+class DocumentPipeline:
+    """Bounded queue of document IDs drained into a process pool"""
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.tasks: List[asyncio.Task] = []
+
+    async def start(self, resume: bool = True):
+        """Start the workers; ``resume`` re-queues unfinished documents (one process per deployment should)"""
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if resume:
+            await self._resume_unfinished()
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def is_full(self) -> bool:
+        return self.queue is None or self.queue.full()
+
+    def submit(self, document_id: int):
+        if self.queue is None:
+            raise PipelineFullError("Document pipeline is not running")
+        try:
+            self.queue.put_nowait(document_id)
+        except asyncio.QueueFull:
+            raise PipelineFullError("Document processing queue is full")
+
+    async def _resume_unfinished(self):
+        """Re-queue documents left pending or processing by a previous run"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Document.id)
+                .where(Document.status.in_(["pending", "processing"]))
+                .order_by(Document.id)
+                .limit(self.queue_size)
+            )
+            for document_id in result.scalars().all():
+                self.queue.put_nowait(document_id)
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            document_id = await self.queue.get()
+            try:
+                await self._process(loop, document_id)
+            except Exception as e:
+                print(f"❌ Document {document_id} processing error: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def _process(self, loop, document_id: int):
+        async with AsyncSessionLocal() as db:
+            document = await db.get(Document, document_id)
+            if not document or document.status == "completed":
+                return
+            document.status = "processing"
+            await db.commit()
+
+            try:
+                chunks = await loop.run_in_executor(
+                    self.executor,
+                    process_document,
+                    document.storage_path,
+                    settings.DOCUMENT_CHUNK_SIZE,
+                    settings.DOCUMENT_CHUNK_OVERLAP,
+                )
+            except Exception as e:
+                document.status = "failed"
+                document.error = str(e)
+                await db.commit()
+                return
+
+            db.add_all(
+                DocumentChunk(document_id=document.id, chunk_index=i, content=content, embedding=embedding)
+                for i, (content, embedding) in enumerate(chunks)
+            )
+            document.chunk_count = len(chunks)
+            document.status = "completed"
+            document.error = None
+            await db.commit()
+
+
+document_pipeline = DocumentPipeline(
+    workers=settings.DOCUMENT_WORKERS,
+    queue_size=settings.DOCUMENT_QUEUE_SIZE,
+)
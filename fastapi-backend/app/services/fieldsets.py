@@ -0,0 +1,121 @@
+# Sparse fieldsets: ?fields= projections pushed down into the SELECT list
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query as QueryParam, status
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import Query, load_only, selectinload
+
+
+@lru_cache(maxsize=256)
+def projection_adapters(schema: Type[BaseModel], names: Tuple[str, ...]) -> Tuple[TypeAdapter, TypeAdapter]:
+    """Item and list adapters for the subset of ``schema`` with only ``names``, keeping types and aliases"""
+    projection = create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in names},
+    )
+    return TypeAdapter(projection), TypeAdapter(List[projection])
+
+
+class Fieldset:
+    """Fields a client asked for on one response schema.
+
+    Column fields are selected on their own, so rows come back as plain
+    tuples without building ORM objects. Relationship fields (e.g.
+    ``county``) switch to loading the entity with ``load_only`` and a
+    ``selectinload`` for just the requested relationships.
+    """
+
+    def __init__(self, schema: Type[BaseModel], model, fields: str):
+        # Clients may use attribute names or the serialized (alias) names
+        lookup = {}
+        for name, field in schema.model_fields.items():
+            lookup[name] = name
+            if field.serialization_alias:
+                lookup[field.serialization_alias] = name
+
+        requested, unknown = set(), []
+        for item in fields.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            if item in lookup:
+                requested.add(lookup[item])
+            else:
+                unknown.append(item)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(schema.model_fields)}")
+        if not requested:
+            raise ValueError("No fields requested")
+
+        mapper = inspect(model)
+        self.model = model
+        self.names = tuple(name for name in schema.model_fields if name in requested)
+        self.relationships = [name for name in self.names if name in mapper.relationships]
+        self.item_adapter, self.list_adapter = projection_adapters(schema, self.names)
+
+    def columns(self, *required: str) -> List:
+        """Model columns to select: the requested ones plus ``required`` (e.g. cursor keys)"""
+        mapper = inspect(self.model)
+        names = [name for name in self.names if name not in self.relationships]
+        for name in self.relationships:
+            # The foreign key is needed to load a many-to-one relationship
+            names.extend(column.key for column in mapper.relationships[name].local_columns)
+        names.extend(required)
+        return [getattr(self.model, name) for name in dict.fromkeys(names)]
+
+    def apply(self, query, *required: str):
+        """Restrict a ``Query`` or ``select()`` of the model to the requested fields"""
+        columns = self.columns(*required)
+        if self.relationships:
+            return query.options(
+                load_only(*columns),
+                *(selectinload(getattr(self.model, name)) for name in self.relationships),
+            )
+        if isinstance(query, Query):
+            return query.with_entities(*columns)
+        return query.with_only_columns(*columns)
+
+    def fetch_all(self, result) -> list:
+        """Rows of an executed ``apply()``-ed select"""
+        return result.scalars().all() if self.relationships else result.all()
+
+    def fetch_first(self, result):
+        return result.scalars().first() if self.relationships else result.first()
+
+    def dump(self, rows) -> list:
+        """JSON-ready dicts for embedding in an envelope"""
+        return self.list_adapter.dump_python(
+            self.list_adapter.validate_python(rows, from_attributes=True), mode="json", by_alias=True
+        )
+
+    def response(self, rows) -> Response:
+        """Serialize a list of rows straight to a JSON response"""
+        payload = self.list_adapter.dump_json(self.list_adapter.validate_python(rows, from_attributes=True), by_alias=True)
+        return Response(content=payload, media_type="application/json")
+
+    def response_one(self, row) -> Response:
+        payload = self.item_adapter.dump_json(self.item_adapter.validate_python(row, from_attributes=True), by_alias=True)
+        return Response(content=payload, media_type="application/json")
+
+
+def sparse_fields(schema: Type[BaseModel], model):
+    """Dependency parsing ``?fields=`` for routes returning ``schema``; ``None`` means all fields"""
+
+    async def dependency(
+        fields: Optional[str] = QueryParam(None, description=f"Comma-separated fields to return: {', '.join(schema.model_fields)}")
+    ) -> Optional[Fieldset]:
+        if not fields:
+            return None
+        try:
+            return Fieldset(schema, model, fields)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+    return dependency
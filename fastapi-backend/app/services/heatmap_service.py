@@ -0,0 +1,135 @@
+# Grid-binned substation heatmap aggregation
+import threading
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+from sqlalchemy import func, and_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Substation, SubstationStatus
+
+HEATMAP_COLUMNS = ["Latitude", "Longitude", "Count", "Max Voltage", "Available Capacity"]
+
+
+def cell_size_for_zoom(zoom: int) -> float:
+    """Cell edge in degrees: HEATMAP_CELLS_PER_TILE cells per web map tile at this zoom"""
+    return 360.0 / ((2 ** zoom) * settings.HEATMAP_CELLS_PER_TILE)
+
+
+def parse_bbox(bbox: str) -> Tuple[float, float, float, float]:
+    """Parse ``min_lon,min_lat,max_lon,max_lat``"""
+    min_lon, min_lat, max_lon, max_lat = (float(v) for v in bbox.split(","))
+    if not (-180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise ValueError("bbox is out of range or not ordered as min_lon,min_lat,max_lon,max_lat")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def build_grid(db: Session, zoom: int) -> Dict[str, np.ndarray]:
+    """Aggregate every located substation into grid cells with one grouped query"""
+    cell = cell_size_for_zoom(zoom)
+    cell_x = func.floor(Substation.longitude / cell).label("cell_x")
+    cell_y = func.floor(Substation.latitude / cell).label("cell_y")
+
+    # A substation may have several active heatmap statuses; only the latest counts
+    ranked = (
+        db.query(
+            SubstationStatus.substation_id,
+            SubstationStatus.available_capacity,
+            func.row_number()
+            .over(
+                partition_by=SubstationStatus.substation_id,
+                order_by=(SubstationStatus.updated_at.desc(), SubstationStatus.id.desc()),
+            )
+            .label("rank"),
+        )
+        .filter(SubstationStatus.is_active.is_(True), SubstationStatus.status_type == "heatmap")
+        .subquery()
+    )
+
+    rows = (
+        db.query(
+            cell_x,
+            cell_y,
+            func.count(Substation.id),
+            func.max(Substation.voltage),
+            func.coalesce(func.sum(ranked.c.available_capacity), 0.0),
+        )
+        .outerjoin(ranked, and_(ranked.c.substation_id == Substation.id, ranked.c.rank == 1))
+        .filter(Substation.latitude.isnot(None), Substation.longitude.isnot(None))
+        .group_by(cell_x, cell_y)
+        .all()
+    )
+
+    if not rows:
+        empty = np.array([], dtype=np.float64)
+        return {"x": empty, "y": empty, "count": empty, "max_voltage": empty, "capacity": empty}
+
+    x, y, count, max_voltage, capacity = zip(*rows)
+    return {
+        "x": np.asarray(x, dtype=np.int64),
+        "y": np.asarray(y, dtype=np.int64),
+        "count": np.asarray(count, dtype=np.int64),
+        "max_voltage": np.asarray([np.nan if v is None else v for v in max_voltage], dtype=np.float64),
+        "capacity": np.asarray(capacity, dtype=np.float64),
+    }
+
+
+class HeatmapCache:
+    """Per-zoom grids kept for HEATMAP_CACHE_TTL seconds and dropped on substation writes"""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.grids: Dict[int, Tuple[float, Dict[str, np.ndarray]]] = {}
+        self.lock = threading.Lock()
+
+    def get_grid(self, db: Session, zoom: int) -> Dict[str, np.ndarray]:
+        with self.lock:
+            cached = self.grids.get(zoom)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        grid = build_grid(db, zoom)
+        self.set_grid(zoom, grid)
+        return grid
+
+    def set_grid(self, zoom: int, grid: Dict[str, np.ndarray]):
+        with self.lock:
+            self.grids[zoom] = (time.monotonic(), grid)
+
+    def cached_grids(self) -> Dict[int, Dict[str, np.ndarray]]:
+        with self.lock:
+            return {zoom: grid for zoom, (_, grid) in self.grids.items()}
+
+    def invalidate(self):
+        with self.lock:
+            self.grids.clear()
+
+
+heatmap_cache = HeatmapCache(ttl=settings.HEATMAP_CACHE_TTL)
+
+
+def get_heatmap(db: Session, bbox: Tuple[float, float, float, float], zoom: int):
+    """Return the cached grid cells for ``zoom`` that intersect ``bbox``"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    cell = cell_size_for_zoom(zoom)
+    grid = heatmap_cache.get_grid(db, zoom)
+
+    mask = (
+        (grid["x"] >= np.floor(min_lon / cell)) & (grid["x"] <= np.floor(max_lon / cell))
+        & (grid["y"] >= np.floor(min_lat / cell)) & (grid["y"] <= np.floor(max_lat / cell))
+    )
+
+    latitudes = np.round((grid["y"][mask] + 0.5) * cell, 6)
+    longitudes = np.round((grid["x"][mask] + 0.5) * cell, 6)
+    rows = [
+        [lat, lon, int(count), None if np.isnan(voltage) else voltage, capacity]
+        for lat, lon, count, voltage, capacity in zip(
+            latitudes.tolist(),
+            longitudes.tolist(),
+            grid["count"][mask].tolist(),
+            grid["max_voltage"][mask].tolist(),
+            grid["capacity"][mask].tolist(),
+        )
+    ]
+    return {"cell_size": cell, "columns": HEATMAP_COLUMNS, "rows": rows}
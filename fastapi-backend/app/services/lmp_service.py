@@ -0,0 +1,139 @@
+# Aligned multi-substation LMP series
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, case, literal_column
+from sqlalchemy.orm import Session
+
+from app.models.models import AverageLMP
+
+BUCKETS = ("raw", "hour", "day", "week", "month")
+VALUE_FIELDS = ("total_lmp", "energy", "congestion", "loss", "opening_price", "closing_price")
+
+_SQLITE_BUCKETS = {
+    "hour": "strftime('%Y-%m-%d %H:00:00', {col})",
+    "day": "strftime('%Y-%m-%d 00:00:00', {col})",
+    "week": "strftime('%Y-%m-%d 00:00:00', {col}, 'weekday 0', '-6 days')",
+    "month": "strftime('%Y-%m-01 00:00:00', {col})",
+}
+
+
+class MatrixTooLargeError(ValueError):
+    """Raised when the requested time axis has too many points"""
+
+
+def naive_utc(value: datetime) -> datetime:
+    """``value`` as naive UTC, the form LMP times are stored in; naive values are taken as UTC"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def bucket_start(value: datetime, bucket: str) -> datetime:
+    """Truncate ``value`` to the start of its bucket (weeks start on Monday)"""
+    if bucket == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "day":
+        return day
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return value
+
+
+def next_bucket(value: datetime, bucket: str) -> datetime:
+    if bucket == "hour":
+        return value + timedelta(hours=1)
+    if bucket == "day":
+        return value + timedelta(days=1)
+    if bucket == "week":
+        return value + timedelta(weeks=1)
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1)
+    return value.replace(month=value.month + 1)
+
+
+def time_axis(start: datetime, end: datetime, bucket: str, max_points: int) -> List[datetime]:
+    """Every bucket from ``start`` to ``end`` inclusive"""
+    axis = []
+    current = bucket_start(start, bucket)
+    while current <= end:
+        axis.append(current)
+        if len(axis) > max_points:
+            raise MatrixTooLargeError(f"Time axis exceeds {max_points} points; use a coarser bucket or a shorter range")
+        current = next_bucket(current, bucket)
+    return axis
+
+
+def _bucket_column(db: Session, bucket: str):
+    if bucket == "raw":
+        return AverageLMP.time
+    if db.get_bind().dialect.name == "sqlite":
+        return literal_column(_SQLITE_BUCKETS[bucket].format(col=AverageLMP.__table__.c.time.name))
+    return func.date_trunc(bucket, AverageLMP.time)
+
+
+def _as_datetime(value) -> datetime:
+    # SQLite returns bucket labels as text
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def build_matrix(
+    db: Session,
+    substation_ids: List[int],
+    start: datetime,
+    end: datetime,
+    bucket: str = "hour",
+    field: str = "total_lmp",
+    lmp_type: Optional[str] = None,
+    max_points: int = 10000,
+) -> Dict:
+    """Pivot LMPs for several substations onto one shared time axis with a single query.
+
+    Each substation becomes an ``AVG(CASE WHEN substation_id = ...)`` column grouped by
+    time bucket, so the database returns one row per bucket. Aware ``start``/``end`` are
+    converted to naive UTC, and the axis is naive UTC. With a bucket the axis
+    covers the whole range and buckets without data are ``None``; with ``raw`` it holds
+    the distinct timestamps present for any of the substations.
+    """
+    # Stored times are naive UTC; an aware bound would build an axis that never matches them
+    start, end = naive_utc(start), naive_utc(end)
+    # Built first so an oversized range is rejected before querying
+    axis = None if bucket == "raw" else time_axis(start, end, bucket, max_points)
+    value = getattr(AverageLMP, field)
+    bucket_col = _bucket_column(db, bucket).label("bucket")
+    pivots = [
+        func.avg(case((AverageLMP.substation_id == substation_id, value))).label(f"s{substation_id}")
+        for substation_id in substation_ids
+    ]
+
+    query = (
+        db.query(bucket_col, *pivots)
+        .filter(
+            AverageLMP.substation_id.in_(substation_ids),
+            AverageLMP.time >= start,
+            AverageLMP.time <= end,
+        )
+    )
+    if lmp_type:
+        query = query.filter(AverageLMP.lmp_type == lmp_type)
+    rows = query.group_by(bucket_col).order_by(bucket_col).limit(max_points + 1).all()
+    if len(rows) > max_points:
+        raise MatrixTooLargeError(f"Time axis exceeds {max_points} points; use a coarser bucket or a shorter range")
+
+    by_time = {_as_datetime(row[0]): row[1:] for row in rows}
+    times = list(by_time) if axis is None else axis
+    empty = (None,) * len(substation_ids)
+    columns = list(zip(*(by_time.get(t, empty) for t in times))) or [()] * len(substation_ids)
+
+    return {
+        "bucket": bucket,
+        "field": field,
+        "times": times,
+        "series": [
+            {"substation_id": substation_id, "values": [None if v is None else round(v, 4) for v in column]}
+            for substation_id, column in zip(substation_ids, columns)
+        ],
+    }
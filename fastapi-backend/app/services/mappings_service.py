@@ -0,0 +1,93 @@
+# Substation type / entity / region / utility area mappings for the filter UI
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Substation
+
+
+def build_mappings(db: Session) -> Dict:
+    """Group distinct substation attributes into the rows the frontend filters use"""
+
+    # Get distinct combinations from the database
+    substations = db.query(
+        Substation.substation_type,
+        Substation.interconnecting_entity,
+        Substation.study_region,
+        Substation.utility_area
+    ).distinct().all()
+
+    mappings_dict = {}
+    for substation in substations:
+        substation_type = substation.substation_type or "Unknown"
+        interconnecting_entity = substation.interconnecting_entity or "Unknown"
+        study_region = substation.study_region or "Unknown"
+        utility_area = substation.utility_area or "Unknown"
+
+        if substation_type not in mappings_dict:
+            mappings_dict[substation_type] = {}
+
+        if interconnecting_entity not in mappings_dict[substation_type]:
+            mappings_dict[substation_type][interconnecting_entity] = {
+                "study_regions": set(),
+                "utility_areas": set(),
+            }
+
+        mappings_dict[substation_type][interconnecting_entity]["study_regions"].add(study_region)
+        mappings_dict[substation_type][interconnecting_entity]["utility_areas"].add(utility_area)
+
+    # Convert to the format expected by the frontend
+    mappings = []
+    for substation_type, entities in mappings_dict.items():
+        for interconnecting_entity, data in entities.items():
+            mappings.append([
+                substation_type,
+                interconnecting_entity,
+                list(data["study_regions"]),
+                list(data["utility_areas"]),
+            ])
+
+    return {
+        "data": {
+            "columns": [
+                "Substation Type",
+                "Interconnecting Entity",
+                "Study Regions",
+                "Utility Areas",
+            ],
+            "rows": mappings,
+        }
+    }
+
+class MappingsCache:
+    """Serialized mappings response kept for MAPPINGS_CACHE_TTL seconds and dropped on substation writes"""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.payload: Optional[bytes] = None
+        self.built_at = 0.0
+        self.lock = threading.Lock()
+
+    def get(self, db: Session) -> bytes:
+        with self.lock:
+            if self.payload is not None and time.monotonic() - self.built_at < self.ttl:
+                return self.payload
+        payload = json.dumps(build_mappings(db)).encode()
+        self.set(payload)
+        return payload
+
+    def set(self, payload: bytes):
+        with self.lock:
+            self.payload = payload
+            self.built_at = time.monotonic()
+
+    def invalidate(self):
+        with self.lock:
+            self.payload = None
+
+
+mappings_cache = MappingsCache(ttl=settings.MAPPINGS_CACHE_TTL)
@@ -0,0 +1,206 @@
+# Interconnection queue project queries
+import base64
+import json
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import select, func, and_, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.queue_models import QueueProject
+
+# Sortable columns; each one is backed by (column, isoid, queueid) indexes in both orders
+SORT_COLUMNS = {
+    "queue_date": QueueProject.queue_date,
+    "capacity_mw": QueueProject.capacity_mw,
+    "proposed_completion_date": QueueProject.proposed_completion_date,
+    "project_name": QueueProject.project_name,
+}
+
+FACET_COLUMNS = {
+    "iso": QueueProject.iso_id,
+    "status": QueueProject.status,
+    "generation_type": QueueProject.generation_type,
+    "state": QueueProject.state_name,
+}
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the sort"""
+
+
+def _split(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def build_filters(
+    iso: Optional[str] = None,
+    status: Optional[str] = None,
+    generation_type: Optional[str] = None,
+    state: Optional[str] = None,
+    exclude: Optional[str] = None,
+):
+    """Build WHERE clauses for the faceted filters.
+
+    ``exclude`` drops one facet's own filter so its counts show the alternatives.
+    """
+    clauses = []
+    isos = [v.upper() for v in _split(iso)]
+    if isos and exclude != "iso":
+        clauses.append(func.upper(QueueProject.iso_id).in_(isos))
+    statuses = [v.upper() for v in _split(status)]
+    if statuses and exclude != "status":
+        clauses.append(func.upper(QueueProject.status).in_(statuses))
+    generation_types = _split(generation_type)
+    if generation_types and exclude != "generation_type":
+        clauses.append(QueueProject.generation_type.in_(generation_types))
+    states = _split(state)
+    if states and exclude != "state":
+        clauses.append(QueueProject.state_name.in_(states))
+    return clauses
+
+
+def _encode_value(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _decode_value(sort: str, value):
+    if value is None:
+        return None
+    if sort in ("queue_date", "proposed_completion_date"):
+        return date.fromisoformat(value)
+    if sort == "capacity_mw":
+        return Decimal(value)
+    return value
+
+
+def encode_cursor(sort: str, order: str, project: QueueProject) -> str:
+    sort_value = getattr(project, SORT_COLUMNS[sort].key)
+    payload = [sort, order, _encode_value(sort_value), project.iso_id, project.queue_id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: str, order: str):
+    try:
+        cursor_sort, cursor_order, value, iso_id, queue_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+        value = _decode_value(sort, value)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Invalid cursor")
+    if cursor_sort != sort or cursor_order != order:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    return value, iso_id, queue_id
+
+
+def _seek_clause(sort: str, order: str, cursor: str):
+    """Keyset predicate selecting rows strictly after the cursor (NULL sort values last).
+
+    Non-NULL rows are one row-value range on the (column, isoid, queueid)
+    index for the order; the NULL rows that follow them are a second range.
+    """
+    column = SORT_COLUMNS[sort]
+    value, iso_id, queue_id = decode_cursor(cursor, sort, order)
+    if value is None:
+        pk = tuple_(QueueProject.iso_id, QueueProject.queue_id)
+        after_pk = pk > tuple_(iso_id, queue_id) if order == "asc" else pk < tuple_(iso_id, queue_id)
+        return and_(column.is_(None), after_pk)
+
+    key = tuple_(column, QueueProject.iso_id, QueueProject.queue_id)
+    position = tuple_(value, iso_id, queue_id)
+    after_key = key > position if order == "asc" else key < position
+    return or_(after_key, column.is_(None))
+
+
+async def list_projects(
+    db: AsyncSession,
+    iso: Optional[str] = None,
+    status: Optional[str] = None,
+    generation_type: Optional[str] = None,
+    state: Optional[str] = None,
+    sort: str = "queue_date",
+    order: str = "desc",
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    fieldset=None,
+):
+    """Return a page of queue projects using keyset (cursor) pagination.
+
+    With a ``fieldset`` only the requested columns (plus the cursor keys) are
+    selected and ``results`` holds rows rather than ``QueueProject`` objects.
+    """
+    column = SORT_COLUMNS[sort]
+    filters = build_filters(iso, status, generation_type, state)
+
+    query = select(QueueProject).where(*filters)
+    if fieldset:
+        query = fieldset.apply(query, column.key, "iso_id", "queue_id")
+    if cursor:
+        query = query.where(_seek_clause(sort, order, cursor))
+
+    if order == "asc":
+        ordering = [column.asc().nulls_last(), QueueProject.iso_id.asc(), QueueProject.queue_id.asc()]
+    else:
+        ordering = [column.desc().nulls_last(), QueueProject.iso_id.desc(), QueueProject.queue_id.desc()]
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(query.order_by(*ordering).limit(limit + 1))
+    projects = list(fieldset.fetch_all(result) if fieldset else result.scalars().all())
+
+    next_cursor = None
+    if len(projects) > limit:
+        projects = projects[:limit]
+        next_cursor = encode_cursor(sort, order, projects[-1])
+
+    count = None
+    if not cursor:
+        count_result = await db.execute(
+            select(func.count()).select_from(QueueProject).where(*filters)
+        )
+        count = count_result.scalar_one()
+
+    return {"count": count, "next_cursor": next_cursor, "results": projects}
+
+
+async def get_project(db: AsyncSession, iso_id: str, queue_id: str, fieldset=None) -> Optional[QueueProject]:
+    """Look up a single project by its ISO and queue identifiers"""
+    query = select(QueueProject).where(
+        func.upper(QueueProject.iso_id) == iso_id.upper(),
+        QueueProject.queue_id == queue_id,
+    )
+    if fieldset:
+        return fieldset.fetch_first(await db.execute(fieldset.apply(query)))
+    result = await db.execute(query)
+    return result.scalars().first()
+
+
+async def get_facets(
+    db: AsyncSession,
+    iso: Optional[str] = None,
+    status: Optional[str] = None,
+    generation_type: Optional[str] = None,
+    state: Optional[str] = None,
+):
+    """Count projects per value of each facet, honouring the other active filters"""
+    facets = {}
+    for name, column in FACET_COLUMNS.items():
+        filters = build_filters(iso, status, generation_type, state, exclude=name)
+        result = await db.execute(
+            select(column, func.count())
+            .where(*filters)
+            .group_by(column)
+            .order_by(func.count().desc())
+        )
+        facets[name] = [
+            {"value": value, "count": count}
+            for value, count in result.all()
+            if value is not None
+        ]
+    return facets
@@ -0,0 +1,98 @@
+# Read-mostly reference data served from a shared-memory segment
+import os
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from app.models.database import SessionLocal
+from app.models.models import County
+from app.models.schemas import CountyResponse
+
+ALL_STATES = ""
+
+_counties_adapter = TypeAdapter(List[CountyResponse])
+
+
+class ReferenceData:
+    """Pre-serialized county responses in one shared-memory segment.
+
+    Loaded once, by the pre-fork parent (see ``serve.py``) or at startup, so
+    every worker reads the same pages instead of querying and serializing
+    counties per request. Counties have no write routes; call ``load`` again
+    after importing new ones.
+    """
+
+    def __init__(self):
+        self.segment: Optional[shared_memory.SharedMemory] = None
+        self.offsets: Dict[str, Tuple[int, int]] = {}  # state ("" for all) -> (start, end)
+        self.owner_pid: Optional[int] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.segment is not None
+
+    @staticmethod
+    def build_payloads() -> Dict[str, bytes]:
+        """Serialized county lists keyed by state ("" for all)"""
+        db = SessionLocal()
+        try:
+            counties = db.query(County).order_by(County.id).all()
+        finally:
+            db.close()
+
+        by_state: Dict[str, List[County]] = {ALL_STATES: counties}
+        for county in counties:
+            by_state.setdefault((county.state or "").upper(), []).append(county)
+
+        return {
+            state: _counties_adapter.dump_json(_counties_adapter.validate_python(rows, from_attributes=True))
+            for state, rows in by_state.items()
+        }
+
+    def load(self, payloads: Optional[Dict[str, bytes]] = None):
+        """Copy ``payloads`` (built from the database when omitted) into a new segment"""
+        if payloads is None:
+            payloads = self.build_payloads()
+        offsets = {}
+        position = 0
+        for state, payload in payloads.items():
+            offsets[state] = (position, position + len(payload))
+            position += len(payload)
+
+        segment = shared_memory.SharedMemory(create=True, size=max(position, 1))
+        for state, payload in payloads.items():
+            start, end = offsets[state]
+            segment.buf[start:end] = payload
+
+        self.close()
+        self.segment = segment
+        self.offsets = offsets
+        self.owner_pid = os.getpid()
+        print(f"✅ Loaded county reference data into shared memory ({position} bytes)")
+
+    def payloads(self) -> Dict[str, bytes]:
+        """Copy of the loaded payloads, for persisting"""
+        return {state: bytes(self.segment.buf[start:end]) for state, (start, end) in self.offsets.items()}
+
+    def counties_json(self, state: Optional[str] = None) -> Optional[bytes]:
+        """Serialized ``List[CountyResponse]`` for ``state`` (all counties when omitted), or None when not loaded"""
+        if self.segment is None:
+            return None
+        offset = self.offsets.get((state or ALL_STATES).upper())
+        if offset is None:
+            return b"[]"
+        return bytes(self.segment.buf[offset[0]:offset[1]])
+
+    def close(self):
+        """Detach from the segment; the process that created it also unlinks it"""
+        if self.segment is None:
+            return
+        self.segment.close()
+        if self.owner_pid == os.getpid():
+            self.segment.unlink()
+        self.segment = None
+        self.offsets = {}
+
+
+reference_data = ReferenceData()
@@ -0,0 +1,140 @@
+# Read-only SQLite snapshots of the catalog for serving without a database server
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import create_engine, event, false, func, insert, select, text, column, table, literal_column
+
+from app.core.config import settings
+from app.models.database import Base, engine, metadata, schema_version, schema_fingerprint
+from app.models import models, queue_models  # noqa: F401  Registers every table on Base.metadata
+from app.models.models import AverageLMP
+
+# Copied in full; average_lmp is limited to SNAPSHOT_LMP_DAYS before the latest actual LMP
+CATALOG_TABLES = ["counties", "substations", "substation_statuses", "transmission_lines", "queueinfo"]
+COPY_BATCH_SIZE = 10000
+
+SPATIAL_INDEX = "substations_rtree"
+SEARCH_INDEXES = {
+    "substations": ("substations_fts", ["name", "code", "study_region", "utility_area"]),
+    "transmission_lines": ("transmission_lines_fts", ["name", "circuit", "utility_area"]),
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def snapshot_mode() -> bool:
+    return bool(settings.SNAPSHOT_PATH)
+
+
+def _copy(source, target, source_table, where=None) -> int:
+    query = select(source_table)
+    if where is not None:
+        query = query.where(where)
+    result = source.execution_options(stream_results=True).execute(query)
+    copied = 0
+    for rows in result.mappings().partitions(COPY_BATCH_SIZE):
+        target.execute(insert(source_table), [dict(row) for row in rows])
+        copied += len(rows)
+    return copied
+
+
+def _create_indexes(conn):
+    conn.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE {SPATIAL_INDEX} USING rtree(id, min_lon, max_lon, min_lat, max_lat)"
+    )
+    conn.exec_driver_sql(
+        f"INSERT INTO {SPATIAL_INDEX} SELECT id, longitude, longitude, latitude, latitude "
+        "FROM substations WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    )
+    for source_table, (index, columns) in SEARCH_INDEXES.items():
+        # External-content index: stores only the token index, rows are read from the table
+        conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE {index} USING fts5({', '.join(columns)}, "
+            f"content='{source_table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        conn.exec_driver_sql(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+        conn.exec_driver_sql(f"INSERT INTO {index}({index}) VALUES ('optimize')")
+
+
+def build_snapshot(output: str, lmp_days: int = None) -> Dict[str, int]:
+    """Export the catalog and recent LMPs from the configured database to a SQLite file.
+
+    The snapshot has the full model schema (so the app runs against it
+    unchanged), its schema fingerprint, an R-tree over substation locations
+    and FTS5 indexes for search. It is written to ``<output>.tmp`` and
+    renamed into place, so a serving process never sees a partial file.
+    """
+    lmp_days = settings.SNAPSHOT_LMP_DAYS if lmp_days is None else lmp_days
+    partial = f"{output}.tmp"
+    if os.path.exists(partial):
+        os.remove(partial)
+
+    target = create_engine(f"sqlite:///{partial}")
+
+    @event.listens_for(target, "connect")
+    def _bulk_load_pragmas(dbapi_connection, connection_record):
+        # The file is discarded on failure, so durability is not needed while loading
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode = OFF")
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.close()
+
+    Base.metadata.create_all(target)
+    metadata.create_all(target)
+
+    counts = {}
+    with engine.connect() as source, target.begin() as dest:
+        for name in CATALOG_TABLES:
+            counts[name] = _copy(source, dest, Base.metadata.tables[name])
+        # Forecasts run ahead of time, so the window is counted back from the latest actual
+        latest = source.execute(
+            select(func.max(AverageLMP.time)).where(AverageLMP.lmp_type == "actual")
+        ).scalar() or datetime.utcnow()
+        since = latest - timedelta(days=lmp_days)
+        counts["average_lmp"] = _copy(source, dest, AverageLMP.__table__, AverageLMP.time >= since)
+        _create_indexes(dest)
+        dest.execute(insert(schema_version).values(version=schema_fingerprint(), applied_at=datetime.utcnow()))
+
+    with target.connect() as conn:
+        conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        conn.exec_driver_sql("ANALYZE")
+        conn.exec_driver_sql("VACUUM")
+    target.dispose()
+
+    os.replace(partial, output)
+    return counts
+
+
+def match_expression(q: str) -> Optional[str]:
+    """FTS5 query matching every word of ``q`` as a prefix, or None if it has no words"""
+    tokens = _TOKEN.findall(q)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def search_ids(source_table: str, q: str):
+    """Subquery of row ids whose indexed columns match ``q`` in the FTS5 index"""
+    index = SEARCH_INDEXES[source_table][0]
+    expression = match_expression(q)
+    query = select(literal_column("rowid")).select_from(table(index))
+    if expression is None:
+        return query.where(false())
+    return query.where(text(f"{index} MATCH :match").bindparams(match=expression))
+
+
+def bbox_ids(bounds: Tuple[float, float, float, float]):
+    """Subquery of substation ids inside ``bounds`` from the R-tree"""
+    min_lon, min_lat, max_lon, max_lat = bounds
+    return (
+        select(column("id"))
+        .select_from(table(SPATIAL_INDEX))
+        .where(
+            column("min_lon") <= max_lon,
+            column("max_lon") >= min_lon,
+            column("min_lat") <= max_lat,
+            column("max_lat") >= min_lat,
+        )
+    )
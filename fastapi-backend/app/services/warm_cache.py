@@ -0,0 +1,190 @@
+# Persisted warm-cache snapshots, loaded at startup while the data they were built from is unchanged
+import hashlib
+import json
+import mmap
+import os
+import struct
+from datetime import datetime
+from typing import Dict, Optional, Union
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.database import schema_fingerprint
+from app.models.models import AverageLMP, County, Substation, SubstationStatus, TransmissionLine
+from app.services.autocomplete_service import autocomplete_index
+from app.services.heatmap_service import heatmap_cache
+from app.services.mappings_service import mappings_cache
+from app.services.reference_data import reference_data
+
+MAGIC = b"PNWC"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<4sII")  # magic, format version, header length
+ALIGNMENT = 64  # Array sections start on a cache-line boundary
+
+# Tables whose contents feed the caches; small enough to count on every boot
+VERSIONED_MODELS = [County, Substation, SubstationStatus, TransmissionLine]
+
+Section = Union[bytes, np.ndarray]
+
+
+def data_version(db: Session) -> str:
+    """Hash of row counts, max ids and last-update times of the cached tables.
+
+    ``average_lmp`` contributes only its max id (an index lookup), which is
+    what the autocomplete "has LMP" flags depend on.
+    """
+    parts = [schema_fingerprint()]
+    for model in VERSIONED_MODELS:
+        count, max_id, updated = db.execute(
+            select(func.count(model.id), func.max(model.id), func.max(model.updated_at))
+        ).one()
+        parts.append(f"{model.__tablename__}:{count}:{max_id}:{updated}")
+    parts.append(f"average_lmp:{db.execute(select(func.max(AverageLMP.id))).scalar()}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def _aligned(position: int) -> int:
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def write_snapshot(path: str, version: str, sections: Dict[str, Section]):
+    """Write ``sections`` after a JSON header describing where each one is.
+
+    Layout: magic, format version and header length, the header, then each
+    section aligned to ALIGNMENT bytes. Arrays are stored raw so readers can
+    map them without copying. Written to ``<path>.tmp`` and renamed.
+    """
+    layout, position = {}, 0
+    for name, value in sections.items():
+        position = _aligned(position)
+        if isinstance(value, np.ndarray):
+            value = np.ascontiguousarray(value)
+            layout[name] = {"offset": position, "length": value.nbytes, "dtype": value.dtype.str, "shape": list(value.shape)}
+            position += value.nbytes
+        else:
+            layout[name] = {"offset": position, "length": len(value)}
+            position += len(value)
+
+    header = json.dumps({
+        "data_version": version,
+        "created_at": datetime.utcnow().isoformat(),
+        "sections": layout,
+    }).encode()
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    partial = f"{path}.tmp"
+    with open(partial, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for name, value in sections.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(value.tobytes() if isinstance(value, np.ndarray) else value)
+    os.replace(partial, path)
+
+
+class WarmCacheSnapshot:
+    """Read-only memory-mapped view of a snapshot file"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_length = _PREAMBLE.unpack_from(self.map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a format {FORMAT_VERSION} warm-cache snapshot")
+        header = json.loads(self.map[_PREAMBLE.size:_PREAMBLE.size + header_length])
+        self.data_version = header["data_version"]
+        self.sections = header["sections"]
+        self.data_start = _aligned(_PREAMBLE.size + header_length)
+
+    def names(self, prefix: str):
+        return [name for name in self.sections if name.startswith(prefix)]
+
+    def bytes(self, name: str) -> bytes:
+        section = self.sections[name]
+        start = self.data_start + section["offset"]
+        return self.map[start:start + section["length"]]
+
+    def json(self, name: str):
+        return json.loads(self.bytes(name))
+
+    def array(self, name: str) -> np.ndarray:
+        """Zero-copy view into the mapped file (read-only)"""
+        section = self.sections[name]
+        dtype = np.dtype(section["dtype"])
+        count = section["length"] // dtype.itemsize
+        array = np.frombuffer(self.map, dtype=dtype, count=count, offset=self.data_start + section["offset"])
+        return array.reshape(section["shape"])
+
+
+def collect_sections() -> Dict[str, Section]:
+    """Current contents of every warm cache, named by cache"""
+    sections: Dict[str, Section] = {}
+    if reference_data.loaded:
+        for state, payload in reference_data.payloads().items():
+            sections[f"counties/{state}"] = payload
+    if mappings_cache.payload is not None:
+        sections["mappings"] = mappings_cache.payload
+    for zoom, grid in heatmap_cache.cached_grids().items():
+        for key, array in grid.items():
+            sections[f"heatmap/{zoom}/{key}"] = array
+    if autocomplete_index.built_at is not None:
+        sections["autocomplete"] = json.dumps(autocomplete_index.export()).encode()
+    return sections
+
+
+def restore(snapshot: WarmCacheSnapshot):
+    counties = {name.split("/", 1)[1]: snapshot.bytes(name) for name in snapshot.names("counties/")}
+    reference_data.load(counties or None)
+    if "mappings" in snapshot.sections:
+        mappings_cache.set(snapshot.bytes("mappings"))
+    grids: Dict[int, Dict[str, np.ndarray]] = {}
+    for name in snapshot.names("heatmap/"):
+        _, zoom, key = name.split("/")
+        grids.setdefault(int(zoom), {})[key] = snapshot.array(name)
+    for zoom, grid in grids.items():
+        heatmap_cache.set_grid(zoom, grid)
+    if "autocomplete" in snapshot.sections:
+        autocomplete_index.restore(snapshot.json("autocomplete"))
+
+
+def load_snapshot(db: Session, path: Optional[str] = None, version: Optional[str] = None) -> bool:
+    """Restore every cache from the snapshot if it matches the database; False when missing or stale"""
+    path = path or settings.WARM_CACHE_PATH
+    if not path or not os.path.exists(path):
+        return False
+    try:
+        snapshot = WarmCacheSnapshot(path)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"❌ Ignoring warm-cache snapshot {path}: {e}")
+        return False
+    if snapshot.data_version != (version or data_version(db)):
+        return False
+    restore(snapshot)
+    return True
+
+
+def warm(db: Session, zooms, path: Optional[str] = None) -> bool:
+    """Load the caches from the snapshot, or build them and write a new one.
+
+    Returns True when the snapshot was used.
+    """
+    path = path or settings.WARM_CACHE_PATH
+    # Taken before building, so writes made meanwhile make the snapshot stale rather than wrong
+    version = data_version(db)
+    if load_snapshot(db, path, version):
+        print(f"✅ Warm caches loaded from {path}")
+        return True
+
+    reference_data.load()
+    mappings_cache.get(db)
+    for zoom in zooms:
+        heatmap_cache.get_grid(db, zoom)
+    autocomplete_index.build(db)
+    if path:
+        write_snapshot(path, version, collect_sections())
+        print(f"✅ Warm caches built and saved to {path}")
+    return False
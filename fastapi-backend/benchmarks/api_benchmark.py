@@ -0,0 +1,487 @@
+"""API benchmark harness.
+
+Seeds a database with synthetic CAISO-scale data, drives every route in
+``app/routes`` through an in-process ASGI client and writes latency
+percentiles, throughput and SQL query counts to a JSON baseline. Each run
+works on a throwaway copy of the seeded database, so write scenarios never
+change the data the next run measures.
+
+    python -m benchmarks.api_benchmark seed --database-url sqlite:///./bench.db
+    python -m benchmarks.api_benchmark run --database-url sqlite:///./bench.db -o baseline.json
+    python -m benchmarks.api_benchmark compare baseline.json current.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+DEFAULT_DATABASE_URL = "sqlite:///./benchmark.db"
+
+# Seeded rows rewritten, unchanged, by the bulk and update scenarios
+WRITE_ROWS = 500
+
+# Row counts matching a full CAISO footprint; override per run from the CLI
+DEFAULT_COUNTS = {
+    "counties": 58,
+    "substations": 50_000,
+    "transmission_lines": 20_000,
+    "average_lmp": 50_000_000,
+    "queue_projects": 10_000,
+}
+
+
+class QueryCounter:
+    """Counts SQL statements executed on the app's sync and async engines"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+    def install(self):
+        from sqlalchemy import event
+        from app.models.database import engine, async_engine
+
+        for target in (engine, async_engine.sync_engine):
+            event.listen(target, "before_cursor_execute", self)
+
+
+class Scenario:
+    """One benchmarked request; ``build(i, ctx)`` returns the request kwargs for iteration ``i``.
+
+    ``setup(client, ctx, args)``, when given, is awaited before the scenario runs
+    to create the rows it consumes, so it also runs on its own with ``--only``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        route: str,
+        build: Callable[[int, Dict], Dict],
+        expect=(200,),
+        setup: Optional[Callable] = None,
+    ):
+        self.name = name
+        self.method = method
+        self.route = route
+        self.build = build
+        self.expect = expect
+        self.setup = setup
+
+
+def _get(url: str, params: Optional[Dict] = None):
+    return lambda i, ctx: {"url": url, "params": params}
+
+
+def scenarios(counts: Dict[str, int]) -> List[Scenario]:
+    substations = max(counts["substations"], 1)
+    lines = max(counts["transmission_lines"], 1)
+    lmp_rows = max(counts["average_lmp"], 1)
+    sub = lambda i: i % substations + 1
+    upload = ("benchmark.txt", b"Substation interconnection capacity notes. " * 200, "text/plain")
+
+    async def create_deletable_substations(client, ctx, args):
+        ctx["deletable_substations"] = []
+        for i in range(args.warmup + 2 * args.requests):
+            response = await client.post(
+                "/api/substations/", json={"name": f"Benchmark Deletable Substation {i}", "voltage": 115}
+            )
+            ctx["deletable_substations"].append(response.json()["id"])
+
+    def deletable_substation(i, ctx):
+        return {"url": f"/api/substations/{ctx['deletable_substations'].pop()}"}
+
+    return [
+        Scenario("auth.register", "POST", "/api/auth/register", lambda i, ctx: {"url": "/api/auth/register"}),
+        Scenario("auth.me", "GET", "/api/auth/me", _get("/api/auth/me")),
+        Scenario("auth.profile", "GET", "/api/auth/profile", _get("/api/auth/profile")),
+
+        Scenario("substations.list", "GET", "/api/substations/", _get("/api/substations/", {"limit": 100})),
+        Scenario("substations.list_sparse", "GET", "/api/substations/",
+                 _get("/api/substations/", {"limit": 100, "fields": "id,latitude,longitude,voltage"})),
+        Scenario("substations.list_filtered", "GET", "/api/substations/",
+                 _get("/api/substations/", {"state": "CA", "voltage_min": 230, "limit": 100})),
+        Scenario("substations.detail", "GET", "/api/substations/{substation_id}",
+                 lambda i, ctx: {"url": f"/api/substations/{sub(i * 7919)}"}),
+        Scenario("substations.compare", "GET", "/api/substations/compare",
+                 _get("/api/substations/compare", {"substation_ids": ",".join(str(sub(i)) for i in range(5))})),
+        Scenario("substations.mappings", "GET", "/api/substations/mappings", _get("/api/substations/mappings")),
+        Scenario("substations.heatmap", "GET", "/api/substations/heatmap",
+                 _get("/api/substations/heatmap", {"bbox": "-124.4,32.5,-114.1,42.0", "zoom": 6})),
+        Scenario("substations.autocomplete", "GET", "/api/substations/autocomplete", lambda i, ctx: {
+            "url": "/api/substations/autocomplete",
+            "params": {"prefix": ("s", "sub", "substation 1", "north")[i % 4]},
+        }),
+        Scenario("substations.counties", "GET", "/api/substations/counties/", _get("/api/substations/counties/")),
+        Scenario("substations.search", "GET", "/api/substations/search/",
+                 _get("/api/substations/search/", {"q": "Substation 12"})),
+        Scenario("substations.create", "POST", "/api/substations/", lambda i, ctx: {
+            "url": "/api/substations/",
+            "json": {"name": f"Benchmark Substation {i}", "voltage": 230, "latitude": 37.0, "longitude": -120.0},
+        }),
+        Scenario("substations.update", "PUT", "/api/substations/{substation_id}", lambda i, ctx: {
+            "url": f"/api/substations/{ctx['substation_rows'][i % len(ctx['substation_rows'])]['id']}",
+            "json": {k: v for k, v in ctx["substation_rows"][i % len(ctx["substation_rows"])].items() if k != "id"},
+        }),
+        Scenario("substations.delete", "DELETE", "/api/substations/{substation_id}", deletable_substation,
+                 setup=create_deletable_substations),
+        Scenario("substations.bulk", "POST", "/api/substations/bulk", lambda i, ctx: {
+            "url": "/api/substations/bulk",
+            "json": ctx["substation_rows"],
+        }),
+
+        Scenario("transmission_lines.list", "GET", "/api/transmission-lines/",
+                 _get("/api/transmission-lines/", {"limit": 100})),
+        Scenario("transmission_lines.detail", "GET", "/api/transmission-lines/{transmission_line_id}",
+                 lambda i, ctx: {"url": f"/api/transmission-lines/{i * 7919 % lines + 1}"}),
+        Scenario("transmission_lines.search", "GET", "/api/transmission-lines/search/",
+                 _get("/api/transmission-lines/search/", {"q": "Line 99"})),
+        Scenario("transmission_lines.create", "POST", "/api/transmission-lines/", lambda i, ctx: {
+            "url": "/api/transmission-lines/",
+            "json": {"name": f"Benchmark Line {i}", "voltage": 500},
+        }),
+        Scenario("transmission_lines.bulk", "POST", "/api/transmission-lines/bulk", lambda i, ctx: {
+            "url": "/api/transmission-lines/bulk",
+            "json": ctx["line_rows"],
+        }),
+
+        Scenario("average_lmp.list", "GET", "/api/average-lmp/",
+                 _get("/api/average-lmp/", {"substation_ids": "1,2,3", "limit": 100})),
+        Scenario("average_lmp.detail", "GET", "/api/average-lmp/{average_lmp_id}",
+                 lambda i, ctx: {"url": f"/api/average-lmp/{i * 104729 % lmp_rows + 1}"}),
+        Scenario("average_lmp.by_substation", "GET", "/api/average-lmp/substation/{substation_id}",
+                 lambda i, ctx: {"url": f"/api/average-lmp/substation/{sub(i)}", "params": {"limit": 168}}),
+        Scenario("average_lmp.matrix", "GET", "/api/average-lmp/matrix", lambda i, ctx: {
+            "url": "/api/average-lmp/matrix",
+            "params": {"substation_ids": ",".join(str(sub(i + n)) for n in range(5)),
+                       "start": "2024-01-01T00:00:00", "end": "2024-01-31T23:00:00", "bucket": "hour"},
+        }),
+        Scenario("average_lmp.create", "POST", "/api/average-lmp/", lambda i, ctx: {
+            "url": "/api/average-lmp/",
+            "json": {"substation_id": sub(i), "lmp_type": "forecast", "total_lmp": 42.0, "time": "2024-06-01T00:00:00"},
+        }),
+
+        Scenario("projects.list", "GET", "/api/projects/", _get("/api/projects/", {"iso": "CAISO"})),
+        Scenario("projects.list_sorted", "GET", "/api/projects/",
+                 _get("/api/projects/", {"status": "", "sort": "capacity_mw", "order": "desc"})),
+        Scenario("projects.facets", "GET", "/api/projects/facets", _get("/api/projects/facets")),
+        Scenario("projects.detail", "GET", "/api/projects/{iso_id}/{queue_id:path}",
+                 _get("/api/projects/CAISO/Q0000000")),
+
+        Scenario("documents.upload", "POST", "/api/documents/upload",
+                 lambda i, ctx: {"url": "/api/documents/upload", "files": {"file": upload}}),
+        Scenario("documents.list", "GET", "/api/documents/", _get("/api/documents/")),
+        Scenario("documents.detail", "GET", "/api/documents/{document_id}",
+                 lambda i, ctx: {"url": f"/api/documents/{ctx['document_id']}"}),
+
+        Scenario("chat.stream", "POST", "/api/chat/stream", lambda i, ctx: {
+            "url": "/api/chat/stream",
+            "json": {"message": "What is the available capacity at Substation 1?"},
+        }),
+
+        Scenario("batch.substation_screen", "POST", "/api/batch/", lambda i, ctx: {
+            "url": "/api/batch/",
+            "json": {"requests": [
+                {"id": "substation", "url": f"/api/substations/{sub(i)}"},
+                {"id": "lmp", "url": f"/api/average-lmp/substation/{sub(i)}"},
+                {"id": "mappings", "url": "/api/substations/mappings"},
+            ]},
+        }),
+
+        Scenario("root", "GET", "/", _get("/")),
+        Scenario("health", "GET", "/health", _get("/health")),
+    ]
+
+
+# Routes that are not benchmarked, with the reason
+SKIPPED_ROUTES = {
+    ("DELETE", "/api/auth/account"): "deletes the benchmark user other scenarios depend on",
+    ("DELETE", "/api/documents/{document_id}"): "removes the shared upload used by documents.detail",
+}
+
+
+def seeded_rows(model, schema, limit: int = WRITE_ROWS) -> List[Dict]:
+    """The first ``limit`` rows of ``model`` as complete bulk items, so writing them back changes nothing"""
+    from app.models.database import SessionLocal
+
+    fields = [name for name in schema.model_fields if name != "id"]
+    with SessionLocal() as db:
+        rows = db.query(model).order_by(model.id).limit(limit).all()
+        return [{"id": row.id, **{name: getattr(row, name) for name in fields}} for row in rows]
+
+
+@contextmanager
+def working_copy(database_url: str) -> Iterator[str]:
+    """Copy the seeded database for one run and drop the copy afterwards"""
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.engine import make_url
+
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        copy = f"{url.database}.run"
+        shutil.copyfile(url.database, copy)
+        try:
+            yield url.set(database=copy).render_as_string(hide_password=False)
+        finally:
+            os.remove(copy)
+        return
+
+    # PostgreSQL clones the seeded database as a template (it must have no other sessions)
+    copy = f"{url.database}_run"
+    server = create_engine(url.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    with server.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{copy}"'))
+        conn.execute(text(f'CREATE DATABASE "{copy}" TEMPLATE "{url.database}"'))
+    try:
+        yield url.set(database=copy).render_as_string(hide_password=False)
+    finally:
+        with server.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{copy}" WITH (FORCE)'))
+        server.dispose()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_scenario(client, scenario: Scenario, ctx: Dict, counter: QueryCounter, args) -> Dict:
+    latencies = []
+    queries = []
+    status_codes: Dict[str, int] = {}
+
+    async def send(i: int) -> float:
+        kwargs = scenario.build(i, ctx)
+        started = time.perf_counter()
+        response = await client.request(scenario.method, **kwargs)
+        elapsed = time.perf_counter() - started
+        status_codes[str(response.status_code)] = status_codes.get(str(response.status_code), 0) + 1
+        return elapsed
+
+    for i in range(args.warmup):
+        await send(i)
+
+    # Sequential requests for latency and per-request query counts
+    for i in range(args.warmup, args.warmup + args.requests):
+        before = counter.count
+        latencies.append(await send(i))
+        queries.append(counter.count - before)
+
+    # Concurrent requests for throughput
+    offset = args.warmup + args.requests
+    pending = iter(range(offset, offset + args.requests))
+
+    async def worker():
+        for i in pending:
+            await send(i)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(n for code, n in status_codes.items() if int(code) not in scenario.expect)
+    return {
+        "method": scenario.method,
+        "route": scenario.route,
+        "requests": args.requests,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "throughput_rps": round(args.requests / wall, 2) if wall else None,
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+        "status_codes": status_codes,
+        "errors": errors,
+    }
+
+
+def uncovered_routes(app, benchmarked: List[Scenario]) -> List[str]:
+    from fastapi.routing import APIRoute
+
+    covered = {(s.method, s.route) for s in benchmarked} | set(SKIPPED_ROUTES)
+    missing = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for method in sorted(route.methods - {"HEAD", "OPTIONS"}):
+            if (method, route.path) not in covered:
+                missing.append(f"{method} {route.path}")
+    return missing
+
+
+async def run_benchmarks(args) -> Dict:
+    import httpx
+    from main import app
+    from app.middleware.firebase_auth import verify_firebase_token, FirebaseUser
+    from app.models.models import Substation, TransmissionLine
+    from app.models.schemas import SubstationBulkItem, TransmissionLineBulkItem
+    from benchmarks.seed import current_counts
+
+    app.dependency_overrides[verify_firebase_token] = lambda: FirebaseUser(
+        uid="benchmark-user", email="benchmark@powernova.dev", name="Benchmark"
+    )
+    counter = QueryCounter()
+    counter.install()
+    counts = current_counts()
+    if not counts["substations"]:
+        raise SystemExit("❌ Benchmark database is empty, run the seed command first")
+
+    selected = [s for s in scenarios(counts) if not args.only or any(s.name.startswith(p) for p in args.only)]
+    ctx = {
+        "substation_rows": seeded_rows(Substation, SubstationBulkItem),
+        "line_rows": seeded_rows(TransmissionLine, TransmissionLineBulkItem),
+    }
+    results = {}
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            upload = next(s for s in scenarios(counts) if s.name == "documents.upload").build(0, ctx)
+            ctx["document_id"] = (await client.post(upload["url"], files=upload["files"])).json()["data"]["id"]
+
+            for scenario in selected:
+                if scenario.setup:
+                    await scenario.setup(client, ctx, args)
+                result = await run_scenario(client, scenario, ctx, counter, args)
+                results[scenario.name] = result
+                flag = " ⚠️" if result["errors"] else ""
+                print(
+                    f"{scenario.name:32} p50 {result['p50_ms']:9.2f}ms  p95 {result['p95_ms']:9.2f}ms  "
+                    f"p99 {result['p99_ms']:9.2f}ms  {result['throughput_rps'] or 0:9.1f} req/s  "
+                    f"{result['queries_per_request']:6.1f} queries{flag}"
+                )
+
+    missing = uncovered_routes(app, scenarios(counts))
+    if missing:
+        print(f"⚠️  Routes without a benchmark scenario: {', '.join(missing)}")
+
+    from app.models.database import engine
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "row_counts": counts,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+        },
+        "skipped_routes": {f"{m} {p}": reason for (m, p), reason in SKIPPED_ROUTES.items()},
+        "uncovered_routes": missing,
+        "results": results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float, min_delta_ms: float) -> List[str]:
+    """Return regressions of ``current`` against ``baseline``.
+
+    A latency regression needs both a relative increase above ``threshold`` and an
+    absolute one above ``min_delta_ms``, so sub-millisecond noise is not flagged.
+    """
+    regressions = []
+    for name, base in baseline["results"].items():
+        cur = current["results"].get(name)
+        if cur is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            delta = cur[metric] - base[metric]
+            if base[metric] and delta > min_delta_ms and delta / base[metric] > threshold:
+                regressions.append(f"{name}: {metric} {base[metric]:.2f} -> {cur[metric]:.2f} (+{delta / base[metric]:.0%})")
+        if base["throughput_rps"] and cur["throughput_rps"] is not None:
+            drop = (base["throughput_rps"] - cur["throughput_rps"]) / base["throughput_rps"]
+            if drop > threshold:
+                regressions.append(f"{name}: throughput {base['throughput_rps']} -> {cur['throughput_rps']} req/s (-{drop:.0%})")
+        if cur["queries_per_request"] > base["queries_per_request"]:
+            regressions.append(f"{name}: queries per request {base['queries_per_request']} -> {cur['queries_per_request']}")
+        if cur["errors"] > base["errors"]:
+            regressions.append(f"{name}: errors {base['errors']} -> {cur['errors']}")
+    return regressions
+
+
+def _configure_database(database_url: str):
+    # Settings are read at import time, so this must run before any app import
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("LLM_BACKEND", "stub")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PowerNOVA FastAPI benchmark harness")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Recreate the database with synthetic data")
+    seed_parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    seed_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    for name, default in DEFAULT_COUNTS.items():
+        seed_parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default, dest=name)
+
+    run_parser = commands.add_parser("run", help="Benchmark every route against a seeded database")
+    run_parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    run_parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario")
+    run_parser.add_argument("--warmup", type=int, default=20)
+    run_parser.add_argument("--concurrency", type=int, default=10)
+    run_parser.add_argument("--only", nargs="*", help="Scenario name prefixes to run, e.g. substations average_lmp.list")
+    run_parser.add_argument("-o", "--output", default="benchmark-results.json")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions between two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="Relative change that counts as a regression")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=1.0)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "seed":
+        _configure_database(args.database_url)
+        from benchmarks.seed import seed
+        seed({name: getattr(args, name) for name in DEFAULT_COUNTS}, seed=args.seed)
+        return 0
+
+    if args.command == "run":
+        with working_copy(args.database_url) as database_url:
+            _configure_database(database_url)
+            report = asyncio.run(run_benchmarks(args))
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold, args.min_delta_ms)
+    print(f"Baseline {baseline['meta'].get('commit')} vs current {current['meta'].get('commit')}")
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Multi-worker throughput scaling benchmark.
+
+Starts ``serve.py`` with 1..N pre-forked workers against a seeded database,
+drives it over HTTP from separate load-generator processes and reports
+throughput, speedup and per-worker efficiency.
+
+    python -m benchmarks.scaling_benchmark --database-url sqlite:///./benchmark.db --workers 1 2 4 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/api/substations/counties/",
+    "/api/substations/?limit=20",
+    "/api/substations/1",
+    "/api/substations/heatmap?bbox=-124.4,32.5,-114.1,42.0&zoom=6",
+    "/api/projects/facets",
+]
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def default_worker_counts():
+    counts, n = [], 1
+    while n < (os.cpu_count() or 1):
+        counts.append(n)
+        n *= 2
+    return counts + [os.cpu_count() or 1]
+
+
+def generate_load(job) -> dict:
+    """Load-generator process: ``concurrency`` clients cycling through ``paths``"""
+    base_url, paths, duration, concurrency = job
+
+    async def run():
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + duration
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            async def worker(offset):
+                nonlocal errors
+                i = offset
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        response = await client.get(paths[i % len(paths)])
+                        if response.status_code != 200:
+                            errors += 1
+                    except httpx.HTTPError:
+                        errors += 1
+                    latencies.append(time.perf_counter() - started)
+                    i += 1
+
+            await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        return {"latencies": latencies, "errors": errors}
+
+    return asyncio.run(run())
+
+
+def wait_until_ready(base_url: str, timeout: float = 60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+def measure(workers: int, args) -> dict:
+    env = dict(os.environ, DATABASE_URL=args.database_url)
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(workers), "--port", str(args.port), "--host", "127.0.0.1"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_ready(base_url)
+        jobs = [(base_url, args.paths, args.duration, args.concurrency)] * args.clients
+        with Pool(args.clients) as pool:
+            # Short warm-up so every worker has opened its connections
+            pool.map(generate_load, [(base_url, args.paths, 1, args.concurrency)] * args.clients)
+            results = pool.map(generate_load, jobs)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+    latencies = sorted(l for r in results for l in r["latencies"])
+    errors = sum(r["errors"] for r in results)
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure throughput scaling across pre-forked workers")
+    parser.add_argument("--database-url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--workers", type=int, nargs="*", default=default_worker_counts())
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load per worker count")
+    parser.add_argument("--clients", type=int, default=os.cpu_count() or 1, help="Load-generator processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="Connections per load-generator process")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--paths", nargs="*", default=DEFAULT_PATHS)
+    parser.add_argument("-o", "--output", help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    print(f"Load: {args.clients} client processes x {args.concurrency} connections, {args.duration:.0f}s per run")
+    print("Note: load generators share the machine with the server; use a separate host for absolute numbers")
+    results = []
+    for workers in args.workers:
+        result = measure(workers, args)
+        base = results[0]["throughput_rps"] / results[0]["workers"] if results else result["throughput_rps"] / workers
+        result["speedup"] = round(result["throughput_rps"] / (base or 1), 2)
+        result["efficiency"] = round(result["speedup"] / workers, 2)
+        results.append(result)
+        print(
+            f"{workers:3} workers  {result['throughput_rps']:9.1f} req/s  speedup {result['speedup']:5.2f}x  "
+            f"efficiency {result['efficiency']:4.0%}  p50 {result['p50_ms']}ms  p99 {result['p99_ms']}ms  "
+            f"errors {result['errors']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"cpu_count": os.cpu_count(), "paths": args.paths, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+# Synthetic CAISO-scale data for the API benchmarks
+import math
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.models.database import Base, engine
+from app.models.models import AverageLMP, County, Substation, SubstationStatus, TransmissionLine
+from app.models.queue_models import QueueProject
+
+BATCH_SIZE = 20_000
+# High bits keep the hex form non-numeric, which SQLite would otherwise coerce to a number
+UUID_PREFIX = 0xBE7C << 112
+SEED_TIME = datetime(2024, 1, 1)
+
+VOLTAGES = np.array([69.0, 115.0, 138.0, 230.0, 345.0, 500.0])
+UTILITY_AREAS = ["PG&E", "SCE", "SDG&E", "VEA", "IID"]
+STUDY_REGIONS = ["Northern California", "Greater Fresno", "Kern", "East Kern", "Tehachapi", "LA Metro", "Eastern", "San Diego"]
+SUBSTATION_TYPES = ["transmission", "distribution"]
+LINE_TYPES = ["overhead", "underground"]
+ISOS = ["CAISO", "ERCOT", "PJM", "MISO", "SPP", "NYISO", "ISONE"]
+STATUSES = ["ACTIVE", "WITHDRAWN", "COMPLETED"]
+GENERATION_TYPES = ["Solar", "Wind", "Battery", "Solar + Battery", "Natural Gas", "Geothermal"]
+STATES = ["CA", "TX", "PA", "IL", "OK", "NY", "MA", "NV", "AZ"]
+
+# California bounding box
+MIN_LAT, MAX_LAT = 32.5, 42.0
+MIN_LON, MAX_LON = -124.4, -114.1
+
+
+def _insert(conn, table, rows):
+    if rows:
+        conn.execute(table.insert(), rows)
+
+
+def _base_columns(start: int, count: int):
+    """id, uuid and timestamps for ``count`` rows with ids starting at ``start``"""
+    return [
+        {"id": i, "uuid": uuid.UUID(int=UUID_PREFIX | i), "created_at": SEED_TIME, "updated_at": SEED_TIME}
+        for i in range(start, start + count)
+    ]
+
+
+def current_counts():
+    """Row counts of the benchmark tables in the configured database"""
+    models = {
+        "counties": County,
+        "substations": Substation,
+        "transmission_lines": TransmissionLine,
+        "average_lmp": AverageLMP,
+        "queue_projects": QueueProject,
+    }
+    with engine.connect() as conn:
+        return {
+            name: conn.execute(select(func.count()).select_from(model.__table__)).scalar()
+            for name, model in models.items()
+        }
+
+
+def seed_counties(conn, count: int):
+    rows = _base_columns(1, count)
+    for row in rows:
+        row.update(name=f"County {row['id']}", country="US", state="CA")
+    _insert(conn, County.__table__, rows)
+
+
+def seed_substations(conn, count: int, counties: int, rng: np.random.Generator):
+    for start in range(1, count + 1, BATCH_SIZE):
+        size = min(BATCH_SIZE, count - start + 1)
+        voltages = rng.choice(VOLTAGES, size).tolist()
+        county_ids = rng.integers(1, counties + 1, size).tolist()
+        latitudes = rng.uniform(MIN_LAT, MAX_LAT, size).round(6).tolist()
+        longitudes = rng.uniform(MIN_LON, MAX_LON, size).round(6).tolist()
+        areas = rng.integers(0, len(UTILITY_AREAS), size).tolist()
+        regions = rng.integers(0, len(STUDY_REGIONS), size).tolist()
+        capacities = rng.uniform(0, 500, size).round(1).tolist()
+
+        rows = _base_columns(start, size)
+        statuses = _base_columns(start, size)
+        for i, (row, status_row) in enumerate(zip(rows, statuses)):
+            row.update(
+                name=f"Substation {row['id']}",
+                code=f"SUB{row['id']:06d}",
+                voltage=voltages[i],
+                county_id=county_ids[i],
+                latitude=latitudes[i],
+                longitude=longitudes[i],
+                study_region=STUDY_REGIONS[regions[i]],
+                utility_area=UTILITY_AREAS[areas[i]],
+                interconnecting_entity="CAISO",
+                substation_type=SUBSTATION_TYPES[i % 2],
+            )
+            status_row.update(
+                substation_id=row["id"],
+                status_type="heatmap",
+                available_capacity=capacities[i],
+                no_of_constraints=i % 7,
+                is_active=True,
+            )
+        _insert(conn, Substation.__table__, rows)
+        _insert(conn, SubstationStatus.__table__, statuses)
+
+
+def seed_transmission_lines(conn, count: int, rng: np.random.Generator):
+    for start in range(1, count + 1, BATCH_SIZE):
+        size = min(BATCH_SIZE, count - start + 1)
+        voltages = rng.choice(VOLTAGES, size).tolist()
+        areas = rng.integers(0, len(UTILITY_AREAS), size).tolist()
+        rows = _base_columns(start, size)
+        for i, row in enumerate(rows):
+            row.update(
+                name=f"Line {row['id']}",
+                voltage=voltages[i],
+                utility_area=UTILITY_AREAS[areas[i]],
+                circuit=f"C{row['id'] % 4 + 1}",
+                line_type=LINE_TYPES[i % 2],
+            )
+        _insert(conn, TransmissionLine.__table__, rows)
+
+
+def seed_average_lmp(conn, count: int, substations: int, rng: np.random.Generator):
+    """Hourly series per substation; ``count`` rows are spread evenly across substations"""
+    if not substations:
+        return
+    hours = math.ceil(count / substations)
+    for start in range(0, count, BATCH_SIZE):
+        size = min(BATCH_SIZE, count - start)
+        offsets = np.arange(start, start + size)
+        substation_ids = (offsets // hours + 1).tolist()
+        hour_offsets = (offsets % hours).tolist()
+        energy = rng.normal(45, 15, size).round(4)
+        congestion = rng.normal(0, 5, size).round(4)
+        loss = rng.normal(1, 0.5, size).round(4)
+        total = (energy + congestion + loss).round(4)
+        opening = (total + rng.normal(0, 2, size)).round(4)
+        closing = (total + rng.normal(0, 2, size)).round(4)
+        energy, congestion, loss = energy.tolist(), congestion.tolist(), loss.tolist()
+        total, opening, closing = total.tolist(), opening.tolist(), closing.tolist()
+
+        rows = _base_columns(start + 1, size)
+        for i, row in enumerate(rows):
+            row.update(
+                substation_id=substation_ids[i],
+                lmp_type="actual",
+                energy=energy[i],
+                congestion=congestion[i],
+                loss=loss[i],
+                total_lmp=total[i],
+                opening_price=opening[i],
+                closing_price=closing[i],
+                time=SEED_TIME + timedelta(hours=hour_offsets[i]),
+            )
+        _insert(conn, AverageLMP.__table__, rows)
+
+
+def seed_queue_projects(conn, count: int, rng: np.random.Generator):
+    table = QueueProject.__table__
+    for start in range(0, count, BATCH_SIZE):
+        size = min(BATCH_SIZE, count - start)
+        capacities = rng.uniform(1, 1000, size).round(2).tolist()
+        queue_days = rng.integers(0, 3650, size).tolist()
+        rows = []
+        for i in range(size):
+            n = start + i
+            rows.append({
+                "isoid": ISOS[n % len(ISOS)],
+                "queueid": f"Q{n:07d}",
+                "projectname": f"Project {n}",
+                "statename": STATES[n % len(STATES)],
+                "generationtype": GENERATION_TYPES[n % len(GENERATION_TYPES)],
+                "capacitymw": capacities[i],
+                "queuedate": (SEED_TIME - timedelta(days=queue_days[i])).date(),
+                "status": STATUSES[n % len(STATUSES)],
+            })
+        _insert(conn, table, rows)
+
+
+def seed(counts: dict, seed: int = 0):
+    """Recreate the benchmark tables and fill them with deterministic synthetic data"""
+    rng = np.random.default_rng(seed)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    steps = [
+        ("counties", lambda conn: seed_counties(conn, counts["counties"])),
+        ("substations", lambda conn: seed_substations(conn, counts["substations"], counts["counties"], rng)),
+        ("transmission_lines", lambda conn: seed_transmission_lines(conn, counts["transmission_lines"], rng)),
+        ("average_lmp", lambda conn: seed_average_lmp(conn, counts["average_lmp"], counts["substations"], rng)),
+        ("queue_projects", lambda conn: seed_queue_projects(conn, counts["queue_projects"], rng)),
+    ]
+    for name, step in steps:
+        started = datetime.now()
+        with engine.begin() as conn:
+            step(conn)
+        print(f"✅ Seeded {counts[name]:,} {name} in {(datetime.now() - started).total_seconds():.1f}s")
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for model in (County, Substation, SubstationStatus, TransmissionLine, AverageLMP):
+                table = model.__tablename__
+                conn.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+                )
+            conn.exec_driver_sql("ANALYZE")
@@ -0,0 +1,79 @@
+"""Cold-start benchmark.
+
+Boots the app in fresh interpreters (import + lifespan startup, as a new
+worker would) and reports per-phase timings against a boot budget.
+
+    python -m benchmarks.startup_benchmark --database-url sqlite:///./benchmark.db --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MARKER = "STARTUP_REPORT "
+
+BOOT_SCRIPT = f"""
+import asyncio, json, time
+started = time.perf_counter()
+import main
+
+async def boot():
+    async with main.app.router.lifespan_context(main.app):
+        pass
+
+asyncio.run(boot())
+report = main.startup_timer.report()
+report["boot_ms"] = round((time.perf_counter() - started) * 1000, 1)
+print("{MARKER}" + json.dumps(report))
+"""
+
+
+def boot_once(env) -> dict:
+    started = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", BOOT_SCRIPT], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    report = json.loads(next(line for line in output.splitlines() if line.startswith(MARKER))[len(MARKER):])
+    report["process_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure worker cold-start time")
+    parser.add_argument("--database-url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=1000, help="Fail when the median boot exceeds this")
+    parser.add_argument("-o", "--output", help="Write the per-run reports as JSON")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, DATABASE_URL=args.database_url)
+    # The first boot may create the schema; measure the steady-state worker boot
+    boot_once(env)
+    runs = [boot_once(env) for _ in range(args.runs)]
+
+    def median(key, phase=None):
+        values = [run["phases_ms"].get(phase, 0) if phase else run[key] for run in runs]
+        return statistics.median(values)
+
+    for phase in runs[0]["phases_ms"]:
+        print(f"{phase:20} median {median(None, phase):8.1f}ms")
+    boot = median("boot_ms")
+    print(f"{'boot (import+startup)':20} median {boot:8.1f}ms  max {max(r['boot_ms'] for r in runs):8.1f}ms")
+    print(f"{'process':20} median {median('process_ms'):8.1f}ms  (includes interpreter start)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"budget_ms": args.budget_ms, "runs": runs}, f, indent=2)
+
+    if boot > args.budget_ms:
+        print(f"❌ Median boot {boot:.0f}ms exceeds the {args.budget_ms:.0f}ms budget")
+        return 1
+    print(f"✅ Median boot {boot:.0f}ms is within the {args.budget_ms:.0f}ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,24 @@
+import time
+_imports_started = time.perf_counter()
+
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
-import uvicorn
 import os
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.routes import auth, substations, transmission_lines, average_lmp
-from app.models.database import create_tables
+from app.routes import auth, substations, transmission_lines, average_lmp, projects, documents, chat, batch
+from app.core.startup import startup_timer
+from app.middleware.admission_control import AdmissionControlMiddleware, admission_controllers
+from app.middleware.read_only import ReadOnlyMiddleware
+from app.models.database import SessionLocal, ensure_schema
+from app.services.batch_service import BATCH_PATH
+from app.services.document_service import document_pipeline
+from app.services.reference_data import reference_data
+from app.services.warm_cache import load_snapshot
+
+startup_timer.record("imports", _imports_started)
 
 # Initialize security
 security = HTTPBearer()
@@ -16,10 +27,26 @@ security = HTTPBearer()
 async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting FastAPI PowerNOVA Backend...")
-    await create_tables()
-    print("✅ Database tables created/verified")
+    with startup_timer.phase("schema"):
+        created = await ensure_schema()
+    print("✅ Database tables created" if created else "✅ Database schema up to date")
+    if not reference_data.loaded:
+        # Already loaded before fork when served by serve.py
+        with startup_timer.phase("warm_cache"):
+            db = SessionLocal()
+            try:
+                if not load_snapshot(db):
+                    reference_data.load()
+            finally:
+                db.close()
+    with startup_timer.phase("document_pipeline"):
+        # Under serve.py only worker 0 re-queues unfinished documents
+        await document_pipeline.start(resume=getattr(app.state, "worker_id", 0) == 0)
+    startup_timer.print_report()
     yield
     # Shutdown
+    await document_pipeline.stop()
+    reference_data.close()
     print("🛑 Shutting down FastAPI PowerNOVA Backend...")
 
 app = FastAPI(
@@ -31,6 +58,20 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Snapshot deployments serve reads only
+if settings.SNAPSHOT_PATH:
+    app.add_middleware(ReadOnlyMiddleware)
+
+# Admission control (added before CORS so shed responses still get CORS headers)
+app.add_middleware(
+    AdmissionControlMiddleware,
+    budgets=settings.ADMISSION_BUDGETS,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+    enabled=settings.ADMISSION_CONTROL_ENABLED,
+    # Batch sub-requests are admitted one by one against their own budgets
+    exempt_prefixes=[BATCH_PATH],
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -40,11 +81,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routes
-app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
+# Include routes (user accounts and documents are not part of a read-only snapshot)
+if not settings.SNAPSHOT_PATH:
+    app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(substations.router, prefix="/api/substations", tags=["Substations"])
 app.include_router(transmission_lines.router, prefix="/api/transmission-lines", tags=["Transmission Lines"])
 app.include_router(average_lmp.router, prefix="/api/average-lmp", tags=["Average LMP"])
+app.include_router(projects.router, prefix="/api/projects", tags=["Queue Projects"])
+if not settings.SNAPSHOT_PATH:
+    app.include_router(documents.router, prefix="/api/documents", tags=["Documents"])
+app.include_router(chat.router, prefix="/api/chat", tags=["Chat"])
+app.include_router(batch.router, prefix="/api/batch", tags=["Batch"])
 
 @app.get("/", tags=["Root"])
 async def root():
@@ -60,10 +107,14 @@ async def health_check():
     return {
         "status": "healthy",
         "environment": settings.ENVIRONMENT,
-        "database": "connected"
+        "database": "snapshot" if settings.SNAPSHOT_PATH else "connected",
+        "startup": startup_timer.report(),
+        "admission": {name: stats for controller in admission_controllers for name, stats in controller.stats().items()}
     }
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
@@ -0,0 +1,126 @@
+"""Pre-fork multi-worker server.
+
+The parent imports the app, checks the schema and warms shared state
+(county reference data in shared memory, mappings, heatmap grids, the
+autocomplete index; loaded from the warm-cache snapshot when it is
+current), then forks
+workers that inherit it copy-on-write and serve one shared listening
+socket. Dead workers are replaced; SIGTERM/SIGINT stop all of them.
+
+    python serve.py --workers 4 --port 8001
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+import main
+from app.core.config import settings
+from app.core.startup import startup_timer
+from app.middleware.firebase_auth import initialize_firebase
+from app.models.database import SessionLocal, engine, async_engine, ensure_schema
+from app.services.reference_data import reference_data
+from app.services.warm_cache import warm
+
+
+def preload():
+    """Build everything workers should share before forking"""
+    with startup_timer.phase("schema"):
+        asyncio.run(ensure_schema())
+    with startup_timer.phase("warm_cache"):
+        zooms = [int(z) for z in settings.HEATMAP_WARM_ZOOMS.split(",") if z.strip()]
+        db = SessionLocal()
+        try:
+            warm(db, zooms)
+        finally:
+            db.close()
+    with startup_timer.phase("firebase"):
+        initialize_firebase()
+
+    # Connections must not be shared across fork; each worker opens its own
+    engine.dispose()
+    asyncio.run(async_engine.dispose())
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(worker_id: int, sock: socket.socket, log_level: str):
+    main.app.state.worker_id = worker_id
+    startup_timer.phases.clear()  # The worker report covers only its own boot
+    config = uvicorn.Config(main.app, lifespan="on", log_level=log_level, access_log=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn(worker_id: int, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        try:
+            run_worker(worker_id, sock, log_level)
+        finally:
+            os._exit(0)
+    return pid
+
+
+def serve(host: str, port: int, workers: int, log_level: str):
+    preload()
+    startup_timer.print_report()
+    sock = bind_socket(host, port)
+    print(f"🚀 Serving on {host}:{port} with {workers} pre-forked workers")
+
+    children = {spawn(i, sock, log_level): i for i in range(workers)}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        worker_id = children.pop(pid, None)
+        if worker_id is None or stopping:
+            continue
+        print(f"❌ Worker {worker_id} (pid {pid}) exited with status {status}, restarting")
+        time.sleep(1)
+        children[spawn(worker_id, sock, log_level)] = worker_id
+
+    sock.close()
+    reference_data.close()
+    print("🛑 All workers stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run PowerNOVA with pre-forked workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8001)))
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, args.log_level)
+    sys.exit(0)
@@ -0,0 +1,45 @@
+"""Build a read-only SQLite snapshot for serving without a database server.
+
+Exports counties, substations, statuses, transmission lines, queue projects
+and SNAPSHOT_LMP_DAYS of LMPs up to the latest actual from DATABASE_URL into
+one file with an R-tree over substation locations and FTS5 search indexes.
+
+    python snapshot.py build -o powernova-snapshot.db --lmp-days 90
+    SNAPSHOT_PATH=powernova-snapshot.db python serve.py
+
+When SNAPSHOT_PATH is set the app opens the file immutable and memory-mapped
+and rejects writes.
+"""
+import argparse
+import os
+import sys
+import time
+
+from app.core.config import settings
+from app.services.snapshot_service import build_snapshot
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a read-only SQLite snapshot of the PowerNOVA catalog")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="Export the configured database to a snapshot file")
+    build_parser.add_argument("-o", "--output", default="powernova-snapshot.db")
+    build_parser.add_argument("--lmp-days", type=int, default=settings.SNAPSHOT_LMP_DAYS,
+                              help="Days of LMP history to include, counted back from the latest record")
+    args = parser.parse_args(argv)
+
+    if settings.SNAPSHOT_PATH:
+        print("❌ Unset SNAPSHOT_PATH to build a snapshot from DATABASE_URL")
+        return 1
+
+    started = time.perf_counter()
+    counts = build_snapshot(args.output, args.lmp_days)
+    for table, count in counts.items():
+        print(f"   {table:<20} {count:>12,} rows")
+    size = os.path.getsize(args.output) / 1024 / 1024
+    print(f"✅ Wrote {args.output} ({size:.1f} MB) in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+# Shared fixtures: the app runs against a throwaway SQLite database
+import os
+import sys
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="powernova-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["WARM_CACHE_PATH"] = ""
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp, "uploads")
+os.environ["DOCUMENT_WORKERS"] = "1"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.database import Base, SessionLocal, engine, metadata
+from app.models import models, queue_models  # noqa: F401  Registers every table on Base.metadata
+
+Base.metadata.create_all(engine)
+metadata.create_all(engine)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        session.close()
+
+
+@pytest.fixture
+def user(client):
+    from app.middleware.firebase_auth import FirebaseUser, verify_firebase_token
+
+    firebase_user = FirebaseUser(uid="test-user", email="test@example.com")
+    client.app.dependency_overrides[verify_firebase_token] = lambda: firebase_user
+    yield firebase_user
+    client.app.dependency_overrides.pop(verify_firebase_token, None)
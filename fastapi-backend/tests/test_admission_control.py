@@ -0,0 +1,95 @@
+import asyncio
+
+import httpx
+
+from app.middleware.admission_control import AdmissionControlMiddleware
+
+
+class GatedApp:
+    """ASGI app holding every request until ``release`` is set"""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = 0
+
+    async def __call__(self, scope, receive, send):
+        self.started += 1
+        await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+def middleware(app, queue_timeout=5.0, exempt_prefixes=()):
+    return AdmissionControlMiddleware(
+        app,
+        budgets={
+            "slow": {"prefixes": ["/api/slow"], "concurrency": 1, "queue": 1},
+            "default": {"prefixes": ["/api"], "concurrency": 8, "queue": 8},
+        },
+        queue_timeout=queue_timeout,
+        exempt_prefixes=exempt_prefixes,
+    )
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_requests_beyond_the_queue_are_shed():
+    async def scenario():
+        app = GatedApp()
+        admission = middleware(app)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=admission), base_url="http://test") as client:
+            admitted = asyncio.create_task(client.get("/api/slow"))
+            queued = asyncio.create_task(client.get("/api/slow"))
+            await asyncio.sleep(0.05)
+            shed = await client.get("/api/slow")
+            other = asyncio.create_task(client.get("/api/other"))
+            await asyncio.sleep(0.05)
+            app.release.set()
+            return shed, await admitted, await queued, await other, admission.budgets["slow"].stats()
+
+    shed, admitted, queued, other, stats = run(scenario())
+    assert shed.status_code == 503
+    assert int(shed.headers["retry-after"]) >= 1
+    assert admitted.status_code == queued.status_code == other.status_code == 200
+    assert stats["shed"] == 1
+    assert stats["active"] == stats["waiting"] == 0
+
+
+def test_waiting_past_the_timeout_is_shed():
+    async def scenario():
+        app = GatedApp()
+        admission = middleware(app, queue_timeout=0.05)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=admission), base_url="http://test") as client:
+            admitted = asyncio.create_task(client.get("/api/slow"))
+            await asyncio.sleep(0.01)
+            timed_out = await client.get("/api/slow")
+            app.release.set()
+            return timed_out, await admitted
+
+    timed_out, admitted = run(scenario())
+    assert timed_out.status_code == 503
+    assert admitted.status_code == 200
+
+
+def test_exempt_paths_bypass_the_budget():
+    async def scenario():
+        app = GatedApp()
+        admission = middleware(app, exempt_prefixes=["/api/slow"])
+        scope = {"type": "http", "path": "/api/slow"}
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        # Would exceed both the slot and the queue if it were charged
+        calls = [asyncio.create_task(admission(scope, None, send)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        app.release.set()
+        await asyncio.gather(*calls)
+        return sent, admission.budgets["slow"].stats()
+
+    sent, stats = run(scenario())
+    assert [m["status"] for m in sent if m["type"] == "http.response.start"] == [200, 200, 200]
+    assert stats["shed"] == 0
@@ -0,0 +1,73 @@
+import pytest
+
+from app.models.models import Substation
+from app.services import autocomplete_service
+from app.services.autocomplete_service import AutocompleteIndex
+
+
+@pytest.fixture
+def substations(db):
+    rows = [
+        Substation(name="North Alpha", voltage=500),
+        Substation(name="North Beta", voltage=230),
+        Substation(name="South Gamma", voltage=115),
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def names(results):
+    return [r["name"] for r in results]
+
+
+def test_prefix_search_ranks_by_voltage(db, substations):
+    index = AutocompleteIndex(ttl=300)
+    assert names(index.search(db, "nor", 10)) == ["North Alpha", "North Beta"]
+    assert names(index.search(db, "gamma", 10)) == ["South Gamma"]
+
+
+def test_writes_only_drop_cached_prefixes_they_match(db, substations, monkeypatch):
+    monkeypatch.setattr(autocomplete_service, "CACHED_RANGE_SIZE", 0)
+    index = AutocompleteIndex(ttl=300)
+    index.search(db, "north", 10)
+    index.search(db, "south", 10)
+    assert set(index.prefix_cache) == {"north", "south"}
+
+    delta = Substation(name="North Delta", voltage=345)
+    db.add(delta)
+    db.commit()
+    index.upsert(delta)
+    assert set(index.prefix_cache) == {"south"}
+    assert names(index.search(db, "north", 10)) == ["North Alpha", "North Delta", "North Beta"]
+
+    index.remove(substations[2].id)
+    assert set(index.prefix_cache) == {"north"}
+    assert index.search(db, "south", 10) == []
+
+
+def test_expired_index_is_rebuilt_in_the_background(db, substations):
+    index = AutocompleteIndex(ttl=0)
+    index.build(db)
+    db.add(Substation(name="North Epsilon", voltage=69))
+    db.commit()
+
+    # The stale index answers while the rebuild runs
+    assert "North Epsilon" not in names(index.search(db, "north", 10))
+    index.refresh_thread.join()
+    assert "North Epsilon" in names(index.search(db, "north", 10))
+
+
+def test_writes_during_a_rebuild_are_replayed(db, substations):
+    index = AutocompleteIndex(ttl=300)
+    index.build(db)
+    removed = substations[0].id
+
+    class RacingSession:
+        # Removes a substation after the rebuild started but before it read its rows
+        def execute(self, statement):
+            index.remove(removed)
+            return db.execute(statement)
+
+    index.build(RacingSession())
+    assert names(index.search(db, "north", 10)) == ["North Beta"]
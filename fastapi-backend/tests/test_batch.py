@@ -0,0 +1,82 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.middleware.admission_control import AdmissionControlMiddleware
+from app.models.models import Substation
+from app.routes import batch
+from app.services.batch_service import BATCH_PATH
+
+
+def test_batch_returns_sub_responses_in_request_order(client, db):
+    substation = Substation(name="Moss Landing", voltage=500)
+    db.add(substation)
+    db.commit()
+
+    response = client.post("/api/batch/", json={"requests": [
+        {"id": "found", "url": f"/api/substations/{substation.id}"},
+        {"id": "missing", "url": "/api/substations/999999"},
+        {"id": "facets", "url": "/api/projects/facets"},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["data"]
+    assert [r["id"] for r in results] == ["found", "missing", "facets"]
+    assert [r["status"] for r in results] == [200, 404, 200]
+    assert results[0]["body"]["name"] == "Moss Landing"
+
+
+def test_batch_rejects_nested_and_external_urls(client):
+    response = client.post("/api/batch/", json={"requests": [
+        {"id": "nested", "url": "/api/batch/"},
+        {"id": "external", "url": "https://example.com/api/substations/1"},
+        {"id": "outside", "url": "/health"},
+    ]})
+    assert [r["status"] for r in response.json()["data"]] == [400, 400, 400]
+
+
+def budgeted_app():
+    app = FastAPI()
+    app.include_router(batch.router, prefix="/api/batch")
+
+    @app.get("/api/ping")
+    async def ping():
+        return {"pong": True}
+
+    @app.get("/api/slow")
+    async def slow():
+        await asyncio.sleep(0.1)
+        return {"slow": True}
+
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        budgets={
+            "slow": {"prefixes": ["/api/slow"], "concurrency": 1, "queue": 0},
+            "default": {"prefixes": ["/api"], "concurrency": 1, "queue": 8},
+        },
+        exempt_prefixes=[BATCH_PATH],
+    )
+    return app
+
+
+def post_batch(app, requests):
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/api/batch/", json={"requests": requests})
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    return [r["status"] for r in response.json()["data"]]
+
+
+def test_batch_does_not_hold_a_slot_its_sub_requests_need():
+    # A single default slot: a batch charged to it would leave none for its parts
+    statuses = post_batch(budgeted_app(), [
+        {"id": str(i), "method": "POST" if i % 2 else "GET", "url": "/api/ping"} for i in range(4)
+    ])
+    assert statuses == [200, 405, 200, 405]
+
+
+def test_sub_requests_are_shed_once_their_budget_is_exhausted():
+    statuses = post_batch(budgeted_app(), [{"id": str(i), "url": "/api/slow"} for i in range(3)])
+    assert sorted(statuses) == [200, 503, 503]
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import text
+
+from app.models.models import Substation
+
+
+def bulk(client, items):
+    response = client.post("/api/substations/bulk", json=items)
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+@pytest.fixture
+def moss(db):
+    substation = Substation(name="Moss Landing", code="MOSS", voltage=500)
+    db.add(substation)
+    db.commit()
+    return substation
+
+
+def test_update_keeps_fields_the_item_leaves_out(client, db, user, moss):
+    result = bulk(client, [{"id": moss.id, "name": "Moss Landing 500kV"}])
+    assert result["updated"] == 1
+
+    db.refresh(moss)
+    assert moss.name == "Moss Landing 500kV"
+    assert (moss.code, moss.voltage) == ("MOSS", 500)
+
+
+def test_repeated_id_writes_the_last_item(client, db, user, moss):
+    result = bulk(client, [{"id": moss.id, "name": "First"}, {"id": moss.id, "name": "Second"}])
+    assert [r["status"] for r in result["results"]] == ["error", "updated"]
+    assert "superseded by item 1" in result["results"][0]["errors"][0]
+
+    db.refresh(moss)
+    assert moss.name == "Second"
+
+
+def test_rejected_row_fails_alone(client, db, user):
+    db.execute(text(
+        "CREATE TRIGGER reject_broken BEFORE INSERT ON substations "
+        "WHEN NEW.name = 'Broken' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+    ))
+    db.commit()
+    try:
+        result = bulk(client, [{"name": "Tesla"}, {"name": "Broken"}, {"name": "Metcalf"}])
+    finally:
+        db.execute(text("DROP TRIGGER reject_broken"))
+        db.commit()
+
+    assert [r["status"] for r in result["results"]] == ["created", "error", "created"]
+    assert "rejected" in result["results"][1]["errors"][0]
+    assert {s.name for s in db.query(Substation)} == {"Tesla", "Metcalf"}
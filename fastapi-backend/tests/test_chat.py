@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.services.chat_service import ChatService, LLMBackend, SemanticCache, StubLLMBackend
+
+
+def ask(service, user_id, message, history=None):
+    async def collect():
+        return [event async for event in service.stream_answer(user_id, message, history)]
+
+    events = asyncio.run(collect())
+    answer = "".join(e["data"]["token"] for e in events if e["event"] == "token")
+    return answer, events[-1]["data"]["cached"]
+
+
+@pytest.fixture
+def service():
+    return ChatService(StubLLMBackend(), SemanticCache(threshold=0.8, max_entries=10, ttl=3600))
+
+
+def test_repeated_question_is_served_from_cache(service):
+    answer, cached = ask(service, "alice", "What is the LMP at Moss Landing?")
+    assert not cached
+    again, cached = ask(service, "alice", "  what is the LMP at moss landing  ")
+    assert cached
+    assert again == answer
+
+
+def test_paraphrase_is_served_from_cache(service):
+    answer, _ = ask(service, "alice", "What is the LMP at Moss Landing?")
+    again, cached = ask(service, "alice", "What is the current LMP at Moss Landing?")
+    assert cached
+    assert again == answer
+
+
+def test_dissimilar_question_with_same_terms_misses():
+    service = ChatService(StubLLMBackend(), SemanticCache(threshold=0.99, max_entries=10, ttl=3600))
+    ask(service, "alice", "What is the LMP at Moss Landing?")
+    _, cached = ask(service, "alice", "Tell me the LMP at Moss Landing")
+    assert not cached
+
+
+@pytest.mark.parametrize(
+    "near_miss",
+    [
+        "What is the LMP at Tesla?",
+        "What is the LMP at Moss Landing in PJM?",
+        "What is the congestion at Moss Landing?",
+        "What is the LMP at Landing Moss?",
+    ],
+)
+def test_near_miss_questions_are_not_cached(service, near_miss):
+    ask(service, "alice", "What is the LMP at Moss Landing?")
+    answer, cached = ask(service, "alice", near_miss)
+    assert not cached
+    assert near_miss in answer
+
+
+def test_cache_is_scoped_per_user(service):
+    ask(service, "alice", "What is the LMP at Moss Landing?")
+    _, cached = ask(service, "bob", "What is the LMP at Moss Landing?")
+    assert not cached
+
+
+def test_follow_ups_bypass_cache(service):
+    ask(service, "alice", "And at Tesla?")
+    history = [{"role": "user", "content": "What is the LMP at Moss Landing?"}]
+    _, cached = ask(service, "alice", "And at Tesla?", history)
+    assert not cached
+
+
+def test_expired_and_evicted_entries_miss(monkeypatch):
+    cache = SemanticCache(threshold=0.8, max_entries=2, ttl=60)
+    clock = iter([0.0, 1.0, 2.0, 3.0, 100.0])
+    monkeypatch.setattr("app.services.chat_service.time.monotonic", lambda: next(clock))
+    cache.put("alice", "one", "1")
+    cache.put("alice", "two", "2")
+    cache.put("alice", "three", "3")
+    assert cache.get("alice", "one") is None
+    assert cache.get("alice", "three") == "3"
+    assert cache.get("alice", "two") is None
+
+
+def test_backends_must_implement_stream():
+    class Incomplete(LLMBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
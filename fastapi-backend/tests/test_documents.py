@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from app.models.models import Document
+from app.services.document_service import document_pipeline
+
+
+@pytest.fixture(autouse=True)
+def queued(monkeypatch):
+    # Keep documents queued instead of racing the workers for their status
+    submitted = []
+    monkeypatch.setattr(document_pipeline, "submit", submitted.append)
+    return submitted
+
+
+def upload(client, content=b"Moss Landing battery storage interconnection notes"):
+    return client.post("/api/documents/upload", files={"file": ("notes.txt", content, "text/plain")})
+
+
+def test_same_content_is_returned_as_duplicate(client, db, user):
+    first = upload(client)
+    assert first.status_code == 200
+    assert first.json()["duplicate"] is False
+
+    second = upload(client)
+    assert second.json()["duplicate"] is True
+    assert second.json()["data"]["id"] == first.json()["data"]["id"]
+
+
+def test_failed_document_is_retried_on_upload(client, db, user, queued):
+    document_id = upload(client).json()["data"]["id"]
+    db.query(Document).filter(Document.id == document_id).update({"status": "failed", "error": "boom"})
+    db.commit()
+
+    retry = upload(client)
+    assert retry.status_code == 200
+    body = retry.json()
+    assert body["duplicate"] is False
+    assert body["data"]["id"] == document_id
+    assert body["data"]["error"] is None
+    assert db.query(Document).count() == 1
+    assert queued == [document_id, document_id]
+
+
+def sign_in_as(client, uid):
+    from app.middleware.firebase_auth import FirebaseUser, verify_firebase_token
+
+    client.app.dependency_overrides[verify_firebase_token] = lambda: FirebaseUser(uid=uid, email=f"{uid}@example.com")
+
+
+def test_stored_file_is_kept_until_its_last_reference_is_deleted(client, db, user):
+    first = upload(client).json()["data"]
+    sign_in_as(client, "other-user")
+    second = upload(client).json()["data"]
+    path = db.get(Document, first["id"]).storage_path
+
+    assert client.delete(f"/api/documents/{second['id']}").status_code == 200
+    assert os.path.exists(path)
+
+    sign_in_as(client, user.uid)
+    assert client.delete(f"/api/documents/{first['id']}").status_code == 200
+    assert not os.path.exists(path)
+    assert not os.listdir(os.path.dirname(path))
+
+
+def test_upload_recreates_a_file_removed_by_a_concurrent_delete(client, db, user):
+    document_id = upload(client).json()["data"]["id"]
+    path = db.get(Document, document_id).storage_path
+    # The other user's delete found no reference and removed the file just
+    # before this upload's row was committed
+    os.remove(path)
+
+    sign_in_as(client, "other-user")
+    assert upload(client).status_code == 200
+    assert os.path.exists(path)
@@ -0,0 +1,61 @@
+from datetime import date
+
+import pytest
+
+from app.models.models import County, Substation
+from app.models.queue_models import QueueProject
+from app.models.schemas import SubstationResponse
+from app.services.fieldsets import Fieldset
+
+
+@pytest.fixture
+def substation(db):
+    county = County(name="Monterey", state="CA")
+    db.add(county)
+    db.flush()
+    row = Substation(name="Moss Landing", code="MOSS", voltage=500, county_id=county.id, latitude=36.8, longitude=-121.78)
+    db.add(row)
+    db.commit()
+    return row
+
+
+def test_list_returns_only_requested_columns(client, substation):
+    response = client.get("/api/substations/", params={"fields": "id,name,voltage"})
+    assert response.status_code == 200
+    assert response.json() == [{"id": substation.id, "name": "Moss Landing", "voltage": 500.0}]
+
+
+def test_relationship_fields_load_the_related_entity(client, substation):
+    response = client.get(f"/api/substations/{substation.id}", params={"fields": "name,county"})
+    assert response.status_code == 200
+    body = response.json()
+    assert set(body) == {"name", "county"}
+    assert body["county"]["name"] == "Monterey"
+
+
+def test_unknown_or_empty_fields_are_rejected(client, substation):
+    unknown = client.get("/api/substations/", params={"fields": "name,secret"})
+    assert unknown.status_code == 400
+    assert "secret" in unknown.json()["detail"]
+    assert client.get("/api/substations/", params={"fields": " , "}).status_code == 400
+
+
+def test_aliases_are_accepted_and_cursor_keys_still_page(client, db):
+    db.add_all(
+        QueueProject(iso_id="CAISO", queue_id=f"Q{i}", queue_date=date(2024, 1, i + 1), status="ACTIVE")
+        for i in range(3)
+    )
+    db.commit()
+
+    params = {"fields": "QueueID", "sort": "queue_date", "order": "asc", "limit": 2}
+    first = client.get("/api/projects/", params=params).json()
+    assert first["results"] == [{"QueueID": "Q0"}, {"QueueID": "Q1"}]
+    second = client.get("/api/projects/", params={**params, "cursor": first["next_cursor"]}).json()
+    assert second["results"] == [{"QueueID": "Q2"}]
+    assert second["next_cursor"] is None
+
+
+def test_columns_include_foreign_keys_of_relationships():
+    fieldset = Fieldset(SubstationResponse, Substation, "county,name")
+    assert fieldset.names == ("name", "county")
+    assert [column.key for column in fieldset.columns("id")] == ["name", "county_id", "id"]
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from app.models.models import Substation, SubstationStatus
+from app.services.heatmap_service import build_grid
+
+
+def test_grid_counts_each_substation_once_with_its_latest_capacity(db):
+    located = dict(latitude=36.8, longitude=-121.78)
+    moss = Substation(name="Moss Landing", voltage=500, **located)
+    tesla = Substation(name="Tesla", voltage=230, **located)
+    db.add_all([moss, tesla])
+    db.flush()
+    db.add_all(
+        [
+            SubstationStatus(substation_id=moss.id, available_capacity=100.0, updated_at=datetime(2024, 6, 2)),
+            SubstationStatus(substation_id=moss.id, available_capacity=50.0, updated_at=datetime(2024, 6, 1)),
+            SubstationStatus(substation_id=tesla.id, available_capacity=25.0, is_active=False),
+        ]
+    )
+    db.commit()
+
+    grid = build_grid(db, zoom=4)
+    assert grid["count"].tolist() == [2]
+    assert grid["max_voltage"].tolist() == [500.0]
+    assert grid["capacity"].tolist() == [100.0]
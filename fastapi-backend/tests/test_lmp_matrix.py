@@ -0,0 +1,50 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.models import AverageLMP, Substation
+
+
+@pytest.fixture
+def substations(db):
+    moss, tesla = Substation(name="Moss Landing"), Substation(name="Tesla")
+    db.add_all([moss, tesla])
+    db.flush()
+    db.add_all(
+        [
+            AverageLMP(substation_id=moss.id, time=datetime(2024, 1, 1, 0, 15), total_lmp=30.0),
+            AverageLMP(substation_id=moss.id, time=datetime(2024, 1, 1, 0, 45), total_lmp=40.0),
+            AverageLMP(substation_id=moss.id, time=datetime(2024, 1, 1, 2, 0), total_lmp=50.0),
+            AverageLMP(substation_id=tesla.id, time=datetime(2024, 1, 1, 1, 30), total_lmp=20.0),
+        ]
+    )
+    db.commit()
+    return moss.id, tesla.id
+
+
+def matrix(client, ids, **params):
+    response = client.get(
+        "/api/average-lmp/matrix", params={"substation_ids": ",".join(map(str, ids)), **params}
+    )
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+def test_series_share_the_time_axis_with_gaps_as_null(client, substations):
+    data = matrix(client, substations, start="2024-01-01T00:00:00", end="2024-01-01T02:00:00")
+    assert data["times"] == ["2024-01-01T00:00:00", "2024-01-01T01:00:00", "2024-01-01T02:00:00"]
+    assert [s["values"] for s in data["series"]] == [[35.0, None, 50.0], [None, 20.0, None]]
+
+
+def test_raw_bucket_keeps_stored_times(client, substations):
+    data = matrix(client, substations, start="2024-01-01T00:00:00", end="2024-01-01T01:00:00", bucket="raw")
+    assert data["times"] == ["2024-01-01T00:15:00", "2024-01-01T00:45:00"]
+    assert [s["values"] for s in data["series"]] == [[30.0, 40.0], [None, None]]
+
+
+def test_aware_bounds_are_read_as_utc(client, substations):
+    naive = matrix(client, substations, start="2024-01-01T00:00:00", end="2024-01-01T02:00:00")
+    utc = matrix(client, substations, start="2024-01-01T00:00:00Z", end="2024-01-01T02:00:00+00:00")
+    pacific = matrix(client, substations, start="2023-12-31T16:00:00-08:00", end="2024-01-01T02:00:00Z")
+    assert utc == naive
+    assert pacific == naive
@@ -0,0 +1,73 @@
+from datetime import date
+
+import pytest
+
+from app.models.queue_models import QueueProject
+
+
+@pytest.fixture
+def projects(db):
+    # Three projects share a queue date; two have none
+    dates = [date(2024, 1, 5), date(2024, 3, 1), date(2024, 3, 1), date(2024, 3, 1), None, date(2023, 7, 9), None]
+    rows = [
+        QueueProject(iso_id="CAISO" if i % 2 else "PJM", queue_id=f"Q{i:03d}", queue_date=queue_date, status="ACTIVE")
+        for i, queue_date in enumerate(dates)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+def expected_order(rows, order):
+    dated = sorted(
+        (r for r in rows if r.queue_date is not None),
+        key=lambda r: (r.queue_date, r.iso_id, r.queue_id),
+        reverse=order == "desc",
+    )
+    undated = sorted(
+        (r for r in rows if r.queue_date is None),
+        key=lambda r: (r.iso_id, r.queue_id),
+        reverse=order == "desc",
+    )
+    return [(r.iso_id, r.queue_id) for r in dated + undated]
+
+
+def walk(client, order, limit=2):
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"sort": "queue_date", "order": order, "limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/projects/", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        if pages == 0:
+            assert page["count"] == 7
+        else:
+            assert page["count"] is None
+        seen.extend((p["IsoID"], p["QueueID"]) for p in page["results"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen, pages
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_cursor_pages_cover_every_project_once_with_nulls_last(client, projects, order):
+    seen, pages = walk(client, order)
+    assert seen == expected_order(projects, order)
+    assert pages == 4
+
+
+def test_invalid_cursor_is_rejected(client, projects):
+    response = client.get("/api/projects/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_cursor_must_match_sort(client, projects):
+    first = client.get("/api/projects/", params={"sort": "queue_date", "order": "asc", "limit": 2}).json()
+    response = client.get(
+        "/api/projects/",
+        params={"sort": "queue_date", "order": "desc", "limit": 2, "cursor": first["next_cursor"]},
+    )
+    assert response.status_code == 400
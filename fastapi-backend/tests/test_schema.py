@@ -0,0 +1,21 @@
+import asyncio
+
+from sqlalchemy import text, update
+
+from app.models.database import engine, ensure_schema, existing_index_names, schema_version
+
+DROPPED = ["ix_average_lmp_substation_time", "ix_queueinfo_capacitymw_pk", "ix_queueinfo_isoid_upper"]
+
+
+def test_ensure_schema_adds_indexes_missing_from_existing_tables():
+    with engine.begin() as conn:
+        for name in DROPPED:
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(update(schema_version).values(version="stale"))
+
+    assert asyncio.run(ensure_schema()) is True
+
+    with engine.connect() as conn:
+        assert set(DROPPED) <= existing_index_names(conn)
+    # Recorded, so the next boot skips the check
+    assert asyncio.run(ensure_schema()) is False
@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, select
+
+from app.models.models import AverageLMP, Substation
+from app.services.snapshot_service import build_snapshot
+
+
+def test_lmp_window_ends_at_the_latest_actual(db, tmp_path):
+    substation = Substation(name="Moss Landing")
+    db.add(substation)
+    db.flush()
+    latest_actual = datetime(2024, 6, 30)
+    rows = {
+        "recent actual": (latest_actual, "actual"),
+        "inside window": (latest_actual - timedelta(days=5), "actual"),
+        "too old": (latest_actual - timedelta(days=11), "actual"),
+        # A year-ahead forecast must not pull the window past the actuals
+        "forecast": (latest_actual + timedelta(days=365), "forecast"),
+    }
+    db.add_all(
+        AverageLMP(substation_id=substation.id, lmp_type=lmp_type, time=time, total_lmp=1.0)
+        for time, lmp_type in rows.values()
+    )
+    db.commit()
+
+    output = str(tmp_path / "snapshot.db")
+    counts = build_snapshot(output, lmp_days=10)
+    assert counts["average_lmp"] == 3
+
+    snapshot = create_engine(f"sqlite:///{output}")
+    with snapshot.connect() as conn:
+        assert conn.execute(select(func.min(AverageLMP.time))).scalar() == latest_actual - timedelta(days=5)
+    snapshot.dispose()
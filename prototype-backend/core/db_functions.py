@@ -0,0 +1,25 @@
+from django.db.models import Func
+from django.db.models import Aggregate
+from django.db.models import FloatField
+from django.db.models import TextField
+
+
+class ToChar(Func):
+    """PostgreSQL ``to_char(value, format)``"""
+
+    function = "to_char"
+    output_field = TextField()
+
+
+class First(Aggregate):
+    """TimescaleDB ``first(value, time)``: the value at the earliest time"""
+
+    function = "first"
+    output_field = FloatField()
+
+
+class Last(Aggregate):
+    """TimescaleDB ``last(value, time)``: the value at the latest time"""
+
+    function = "last"
+    output_field = FloatField()
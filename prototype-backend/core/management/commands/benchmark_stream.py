@@ -0,0 +1,101 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.renderers import StreamFormat
+from core.renderers import stream_rows
+from core.renderers import generate_json_response
+
+from substation.models import AverageLMP
+from substation.views import AverageLMPListAPIView
+
+
+COLUMN_HEADERS = [
+    "Substation",
+    "Substation ID",
+    "Energy",
+    "Congestion",
+    "Loss",
+    "LMP",
+    "Opening Price",
+    "Closing Price",
+    "Time",
+]
+
+# Rows per chunk and delay of the previous fixed-size, sleeping stream
+LEGACY_ROWS_PER_CHUNK = 10
+LEGACY_SLEEP = 0.2
+
+
+def synthetic_rows(count: int):
+    for i in range(count):
+        yield [
+            f"Substation {i % 500}",
+            str(i % 500),
+            "31.254",
+            "-1.02",
+            "0.874",
+            "31.108",
+            "29.5",
+            "33.75",
+            "2024-06-01 00:00:00+00:00",
+        ]
+
+
+class Command(BaseCommand):
+    help = "Measure rows/s of the JSON streaming engine"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100000)
+        parser.add_argument(
+            "--format",
+            choices=[StreamFormat.NDJSON, StreamFormat.SSE],
+            default=StreamFormat.NDJSON,
+        )
+        parser.add_argument("--chunk-bytes", type=int, default=None)
+        parser.add_argument(
+            "--database",
+            action="store_true",
+            help="Stream AverageLMP rows from the database instead of synthetic rows",
+        )
+
+    def handle(self, *args, **options):
+        stream_options = {"stream_format": options["format"]}
+        if options["chunk_bytes"]:
+            stream_options["chunk_bytes"] = options["chunk_bytes"]
+
+        if options["database"]:
+            queryset = AverageLMP.timescale.order_by("time")[: options["rows"]]
+            stream_columns = AverageLMPListAPIView.stream_columns
+            chunks = generate_json_response(
+                queryset,
+                list(stream_columns),
+                fields=list(stream_columns.values()),
+                **stream_options,
+            )
+        else:
+            chunks = stream_rows(
+                synthetic_rows(options["rows"]), COLUMN_HEADERS, **stream_options
+            )
+
+        started = time.perf_counter()
+        chunk_count, byte_count = 0, 0
+        for chunk in chunks:
+            chunk_count += 1
+            byte_count += len(chunk)
+        elapsed = time.perf_counter() - started
+
+        rows = options["rows"]
+        if options["database"]:
+            rows = min(rows, AverageLMP.timescale.count())
+        legacy = rows / LEGACY_ROWS_PER_CHUNK * LEGACY_SLEEP
+
+        self.stdout.write(
+            f"{rows} rows in {elapsed:.3f}s: {rows / max(elapsed, 1e-9):,.0f} rows/s, "
+            f"{byte_count / max(elapsed, 1e-9) / 1e6:.1f} MB/s, "
+            f"{chunk_count} chunks of ~{byte_count / max(chunk_count, 1) / 1024:.0f} KB"
+        )
+        self.stdout.write(
+            f"Previous engine: at least {legacy:,.0f}s in sleeps alone "
+            f"({LEGACY_ROWS_PER_CHUNK} rows per chunk, {LEGACY_SLEEP}s apart)"
+        )
@@ -1,13 +1,23 @@
 import json
+import math
 import time
 
 from typing import List
 from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 
+from rest_framework.exceptions import ValidationError
 from rest_framework.renderers import JSONRenderer
 
+from project.env import ENV
+
 
 class CgApiRenderer(JSONRenderer):
     def render(self, data, accepted_media_type=None, renderer_context=None):
@@ -28,30 +38,177 @@ class CgApiRenderer(JSONRenderer):
         )
 
 
-ROWS_PER_CHUNK = 10
+class StreamFormat:
+    NDJSON = "ndjson"
+    SSE = "sse"
 
+    CONTENT_TYPES = {
+        NDJSON: "application/x-ndjson",
+        SSE: "text/event-stream",
+    }
 
-def generate_json_response(
-    queryset: QuerySet, column_headers: List[str], row_transform: Callable
-):
+
+# Rows fetched per round trip from the database cursor
+ITERATOR_CHUNK_SIZE = 2000
+
+# Bounds for the adaptive rows-per-chunk estimate
+MIN_ROWS_PER_CHUNK = 10
+MAX_ROWS_PER_CHUNK = 20000
+INITIAL_ROWS_PER_CHUNK = 100
+
+
+class RowEncoder:
+    """
+    Frame column headers and row batches as NDJSON lines or SSE events.
     """
-    Generate JSON or dictionary chunks for a queryset.
 
-    :param queryset: The queryset to process.
+    def __init__(self, stream_format: str = StreamFormat.NDJSON):
+        self.stream_format = stream_format
+
+    def frame(self, event: str, payload: str) -> str:
+        if self.stream_format == StreamFormat.SSE:
+            return "event: " + event + "\ndata: " + payload + "\n\n"
+        return payload + "\n"
+
+    def columns(self, column_headers: List[str]) -> str:
+        return self.frame("columns", '{"columns": ' + json.dumps(column_headers) + "}")
+
+    def rows(self, rows: List[Sequence]) -> str:
+        return self.frame(
+            "rows", '{"rows": ' + json.dumps(rows, cls=DjangoJSONEncoder) + "}"
+        )
+
+    def end(self, row_count: int) -> Optional[str]:
+        # NDJSON ends with the connection; SSE clients need an explicit marker
+        # since EventSource reconnects when the stream closes.
+        if self.stream_format == StreamFormat.SSE:
+            return self.frame("end", json.dumps({"count": row_count}))
+        return None
+
+
+def stream_rows(
+    rows: Iterable[Sequence],
+    column_headers: List[str],
+    stream_format: str = StreamFormat.NDJSON,
+    chunk_bytes: int = ENV.STREAM_CHUNK_BYTES,
+    pace: float = 0,
+) -> Iterator[str]:
+    """
+    Encode rows into chunks of roughly ``chunk_bytes`` each.
+
+    The number of rows per chunk is re-estimated from the bytes per row of
+    the previous chunk, so narrow and wide rows both produce chunks near the
+    target size without encoding rows one at a time.
+
+    :param rows: Iterable of JSON-serializable row sequences.
     :param column_headers: A list of column headers for the JSON output.
-    :param row_transform: A callable that transforms an object in the queryset into a list of row values. # noqa
-    :return: A generator yielding dictionaries for column headers and rows.
+    :param stream_format: ``StreamFormat.NDJSON`` or ``StreamFormat.SSE``.
+    :param chunk_bytes: Target size of each chunk.
+    :param pace: Seconds to wait between chunks; only set when the client asks for it.
+    :return: A generator yielding framed chunks.
     """
 
-    yield '{"columns": ' + json.dumps(column_headers) + "}"
+    encoder = RowEncoder(stream_format)
+    yield encoder.columns(column_headers)
 
+    rows_per_chunk = INITIAL_ROWS_PER_CHUNK
+    row_count = 0
     current_chunk = []
-    for obj in queryset.iterator():
-        current_chunk.append(row_transform(obj))
-        if len(current_chunk) >= ROWS_PER_CHUNK:
-            time.sleep(0.2)
-            yield '{"rows": ' + json.dumps(current_chunk) + "}"
+    for row in rows:
+        current_chunk.append(row)
+        if len(current_chunk) >= rows_per_chunk:
+            chunk = encoder.rows(current_chunk)
+            row_count += len(current_chunk)
+            bytes_per_row = max(len(chunk) / len(current_chunk), 1)
+            rows_per_chunk = min(
+                max(int(chunk_bytes / bytes_per_row), MIN_ROWS_PER_CHUNK),
+                MAX_ROWS_PER_CHUNK,
+            )
             current_chunk = []
+            yield chunk
+            if pace:
+                time.sleep(pace)
 
     if current_chunk:
-        yield '{"rows": ' + json.dumps(current_chunk) + "}"
+        row_count += len(current_chunk)
+        yield encoder.rows(current_chunk)
+
+    end = encoder.end(row_count)
+    if end:
+        yield end
+
+
+def generate_json_response(
+    queryset: QuerySet,
+    column_headers: List[str],
+    row_transform: Optional[Callable] = None,
+    fields: Optional[List[str]] = None,
+    **options,
+):
+    """
+    Generate JSON chunks for a queryset.
+
+    :param queryset: The queryset to process.
+    :param column_headers: A list of column headers for the JSON output.
+    :param row_transform: Optional callable that transforms a row (an object, or a tuple when ``fields`` is given) into a list of row values. # noqa
+    :param fields: Fields to fetch with ``values_list`` instead of loading model instances.
+    :param options: Passed to ``stream_rows`` (``stream_format``, ``chunk_bytes``, ``pace``).
+    :return: A generator yielding the column headers and then row chunks.
+    """
+
+    if fields:
+        queryset = queryset.values_list(*fields)
+    rows = queryset.iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    if row_transform is not None:
+        rows = map(row_transform, rows)
+    return stream_rows(rows, column_headers, **options)
+
+
+def get_stream_options(request) -> dict:
+    """
+    Read the client's streaming preferences from the query string.
+
+    ``?stream=sse`` switches to Server-Sent Events framing (the default is
+    NDJSON). ``?pace=<seconds>`` adds a delay between chunks, capped at
+    ``STREAM_MAX_PACE``, for clients that render progressively.
+    """
+    stream_format = request.query_params.get("stream", StreamFormat.NDJSON)
+    if stream_format not in StreamFormat.CONTENT_TYPES:
+        raise ValidationError(
+            {"stream": f"Must be one of: {', '.join(StreamFormat.CONTENT_TYPES)}."}
+        )
+
+    pace = request.query_params.get("pace")
+    try:
+        pace = float(pace) if pace else 0
+    except ValueError:
+        raise ValidationError({"pace": "Must be a number of seconds."})
+    if not math.isfinite(pace):
+        raise ValidationError({"pace": "Must be a finite number of seconds."})
+    if pace < 0:
+        raise ValidationError({"pace": "Must not be negative."})
+
+    return {
+        "stream_format": stream_format,
+        "pace": min(pace, ENV.STREAM_MAX_PACE),
+    }
+
+
+def streaming_json_response(
+    request,
+    queryset: QuerySet,
+    column_headers: List[str],
+    row_transform: Optional[Callable] = None,
+    fields: Optional[List[str]] = None,
+) -> StreamingHttpResponse:
+    options = get_stream_options(request)
+    response = StreamingHttpResponse(
+        generate_json_response(
+            queryset, column_headers, row_transform, fields, **options
+        ),
+        content_type=StreamFormat.CONTENT_TYPES[options["stream_format"]],
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the whole stream before sending it on
+    response["X-Accel-Buffering"] = "no"
+    return response
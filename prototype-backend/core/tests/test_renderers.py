@@ -0,0 +1,80 @@
+import json
+
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.renderers import StreamFormat
+from core.renderers import stream_rows
+from core.renderers import get_stream_options
+
+
+COLUMNS = ["Substation", "LMP"]
+
+
+def make_rows(count):
+    return ([f"Substation {i}", str(i * 1.5)] for i in range(count))
+
+
+class StreamRowsTest(SimpleTestCase):
+    def test_ndjson_lines(self):
+        chunks = list(stream_rows(make_rows(250), COLUMNS))
+        lines = [json.loads(line) for line in "".join(chunks).splitlines()]
+        self.assertEqual(lines[0], {"columns": COLUMNS})
+        rows = [row for line in lines[1:] for row in line["rows"]]
+        self.assertEqual(rows, list(make_rows(250)))
+
+    def test_sse_events(self):
+        chunks = list(
+            stream_rows(make_rows(5), COLUMNS, stream_format=StreamFormat.SSE)
+        )
+        self.assertTrue(all(chunk.endswith("\n\n") for chunk in chunks))
+        self.assertTrue(chunks[0].startswith("event: columns\ndata: "))
+        self.assertTrue(chunks[1].startswith("event: rows\ndata: "))
+        self.assertEqual(chunks[-1], 'event: end\ndata: {"count": 5}\n\n')
+
+    def test_chunks_adapt_to_byte_target(self):
+        chunks = list(stream_rows(make_rows(20000), COLUMNS, chunk_bytes=4096))
+        # The first chunk uses the initial estimate; later ones track the target
+        for chunk in chunks[2:-1]:
+            self.assertLess(abs(len(chunk) - 4096), 1024)
+
+    def test_no_pacing_by_default(self):
+        with mock.patch("core.renderers.time.sleep") as sleep:
+            list(stream_rows(make_rows(1000), COLUMNS))
+        sleep.assert_not_called()
+
+    def test_pacing_when_requested(self):
+        with mock.patch("core.renderers.time.sleep") as sleep:
+            chunks = list(stream_rows(make_rows(1000), COLUMNS, pace=0.1))
+        self.assertEqual(sleep.call_count, len(chunks) - 2)
+
+
+class StreamOptionsTest(SimpleTestCase):
+    def options(self, query):
+        return get_stream_options(Request(APIRequestFactory().get("/", query)))
+
+    def test_defaults(self):
+        self.assertEqual(
+            self.options({}), {"stream_format": StreamFormat.NDJSON, "pace": 0}
+        )
+
+    def test_pace_is_capped(self):
+        options = self.options({"stream": "sse", "pace": "30"})
+        self.assertEqual(options["stream_format"], StreamFormat.SSE)
+        self.assertEqual(options["pace"], 1.0)
+
+    def test_invalid_options(self):
+        for query in (
+            {"stream": "xml"},
+            {"pace": "soon"},
+            {"pace": "-1"},
+            {"pace": "nan"},
+            {"pace": "inf"},
+        ):
+            with self.assertRaises(ValidationError):
+                self.options(query)
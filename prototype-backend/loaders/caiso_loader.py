@@ -4,11 +4,17 @@ import gridstatus
 import gridmonitor
 import pandas as pd
 
+from datetime import date
+
 from django.db.models import Q
 from django.db import transaction
 from django.contrib.gis.geos import Point, LineString
 
 from substation import models
+from substation.lmp_fetcher import LMPFetchScheduler
+from substation.market_data_lake import cached_snapshot
+from substation.market_data_lake import market_data_lake
+from substation.summary import refresh_substation_summaries
 
 from loaders.utils import print_success
 from loaders.utils import print_warning
@@ -99,15 +105,52 @@ def load_substation_county_and_location(json_path: str | None):
             )
 
 
-def load_avaliablecapacity_and_no_of_constraints_from_heatmap():
-    iso = gridmonitor.CAISO()
-    resp = iso.get_raw_heatmap_data()
-    if resp is None:
+def fetch_interconnection_queue(day: date | None = None) -> pd.DataFrame | None:
+    """Today's CAISO queue through the market-data lake, or the one stored for ``day``"""
+    return cached_snapshot(
+        "interconnection_queue",
+        "caiso",
+        "all",
+        lambda: gridstatus.CAISO().get_interconnection_queue(),
+        day,
+    )
+
+
+def fetch_heatmap_tables(day: date | None = None):
+    """
+    Buses and flowgates of the CAISO heatmap through the market-data lake
+    (one download for both), or ``(None, None)`` when there is no data.
+    """
+    raw = {}
+
+    def table(name):
+        def fetch():
+            if not raw:
+                resp = gridmonitor.CAISO().get_raw_heatmap_data()
+                if resp is None:
+                    return None
+                raw.update(resp["wcResults"][0])
+            return pd.DataFrame(raw[name])
+
+        return fetch
+
+    buses = cached_snapshot("heatmap_buses", "caiso", "all", table("buses"), day)
+    if buses is None:
+        return None, None
+    flow_gates = cached_snapshot(
+        "heatmap_flowgates", "caiso", "all", table("flowgates"), day
+    )
+    return buses, flow_gates
+
+
+def load_avaliablecapacity_and_no_of_constraints_from_heatmap(
+    day: date | None = None,
+):
+    buses, flow_gates = fetch_heatmap_tables(day)
+    if buses is None or flow_gates is None:
         print_warning("No data found in heatmap")
         return
 
-    buses = pd.DataFrame(resp["wcResults"][0]["buses"])
-    flow_gates = pd.DataFrame(resp["wcResults"][0]["flowgates"])
     merged_df = pd.merge(
         buses[["id", "busname", "trlim"]],
         flow_gates[["busid", "mon"]],
@@ -176,10 +219,9 @@ def load_policy_portfolio(csv_path: str | None):
             )
 
 
-def load_queue_and_no_of_connections():
-    iso = gridstatus.CAISO()
-    resp = iso.get_interconnection_queue()
-    if resp.empty:
+def load_queue_and_no_of_connections(day: date | None = None):
+    resp = fetch_interconnection_queue(day)
+    if resp is None or resp.empty:
         print_warning("No data found in interconnection queue")
         return
     resp["Interconnection Location"] = resp["Interconnection Location"].apply(
@@ -233,6 +275,9 @@ def load_queue_and_no_of_connections():
                         queue=queue,
                         no_of_projects=no_of_projects,
                     )
+                    # QuerySet.update sends no post_save, so the summary
+                    # receivers don't see it
+                    refresh_substation_summaries([substation.id])
                     print_success(
                         f"Substation queue for {name} ({voltage} kV) updated successfully"
                     )
@@ -336,35 +381,21 @@ def load_lmp_and_substation_code(json_data_path: str):
 
 
 def load_lmp_from_date_range(start_date: str, end_date: str):
-    iso = gridstatus.CAISO()
-    for date in pd.date_range(start=start_date, end=end_date):
-        lmp_data = iso.get_lmp(
-            locations="all",
-            market=gridstatus.Markets.DAY_AHEAD_HOURLY,
-            date=date.strftime("%Y-%m-%d"),
-            end=(date + pd.Timedelta(days=1)).strftime("%Y-%m-%d"),
-        )
-        for _, row in lmp_data.iterrows():
-            try:
-                substation = models.Substation.objects.filter(
-                    code=row["Location"]
-                ).first()
-                if not substation:
-                    continue
-                models.SubstationLMP.objects.get_or_create(
-                    substation=substation,
-                    energy=row["Energy"],
-                    congestion=row["Congestion"],
-                    loss=row["Loss"],
-                    time=row["Time"],
-                )
-                print_success(
-                    f"Substation LMP for {substation.name} created successfully"
-                )
-            except Exception as e:
-                print_warning(
-                    f"Error creating substation LMP: {row['Location']} ({row['Time']}): {e}"
-                )
+    def report(stats, total):
+        print_success(f"{stats.windows}/{total} days saved ({stats.rows} LMPs)")
+
+    scheduler = LMPFetchScheduler(
+        models.SubstationLMPMarket.DAM,
+        window=pd.Timedelta(days=1),
+        progress=report,
+        lake=market_data_lake(),
+    )
+    # The range is inclusive of the end date
+    stats = scheduler.run(
+        pd.Timestamp(start_date), pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    )
+    for window in stats.failed:
+        print_warning(f"Error loading substation LMPs for {window.start:%Y-%m-%d}")
 
 
 def load_transmission_lines(json_data_path: str):
@@ -410,17 +441,22 @@ def load_all_data(
     policy_portfolio_csv_path: str | None,
     interconnection_queue: bool,
     constraint_report_csv_path: str | None,
+    snapshot_date: date | None = None,
 ):
+    """
+    :param snapshot_date: Replay the heatmap and queue pulls stored in the
+        market-data lake for this day instead of downloading them.
+    """
     if substation_csv_path:
         load_substations(substation_csv_path)
     if substation_county_location_json_path:
         load_substation_county_and_location(substation_county_location_json_path)
     if heatmap_constraints:
-        load_avaliablecapacity_and_no_of_constraints_from_heatmap()
+        load_avaliablecapacity_and_no_of_constraints_from_heatmap(snapshot_date)
     if policy_portfolio_csv_path:
         load_policy_portfolio(policy_portfolio_csv_path)
     if interconnection_queue:
-        load_queue_and_no_of_connections()
+        load_queue_and_no_of_connections(snapshot_date)
     if constraint_report_csv_path:
         load_constraints_from_constraint_report(constraint_report_csv_path)
 
@@ -28,6 +28,15 @@ class Environment(BaseSettings):
     COSMIC_AI_API_KEY: str = "secret"
     COSMIC_AI_URL: str = "http://localhost:8000"
     FORECAST_LENGTH: int = 90
+    STREAM_CHUNK_BYTES: int = 65536
+    STREAM_MAX_PACE: float = 1.0
+    LMP_FETCH_WORKERS: int = 4
+    LMP_FETCH_RATE: float = 2.0
+    LMP_FETCH_RETRIES: int = 5
+    LMP_FETCH_WINDOW_HOURS: int = 1
+    MARKET_DATA_LAKE_PATH: str = "data/lake"
+    LMP_COMPRESS_AFTER_DAYS: int = 7
+    LMP_RTM_RETENTION_DAYS: int = 0
 
 
 ENV = Environment()
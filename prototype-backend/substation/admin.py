@@ -129,4 +129,23 @@ class AverageSubstationLMPAdmin(admin.ModelAdmin):
     date_hierarchy = "time"
 
 
-admin.site.register(models.AverageLMP, AverageSubstationLMPAdmin)
\ No newline at end of file
+admin.site.register(models.AverageLMP, AverageSubstationLMPAdmin)
+
+class LMPBackfillWindowAdmin(admin.ModelAdmin):
+    list_display = [
+        "iso",
+        "market",
+        "start",
+        "end",
+        "rows",
+        "completed_at",
+    ]
+    list_filter = (
+        "iso",
+        "market",
+    )
+    ordering = ("-start",)
+    date_hierarchy = "start"
+
+
+admin.site.register(models.LMPBackfillWindow, LMPBackfillWindowAdmin)
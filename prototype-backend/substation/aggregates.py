@@ -0,0 +1,180 @@
+"""
+TimescaleDB continuous aggregate of daily RTM LMPs per substation.
+
+``substation_lmp_daily`` holds the daily energy, congestion and loss means
+and the first and last total LMP of each substation's day. Timescale keeps
+it current with a refresh policy, so the daily ACTUAL ``AverageLMP`` rows
+are copied from it in one statement instead of being recomputed per
+substation and day.
+"""
+import logging
+
+from datetime import time
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import connection
+from django.db import transaction
+from django.db import DatabaseError
+from django.utils import timezone
+
+from substation.models import AverageLMP
+from substation.models import AverageLMPType
+from substation.models import SubstationLMP
+from substation.models import SubstationLMPMarket
+
+
+logger = logging.getLogger(__name__)
+
+DAILY_LMP_VIEW = "substation_lmp_daily"
+
+# Days start at midnight PST, as in calculate_and_save_avg_lmp (fixed UTC-8,
+# only CAISO is supported for now)
+LMP_DAY_TIMEZONE = "Etc/GMT+8"
+LMP_DAY_TZINFO = dt_timezone(timedelta(hours=-8))
+
+# The refresh policy re-materializes this window every run; older buckets
+# are only refreshed explicitly (e.g. after a backfill)
+REFRESH_START_OFFSET = "3 days"
+REFRESH_END_OFFSET = "1 hour"
+REFRESH_SCHEDULE_INTERVAL = "30 minutes"
+
+
+def create_daily_lmp_aggregate():
+    """
+    Create the continuous aggregate and its refresh policy.
+
+    Returns False when the installed TimescaleDB has no continuous
+    aggregates (community features or 2.8+ are required).
+    """
+    lmp_table = SubstationLMP._meta.db_table
+    statements = [
+        f"""
+        CREATE MATERIALIZED VIEW IF NOT EXISTS {DAILY_LMP_VIEW}
+        WITH (timescaledb.continuous) AS
+        SELECT
+            substation_id,
+            time_bucket(INTERVAL '1 day', time, '{LMP_DAY_TIMEZONE}') AS day,
+            avg(energy) AS energy,
+            avg(congestion) AS congestion,
+            avg(loss) AS loss,
+            first(energy + congestion + loss, time) AS opening_price,
+            last(energy + congestion + loss, time) AS closing_price,
+            count(*) AS sample_count
+        FROM {lmp_table}
+        WHERE market = '{SubstationLMPMarket.RTM_5min}'
+        GROUP BY substation_id, day
+        WITH NO DATA
+        """,
+        f"""
+        SELECT add_continuous_aggregate_policy(
+            '{DAILY_LMP_VIEW}',
+            start_offset => INTERVAL '{REFRESH_START_OFFSET}',
+            end_offset => INTERVAL '{REFRESH_END_OFFSET}',
+            schedule_interval => INTERVAL '{REFRESH_SCHEDULE_INTERVAL}',
+            if_not_exists => true
+        )
+        """,
+    ]
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+    except DatabaseError as e:
+        logger.warning(f"Continuous aggregates unavailable, skipping: {e}")
+        return False
+    return True
+
+
+def drop_daily_lmp_aggregate():
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP MATERIALIZED VIEW IF EXISTS {DAILY_LMP_VIEW}")
+
+
+def daily_lmp_aggregate_exists() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [DAILY_LMP_VIEW])
+        return cursor.fetchone()[0]
+
+
+def refresh_daily_lmp(start: datetime | None, end: datetime):
+    """
+    Materialize buckets between ``start`` and ``end`` (all of history if
+    ``start`` is None). Must run outside a transaction.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CALL refresh_continuous_aggregate(%s, %s, %s)",
+            [DAILY_LMP_VIEW, start, end],
+        )
+
+
+def save_actual_avg_lmp_from_aggregate(
+    end: datetime, since: datetime | None = None
+) -> int:
+    """
+    Copy complete days before ``end`` into ACTUAL ``AverageLMP`` rows.
+
+    Each coded substation gets the days after its latest ACTUAL row, or
+    after ``since`` when given.
+    """
+    last_saved = (
+        "%(since)s"
+        if since is not None
+        else f"""(
+            SELECT max(average_lmp.time) FROM {AverageLMP._meta.db_table} average_lmp
+            WHERE average_lmp.substation_id = daily.substation_id
+            AND average_lmp.type = %(actual)s
+        )"""
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {AverageLMP._meta.db_table} (
+                substation_id, type, time, energy, congestion, loss,
+                total_lmp, opening_price, closing_price
+            )
+            SELECT
+                daily.substation_id, %(actual)s, daily.day, daily.energy,
+                daily.congestion, daily.loss,
+                daily.energy + daily.congestion + daily.loss,
+                daily.opening_price, daily.closing_price
+            FROM {DAILY_LMP_VIEW} daily
+            JOIN substation_substation substation
+                ON substation.id = daily.substation_id
+            WHERE substation.code IS NOT NULL
+            AND daily.day + INTERVAL '1 day' <= %(end)s
+            AND daily.day > COALESCE({last_saved}, '-infinity'::timestamptz)
+            AND daily.energy + daily.congestion + daily.loss IS NOT NULL
+            ON CONFLICT (substation_id, type, time) DO UPDATE SET
+                energy = EXCLUDED.energy,
+                congestion = EXCLUDED.congestion,
+                loss = EXCLUDED.loss,
+                total_lmp = EXCLUDED.total_lmp,
+                opening_price = EXCLUDED.opening_price,
+                closing_price = EXCLUDED.closing_price
+            """,
+            {"actual": AverageLMPType.ACTUAL, "end": end, "since": since},
+        )
+        return cursor.rowcount
+
+
+def calculate_and_save_avg_lmp_from_aggregate(since: datetime | None = None) -> int:
+    """
+    Refresh the aggregate and save the pending days as ACTUAL ``AverageLMP``
+    rows: one refresh and one insert per run.
+
+    Refreshing only re-materializes buckets invalidated by new LMP rows, so
+    an open-ended window stays cheap.
+    """
+    if since is not None and not isinstance(since, datetime):
+        since = datetime.combine(since, time.min, tzinfo=LMP_DAY_TZINFO)
+    # Midnight PST today: only days that have ended are saved
+    today = (
+        timezone.now()
+        .astimezone(LMP_DAY_TZINFO)
+        .replace(hour=0, minute=0, second=0, microsecond=0)
+    )
+    refresh_daily_lmp(since, today)
+    return save_actual_avg_lmp_from_aggregate(today, since)
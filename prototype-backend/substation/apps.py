@@ -7,3 +7,4 @@ class SubstationConfig(AppConfig):
 
     def ready(self):
         import substation.cron_jobs  # noqa: F401
+        import substation.recievers  # noqa: F401
@@ -1,6 +1,5 @@
 import re
 import logging
-import gridstatus
 
 from datetime import timedelta
 
@@ -12,9 +11,6 @@ from huey import crontab
 from huey.contrib.djhuey import periodic_task
 
 from substation.models import Substation
-from substation.models import AverageLMP
-from substation.models import SubstationLMP
-from substation.models import AverageLMPType
 from substation.models import SubstationType
 from substation.models import SubstationQueue
 from substation.models import SubstationLMPMarket
@@ -22,7 +18,15 @@ from substation.models import SubstationLMPMarket
 from substation.utils import load_lmp_from_date_range
 from substation.utils import get_last_lmp_date
 
-from substation.utils import calculate_avg_lmp_from_date_range
+from substation.summary import refresh_substation_summaries
+
+from substation.aggregates import DAILY_LMP_VIEW
+from substation.aggregates import daily_lmp_aggregate_exists
+from substation.aggregates import calculate_and_save_avg_lmp_from_aggregate
+
+from substation.rollups import rollup_daily_avg_lmp
+
+from substation.lmp_storage import prune_raw_rtm_lmp
 
 
 logger = logging.getLogger(__name__)
@@ -58,11 +62,12 @@ def load_rtm_lmp():
 @periodic_task(crontab(minute=0, hour=1))
 def load_caiso_queue_and_no_of_connections():
     from loaders.caiso_loader import extract_name_voltage
+    from loaders.caiso_loader import fetch_interconnection_queue
 
-    iso = gridstatus.CAISO()
-    resp = iso.get_interconnection_queue()
+    resp = fetch_interconnection_queue()
 
-    if not resp.empty:
+    if resp is None or resp.empty:
+        logger.warning("No CAISO interconnection queue fetched, skipping")
         return
 
     resp["Interconnection Location"] = resp["Interconnection Location"].apply(
@@ -111,15 +116,23 @@ def load_caiso_queue_and_no_of_connections():
             logger.error(f"Error in loading CAISO queue: {e}")
 
 
-def get_last_date_for_actual_avg_lmp_for_substation(substation):
-    last_entry = (
-        AverageLMP.objects.filter(substation=substation, type=AverageLMPType.ACTUAL)
-        .order_by("-time")
-        .first()
-    )
-    if last_entry:
-        return last_entry.time
-    return None
+# Schedule to run every day at 2:00 AM
+@periodic_task(crontab(minute=0, hour=2))
+def refresh_substation_summary():
+    # Summaries are refreshed on every write; this catches bulk updates that
+    # bypass signals (e.g. QuerySet.update)
+    refreshed = refresh_substation_summaries()
+    logger.info(f"Refreshed {refreshed} substation summaries")
+
+
+# Schedule to run every day at 3:00 AM
+@periodic_task(crontab(minute=0, hour=3))
+def prune_raw_rtm_lmp_data():
+    # No-op unless LMP_RTM_RETENTION_DAYS is set
+    deleted = prune_raw_rtm_lmp()
+    if deleted:
+        logger.info(f"Pruned {deleted} raw RTM LMPs past retention")
+
 
 # Schedule to run every day at 9:30 AM
 @periodic_task(crontab(minute=30, hour=9))
@@ -128,60 +141,10 @@ def periodic_calculate_and_save_avg_lmp():
 
 
 def calculate_and_save_avg_lmp(user_last_date=None):
-    LAST_DAY_FALLBACK = 100
-    today = timezone.now().date()
-    previous_day = today - timedelta(days=1)
-
-    for substation in Substation.objects.filter(code__isnull=False):
-        last_date = user_last_date or get_last_date_for_actual_avg_lmp_for_substation(
-            substation
-        )
-        if not last_date:
-            last_date = previous_day - timedelta(days=LAST_DAY_FALLBACK)
-        current_date = last_date + timedelta(days=1)
-        while current_date <= previous_day:
-            # TODO: Add timezone support in the future for now we are assuming all the dates are in UTC
-            # and converting them to PST as we are only supporting CAISO currently
-            start_date = current_date.strftime("%Y%m%dT00:00-08:00")
-            end_date = current_date.strftime("%Y%m%dT23:59-08:00")
-            lmps = list(
-                calculate_avg_lmp_from_date_range(substation, start_date, end_date)
-            )[0]
-
-            current_date += timedelta(days=1)
-            if not lmps:
-                continue
-            if not lmps["avg_lmp"]:
-                continue
-            opening_closing_lmp = SubstationLMP.timescale.filter(
-                substation=substation,
-                time__lte=current_date,
-                time__gte=start_date,
-            ).order_by("time")
-            opening_entry = opening_closing_lmp.first()
-            if opening_entry:
-                opening_price = (
-                    opening_entry.energy + opening_entry.congestion + opening_entry.loss
-                )
-            else:
-                opening_price = 0
-
-            closing_entry = opening_closing_lmp.last()
-            if closing_entry:
-                closing_price = (
-                    closing_entry.energy + closing_entry.congestion + closing_entry.loss
-                )
-            else:
-                closing_price = 0
-
-            AverageLMP.objects.create(
-                substation=substation,
-                time=start_date,
-                energy=lmps["avg_energy"],
-                congestion=lmps["avg_congestion"],
-                loss=lmps["avg_loss"],
-                total_lmp=lmps["avg_lmp"],
-                opening_price=opening_price,
-                closing_price=closing_price,
-                type=AverageLMPType.ACTUAL,
-            )
+    if daily_lmp_aggregate_exists():
+        saved = calculate_and_save_avg_lmp_from_aggregate(user_last_date)
+        logger.info(f"Saved {saved} daily average LMPs from {DAILY_LMP_VIEW}")
+        return
+
+    since = user_last_date + timedelta(days=1) if user_last_date else None
+    rollup_daily_avg_lmp(since)
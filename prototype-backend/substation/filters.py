@@ -1,7 +1,9 @@
+from django.db.models import Q
 from django_filters import rest_framework as filters
 
 from substation.models import Substation
 from substation.models import AverageLMP
+from substation.models import DatasourceType
 from substation.models import SubstationLMP
 
 
@@ -22,18 +24,27 @@ class SubstationFilter(filters.FilterSet):
     interconnecting_entity = filters.CharFilter(
         field_name="interconnecting_entity", lookup_expr="icontains"
     )
-    available_capacity = filters.RangeFilter(
-        field_name="substationstatus__available_capacity"
-    )
-    no_of_constraints = filters.RangeFilter(
-        field_name="substationstatus__no_of_constraints"
-    )
-    queue = filters.RangeFilter(field_name="substationqueue__queue")
-    no_of_projects = filters.RangeFilter(field_name="substationqueue__no_of_projects")
-    policy_portfolio = filters.RangeFilter(
-        field_name="substationpolicyportfolio__policy_portfolio"
-    )
-    year = filters.RangeFilter(field_name="substationpolicyportfolio__year")
+    # Active status, queue and portfolio values are read from the summary
+    available_capacity = filters.RangeFilter(method="filter_status_range")
+    no_of_constraints = filters.RangeFilter(method="filter_status_range")
+    queue = filters.RangeFilter(field_name="summary__queue_mw")
+    no_of_projects = filters.RangeFilter(field_name="summary__no_of_projects")
+    policy_portfolio = filters.RangeFilter(field_name="summary__policy_portfolio_mw")
+    year = filters.RangeFilter(field_name="summary__policy_portfolio_year")
+
+    def filter_status_range(self, queryset, name, value):
+        """Match substations with an active status of any type in the range"""
+        query = Q()
+        for status_type in DatasourceType.values:
+            lookups = {}
+            if value.start is not None:
+                lookups[f"summary__{status_type}_{name}__gte"] = value.start
+            if value.stop is not None:
+                lookups[f"summary__{status_type}_{name}__lte"] = value.stop
+            if not lookups:
+                return queryset
+            query |= Q(**lookups)
+        return queryset.filter(query)
 
     def filter_geo_coordinates(self, queryset, name, value):
         try:
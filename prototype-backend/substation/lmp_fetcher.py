@@ -0,0 +1,315 @@
+"""
+Concurrent, rate-limited gridstatus LMP fetching for loads and backfills.
+
+A date range is split into windows that worker threads fetch in parallel,
+under a shared rate limit and with retries. Fetched frames go through a
+bounded queue to one writer on the calling thread (the only thread that
+touches the database), so slow writes hold back fetching instead of
+buffering the whole range in memory. Completed windows are recorded in a
+checkpoint and skipped when a load is restarted. With a market-data lake,
+windows already stored locally are read from disk instead of gridstatus.
+"""
+import json
+import os
+import queue
+import random
+import threading
+import time
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Set
+
+import gridstatus
+import pandas as pd
+
+from project.env import ENV
+
+from substation.models import LMPBackfillWindow
+from substation.models import SubstationLMPMarket
+from substation.market_data_lake import MarketDataLake
+from substation.lmp_writer import load_lmp_frame
+from substation.lmp_writer import substation_ids_by_code
+
+
+logger = logging.getLogger(__name__)
+
+GRIDSTATUS_MARKETS = {
+    SubstationLMPMarket.DAM: gridstatus.Markets.DAY_AHEAD_HOURLY,
+    SubstationLMPMarket.RTM_5min: gridstatus.Markets.REAL_TIME_5_MIN,
+}
+
+
+@dataclass(frozen=True)
+class FetchWindow:
+    start: pd.Timestamp
+    end: pd.Timestamp
+
+    @property
+    def key(self) -> str:
+        return f"{self.start.isoformat()}/{self.end.isoformat()}"
+
+
+def _utc(value) -> pd.Timestamp:
+    """``value`` as an aware UTC Timestamp; naive values are taken as UTC"""
+    value = pd.Timestamp(value)
+    return value.tz_localize("UTC") if value.tzinfo is None else value.tz_convert("UTC")
+
+
+def split_windows(
+    start: pd.Timestamp, end: pd.Timestamp, size: pd.Timedelta
+) -> List[FetchWindow]:
+    windows = []
+    current = start
+    while current < end:
+        next_ = min(current + size, end)
+        windows.append(FetchWindow(current, next_))
+        current = next_
+    return windows
+
+
+class RateLimiter:
+    """Token bucket shared by the fetch threads: ``rate`` calls per second"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = ENV.LMP_FETCH_RETRIES
+    backoff: float = 2.0  # Seconds before the first retry, doubled after each
+    max_backoff: float = 60.0
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.backoff * 2**attempt, self.max_backoff)
+        # Jitter keeps throttled workers from retrying in lockstep
+        return delay * random.uniform(0.5, 1.0)
+
+    def call(self, fn: Callable, *args):
+        for attempt in range(self.attempts):
+            try:
+                return fn(*args)
+            except Exception as e:
+                if attempt == self.attempts - 1:
+                    raise
+                delay = self.delay(attempt)
+                logger.warning(f"{e}; retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+
+class FileCheckpoint:
+    """Completed window keys, one JSON line each, appended as windows finish"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def completed(self) -> Set[str]:
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path) as f:
+            return {json.loads(line)["window"] for line in f if line.strip()}
+
+    def mark(self, window: FetchWindow, rows: int):
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"window": window.key, "rows": rows}) + "\n")
+
+
+class DatabaseCheckpoint:
+    """Completed windows of one ISO and market, as ``LMPBackfillWindow`` rows"""
+
+    def __init__(self, iso: str, market: str):
+        self.iso = iso
+        self.market = market
+
+    def windows(self):
+        return LMPBackfillWindow.objects.filter(iso=self.iso, market=self.market)
+
+    def completed(self) -> Set[str]:
+        return {
+            FetchWindow(pd.Timestamp(start), pd.Timestamp(end)).key
+            for start, end in self.windows().values_list("start", "end")
+        }
+
+    def mark(self, window: FetchWindow, rows: int):
+        LMPBackfillWindow.objects.update_or_create(
+            iso=self.iso,
+            market=self.market,
+            start=window.start,
+            end=window.end,
+            defaults={"rows": rows},
+        )
+
+
+@dataclass
+class FetchStats:
+    windows: int = 0
+    skipped: int = 0
+    rows: int = 0
+    failed: List[FetchWindow] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / max(self.elapsed, 1e-9)
+
+
+_local = threading.local()
+
+
+def fetch_caiso_lmp(market: str, window: FetchWindow) -> pd.DataFrame:
+    # One client per thread; gridstatus keeps a requests session on it
+    if not hasattr(_local, "iso"):
+        _local.iso = gridstatus.CAISO()
+    # Aware bounds: gridstatus reads a naive date as US/Pacific wall time,
+    # which shifts a UTC window by 7-8 hours and is ambiguous across DST
+    return _local.iso.get_lmp(
+        locations="all",
+        market=GRIDSTATUS_MARKETS[market],
+        date=window.start,
+        end=window.end,
+    )
+
+
+class LMPFetchScheduler:
+    """
+    Fetch a range of LMPs concurrently and write them through one writer.
+
+    :param market: A ``SubstationLMPMarket``.
+    :param fetch: ``fetch(market, window) -> DataFrame``; gridstatus CAISO by default.
+    :param write: ``write(frame) -> rows``; the bulk LMP writer by default.
+    :param checkpoint: Object with ``completed()`` and ``mark(window, rows)``.
+    :param lake: ``MarketDataLake`` read before fetching and filled with fetched frames.
+    """
+
+    def __init__(
+        self,
+        market: str,
+        fetch: Callable = fetch_caiso_lmp,
+        write: Optional[Callable] = None,
+        workers: int = ENV.LMP_FETCH_WORKERS,
+        rate: float = ENV.LMP_FETCH_RATE,
+        window: pd.Timedelta = pd.Timedelta(hours=ENV.LMP_FETCH_WINDOW_HOURS),
+        queue_size: Optional[int] = None,
+        retry: Optional[RetryPolicy] = None,
+        checkpoint=None,
+        progress: Optional[Callable] = None,
+        lake: Optional[MarketDataLake] = None,
+        iso: str = "caiso",
+    ):
+        self.market = market
+        self.fetch = fetch
+        self.write = write
+        self.workers = max(workers, 1)
+        self.limiter = RateLimiter(rate, burst=self.workers)
+        self.window = window
+        self.queue_size = queue_size or self.workers * 2
+        self.retry = retry or RetryPolicy()
+        self.checkpoint = checkpoint
+        self.progress = progress
+        self.lake = lake
+        self.iso = iso
+
+    def _download(self, window: FetchWindow) -> pd.DataFrame:
+        self.limiter.acquire()
+        return self.retry.call(self.fetch, self.market, window)
+
+    def _frame(self, window: FetchWindow) -> pd.DataFrame:
+        if self.lake is None:
+            return self._download(window)
+        # Lake hits skip the rate limit as well as the network
+        return self.lake.cached(
+            "lmp",
+            self.iso,
+            self.market,
+            window.start,
+            window.end,
+            lambda: self._download(window),
+        )
+
+    def _fetch(self, window: FetchWindow, results: queue.Queue, stop: threading.Event):
+        if stop.is_set():
+            return
+        try:
+            item = (window, self._frame(window), None)
+        except Exception as e:
+            item = (window, None, e)
+        # Waits while the writer is behind, bounding memory to queue_size
+        # frames; gives up once the run has stopped
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def run(self, start, end) -> FetchStats:
+        """Fetch and write ``[start, end)``; naive bounds are taken as UTC"""
+        windows = split_windows(_utc(start), _utc(end), self.window)
+        stats = FetchStats()
+        if self.checkpoint is not None:
+            completed = self.checkpoint.completed()
+            stats.skipped = sum(window.key in completed for window in windows)
+            windows = [window for window in windows if window.key not in completed]
+        if not windows:
+            return stats
+
+        write = self.write
+        if write is None:
+            substation_ids = substation_ids_by_code()
+
+            def write(frame):
+                return load_lmp_frame(frame, self.market, substation_ids)
+
+        results: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            for window in windows:
+                executor.submit(self._fetch, window, results, stop)
+            for _ in windows:
+                window, frame, error = results.get()
+                if error is not None:
+                    logger.error(f"Failed to fetch LMPs for {window.key}: {error}")
+                    stats.failed.append(window)
+                    continue
+                rows = write(frame)
+                stats.windows += 1
+                stats.rows += rows
+                if self.checkpoint is not None:
+                    self.checkpoint.mark(window, rows)
+                if self.progress is not None:
+                    self.progress(stats, len(windows))
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+        return stats
@@ -0,0 +1,175 @@
+"""
+Native TimescaleDB compression and raw RTM retention for ``SubstationLMP``.
+
+Chunks older than LMP_COMPRESS_AFTER_DAYS are compressed by a Timescale
+policy. Rows are segmented by substation and market and ordered by time
+within a segment, so a read of one substation's prices only decompresses
+that substation's batches. Raw 5-minute RTM rows older than
+LMP_RTM_RETENTION_DAYS are deleted daily, once their days have been rolled
+up into ``AverageLMP``; DAM rows are kept.
+"""
+import logging
+
+from datetime import datetime
+from datetime import timedelta
+
+from django.db import connection
+from django.db import transaction
+from django.db import DatabaseError
+from django.utils import timezone
+
+from project.env import ENV
+
+from substation.models import SubstationLMP
+from substation.models import SubstationLMPMarket
+from substation.rollups import pending_since
+from substation.rollups import start_of_day
+
+
+logger = logging.getLogger(__name__)
+
+# Every column of the (substation, market, time) unique constraint must be
+# a segment-by or order-by column for Timescale to compress the table
+COMPRESS_SEGMENT_BY = "substation_id, market"
+COMPRESS_ORDER_BY = "time DESC"
+
+
+def _lmp_table() -> str:
+    return SubstationLMP._meta.db_table
+
+
+def schedule_lmp_compression(after_days: int = ENV.LMP_COMPRESS_AFTER_DAYS):
+    """(Re)schedule the policy compressing chunks older than ``after_days``"""
+    lmp_table = _lmp_table()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT remove_compression_policy(%s, if_exists => true)", [lmp_table]
+        )
+        cursor.execute(
+            "SELECT add_compression_policy(%s, make_interval(days => %s))",
+            [lmp_table, after_days],
+        )
+
+
+def enable_lmp_compression(after_days: int = ENV.LMP_COMPRESS_AFTER_DAYS) -> bool:
+    """
+    Turn on compression and schedule its policy.
+
+    Returns False when the installed TimescaleDB has no native compression
+    (community features are required).
+    """
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                ALTER TABLE {_lmp_table()} SET (
+                    timescaledb.compress,
+                    timescaledb.compress_segmentby = '{COMPRESS_SEGMENT_BY}',
+                    timescaledb.compress_orderby = '{COMPRESS_ORDER_BY}'
+                )
+                """
+            )
+            schedule_lmp_compression(after_days)
+    except DatabaseError as e:
+        logger.warning(f"Native compression unavailable, skipping: {e}")
+        return False
+    return True
+
+
+def disable_lmp_compression():
+    """Remove the policy, decompress every chunk and turn compression off"""
+    lmp_table = _lmp_table()
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT remove_compression_policy(%s, if_exists => true)", [lmp_table]
+            )
+            cursor.execute(
+                "SELECT decompress_chunk(chunk, if_compressed => true) "
+                "FROM show_chunks(%s) chunk",
+                [lmp_table],
+            )
+            cursor.execute(
+                f"ALTER TABLE {lmp_table} SET (timescaledb.compress = false)"
+            )
+    except DatabaseError as e:
+        logger.warning(f"Native compression unavailable, skipping: {e}")
+
+
+def compress_lmp_chunks(older_than_days: int = ENV.LMP_COMPRESS_AFTER_DAYS) -> int:
+    """
+    Compress eligible chunks now instead of waiting for the policy (e.g.
+    after a backfill); returns the number of chunks compressed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(compress_chunk(chunk, if_not_compressed => true)) "
+            "FROM show_chunks(%s, older_than => make_interval(days => %s)) chunk",
+            [_lmp_table(), older_than_days],
+        )
+        return cursor.fetchone()[0]
+
+
+def lmp_storage_stats() -> dict:
+    """Size of the hypertable and how much of it is compressed"""
+    lmp_table = _lmp_table()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT hypertable_size(%s), count(*) FROM show_chunks(%s)",
+            [lmp_table, lmp_table],
+        )
+        total_bytes, chunks = cursor.fetchone()
+        cursor.execute(
+            """
+            SELECT
+                coalesce(sum(number_compressed_chunks), 0),
+                coalesce(sum(before_compression_total_bytes), 0),
+                coalesce(sum(after_compression_total_bytes), 0)
+            FROM hypertable_compression_stats(%s)
+            """,
+            [lmp_table],
+        )
+        compressed_chunks, before_bytes, after_bytes = cursor.fetchone()
+    return {
+        "total_bytes": total_bytes or 0,
+        "chunks": chunks,
+        "compressed_chunks": compressed_chunks,
+        "before_compression_bytes": before_bytes,
+        "after_compression_bytes": after_bytes,
+    }
+
+
+def rtm_retention_cutoff(
+    retention_days: int = ENV.LMP_RTM_RETENTION_DAYS, now: datetime | None = None
+) -> datetime | None:
+    """
+    Time before which raw RTM rows may be deleted: ``retention_days`` ago,
+    or earlier if some days before then are not rolled up yet, however far
+    back they are. None when retention is off (``retention_days`` of 0).
+
+    The ``substation_lmp_daily`` policy only refreshes recent days, so
+    pruned days keep their aggregates unless it is refreshed by hand over
+    them.
+    """
+    if retention_days <= 0:
+        return None
+    now = now or timezone.now()
+    # Unlimited lookback: the rollup's default only looks LAST_DAY_FALLBACK
+    # days back, which a longer retention would prune past
+    pending = pending_since(start_of_day(now), lookback_days=None)
+    return min(now - timedelta(days=retention_days), pending)
+
+
+def prune_raw_rtm_lmp(retention_days: int = ENV.LMP_RTM_RETENTION_DAYS) -> int:
+    """Delete raw RTM rows older than the retention cutoff; returns the rows deleted"""
+    cutoff = rtm_retention_cutoff(retention_days)
+    if cutoff is None:
+        return 0
+    # Filtering on the segment-by market lets Timescale drop whole
+    # compressed batches instead of decompressing them
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {_lmp_table()} WHERE market = %s AND time < %s",
+            [SubstationLMPMarket.RTM_5min, cutoff],
+        )
+        return cursor.rowcount
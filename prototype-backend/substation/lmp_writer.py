@@ -0,0 +1,108 @@
+"""
+Bulk writes of gridstatus LMP DataFrames into ``SubstationLMP``.
+
+Locations are mapped to substations with one lookup for the whole load,
+rows are streamed into a temporary table with ``COPY`` and merged into the
+hypertable with ``ON CONFLICT (substation_id, market, time)``.
+"""
+import io
+
+from typing import Dict
+
+import pandas as pd
+
+from django.db import connection
+from django.db import transaction
+
+from substation.models import Substation
+from substation.models import SubstationLMP
+
+
+STAGING_TABLE = "substation_lmp_staging"
+
+COLUMNS = ["substation_id", "time", "energy", "congestion", "loss", "market"]
+
+
+def substation_ids_by_code() -> Dict[str, str]:
+    """``code -> substation id`` for every substation with an LMP node code"""
+    return {
+        code: str(substation_id)
+        for code, substation_id in Substation.objects.filter(
+            code__isnull=False
+        ).values_list("code", "id")
+    }
+
+
+def prepare_lmp_frame(
+    lmp_data: pd.DataFrame, market: str, substation_ids: Dict[str, str]
+) -> pd.DataFrame:
+    """
+    Map a gridstatus LMP frame (``Location``, ``Time``, ``Energy``,
+    ``Congestion``, ``Loss``) onto ``SubstationLMP`` columns, dropping
+    locations without a substation.
+    """
+    frame = pd.DataFrame(
+        {
+            "substation_id": lmp_data["Location"].map(substation_ids),
+            "time": lmp_data["Time"],
+            "energy": lmp_data["Energy"],
+            "congestion": lmp_data["Congestion"],
+            "loss": lmp_data["Loss"],
+            "market": market,
+        },
+        columns=COLUMNS,
+    )
+    frame = frame.dropna(subset=["substation_id", "time"])
+    # ON CONFLICT cannot update the same row twice in one statement
+    return frame.drop_duplicates(subset=["substation_id", "market", "time"], keep="last")
+
+
+def write_lmp_frame(frame: pd.DataFrame) -> int:
+    """
+    Upsert a frame from ``prepare_lmp_frame``; returns the rows written.
+    """
+    if frame.empty:
+        return 0
+
+    buffer = io.StringIO()
+    frame.to_csv(buffer, columns=COLUMNS, index=False, header=False)
+    buffer.seek(0)
+
+    lmp_table = SubstationLMP._meta.db_table
+    columns = ", ".join(COLUMNS)
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Inside an outer transaction (e.g. tests) an earlier write's table is
+        # still there, since ON COMMIT DROP only runs at the real commit
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        cursor.execute(
+            f"""
+            CREATE TEMPORARY TABLE {STAGING_TABLE} (
+                substation_id uuid NOT NULL,
+                time timestamptz NOT NULL,
+                energy double precision,
+                congestion double precision,
+                loss double precision,
+                market varchar(50) NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {lmp_table} ({columns})
+            SELECT {columns} FROM {STAGING_TABLE}
+            ON CONFLICT (substation_id, market, time) DO UPDATE SET
+                energy = EXCLUDED.energy,
+                congestion = EXCLUDED.congestion,
+                loss = EXCLUDED.loss
+            """
+        )
+        return cursor.rowcount
+
+
+def load_lmp_frame(
+    lmp_data: pd.DataFrame, market: str, substation_ids: Dict[str, str]
+) -> int:
+    return write_lmp_frame(prepare_lmp_frame(lmp_data, market, substation_ids))
@@ -0,0 +1,150 @@
+import time
+
+from datetime import timedelta
+
+import pandas as pd
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from project.env import ENV
+
+from substation.models import SubstationLMPMarket
+from substation.summary import refresh_has_lmp_data
+from substation.lmp_fetcher import LMPFetchScheduler
+from substation.lmp_fetcher import DatabaseCheckpoint
+from substation.lmp_fetcher import fetch_caiso_lmp
+from substation.market_data_lake import market_data_lake
+
+
+ISO_FETCHERS = {
+    "caiso": fetch_caiso_lmp,
+}
+
+# Default window per market; day-ahead prices are published a day at a time
+DEFAULT_WINDOWS = {
+    SubstationLMPMarket.DAM: pd.Timedelta(days=1),
+    SubstationLMPMarket.RTM_5min: pd.Timedelta(hours=ENV.LMP_FETCH_WINDOW_HOURS),
+}
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 5
+
+
+def utc_timestamp(value: str) -> pd.Timestamp:
+    try:
+        timestamp = pd.Timestamp(value)
+    except ValueError as e:
+        raise CommandError(f"Invalid date {value!r}: {e}")
+    if timestamp.tzinfo is None:
+        return timestamp.tz_localize("UTC")
+    return timestamp.tz_convert("UTC")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load historical LMPs for a date range. Completed windows are recorded "
+        "in LMPBackfillWindow, so an interrupted backfill resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iso", choices=list(ISO_FETCHERS), default="caiso")
+        parser.add_argument(
+            "--market",
+            choices=SubstationLMPMarket.values,
+            default=SubstationLMPMarket.RTM_5min,
+        )
+        parser.add_argument("--start", required=True, help="Start, UTC unless given")
+        parser.add_argument("--end", required=True, help="End (exclusive)")
+        parser.add_argument("--workers", type=int, default=ENV.LMP_FETCH_WORKERS)
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=ENV.LMP_FETCH_RATE,
+            help="Requests per second across all workers",
+        )
+        parser.add_argument(
+            "--window-hours",
+            type=float,
+            default=None,
+            help="Hours per request (one day for DAM, LMP_FETCH_WINDOW_HOURS for RTM)",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Forget completed windows in the range and load them again",
+        )
+
+    def handle(self, *args, **options):
+        start = utc_timestamp(options["start"])
+        end = utc_timestamp(options["end"])
+        if end <= start:
+            raise CommandError("--end must be after --start")
+
+        iso, market = options["iso"], options["market"]
+        window = DEFAULT_WINDOWS[market]
+        if options["window_hours"]:
+            window = pd.Timedelta(hours=options["window_hours"])
+
+        checkpoint = DatabaseCheckpoint(iso, market)
+        if options["reset"]:
+            windows = checkpoint.windows().filter(start__gte=start, end__lte=end)
+            deleted, _ = windows.delete()
+            self.stdout.write(f"Forgot {deleted} completed windows")
+
+        scheduler = LMPFetchScheduler(
+            market,
+            fetch=ISO_FETCHERS[iso],
+            workers=options["workers"],
+            rate=options["rate"],
+            window=window,
+            checkpoint=checkpoint,
+            progress=self.progress_reporter(),
+            lake=market_data_lake(),
+            iso=iso,
+        )
+        self.stdout.write(
+            f"Backfilling {iso} {market} LMPs from {start} to {end} "
+            f"with {scheduler.workers} workers"
+        )
+        try:
+            stats = scheduler.run(start, end)
+        except KeyboardInterrupt:
+            raise CommandError("Interrupted; run the same command again to resume")
+
+        elapsed = timedelta(seconds=round(stats.elapsed))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{stats.rows:,} LMPs in {stats.windows} windows "
+                f"({stats.skipped} already loaded) in {elapsed}, "
+                f"{stats.rows_per_second:,.0f} rows/s"
+            )
+        )
+        if market == SubstationLMPMarket.RTM_5min and stats.windows:
+            refresh_has_lmp_data()
+        if stats.failed:
+            for failed in stats.failed:
+                self.stderr.write(f"Failed: {failed.key}")
+            raise CommandError(
+                f"{len(stats.failed)} windows failed; "
+                "run the same command again to retry them"
+            )
+
+    def progress_reporter(self):
+        last = 0.0
+
+        def report(stats, total):
+            nonlocal last
+            remaining = total - stats.windows - len(stats.failed)
+            now = time.monotonic()
+            if remaining and now - last < PROGRESS_INTERVAL:
+                return
+            last = now
+            windows_per_second = stats.windows / max(stats.elapsed, 1e-9)
+            eta = timedelta(seconds=round(remaining / max(windows_per_second, 1e-9)))
+            self.stdout.write(
+                f"{stats.windows}/{total} windows, {stats.rows:,} LMPs, "
+                f"{stats.rows_per_second:,.0f} rows/s, ETA {eta}"
+            )
+
+        return report
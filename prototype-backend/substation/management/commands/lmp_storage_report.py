@@ -0,0 +1,132 @@
+import time
+import statistics
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from project.env import ENV
+
+from substation.models import SubstationLMP
+from substation.models import SubstationLMPMarket
+from substation.rollups import daily_avg_lmp_rows
+from substation.lmp_storage import lmp_storage_stats
+from substation.lmp_storage import compress_lmp_chunks
+from substation.lmp_storage import schedule_lmp_compression
+
+
+# Days of prices read by each timed query
+QUERY_DAYS = 30
+
+
+def sample_queries(older_than_days: int):
+    """
+    Typical reads of RTM prices, over the month before the compression
+    cutoff so that they cover chunks the policy compresses.
+    """
+    rtm = SubstationLMP.timescale.filter(market=SubstationLMPMarket.RTM_5min)
+    latest = rtm.order_by("-time").values_list("time", flat=True).first()
+    if latest is None:
+        return {}
+    until = latest - timedelta(days=older_than_days)
+    since = until - timedelta(days=QUERY_DAYS)
+    substation_id = (
+        rtm.filter(time__gte=since, time__lt=until)
+        .values_list("substation_id", flat=True)
+        .first()
+    )
+    one_substation = rtm.filter(
+        substation_id=substation_id, time__gte=since, time__lt=until
+    ).values_list("time", "energy", "congestion", "loss")
+    return {
+        f"One substation, {QUERY_DAYS} days": lambda: len(list(one_substation)),
+        f"Daily rollup, {QUERY_DAYS} days": lambda: len(
+            list(daily_avg_lmp_rows(since, until))
+        ),
+        "Latest RTM time": lambda: len(
+            rtm.order_by("-time").values_list("time", flat=True)[:1]
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Report SubstationLMP storage and time typical queries; with --compress, "
+        "compress eligible chunks now and compare before and after"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--compress",
+            action="store_true",
+            help="Compress chunks older than --older-than-days and time again",
+        )
+        parser.add_argument(
+            "--older-than-days", type=int, default=ENV.LMP_COMPRESS_AFTER_DAYS
+        )
+        parser.add_argument(
+            "--compress-after",
+            type=int,
+            default=None,
+            help="Reschedule the policy to compress chunks older than this many days",
+        )
+        parser.add_argument("--runs", type=int, default=5)
+
+    def handle(self, *args, **options):
+        if options["compress_after"] is not None:
+            schedule_lmp_compression(options["compress_after"])
+            self.stdout.write(
+                f"Compression policy set to {options['compress_after']} days"
+            )
+
+        queries = sample_queries(options["older_than_days"])
+        self.report_storage(lmp_storage_stats())
+        before = self.time_queries(queries, options["runs"])
+        if not options["compress"]:
+            return
+
+        started = time.perf_counter()
+        compressed = compress_lmp_chunks(options["older_than_days"])
+        self.stdout.write(
+            f"Compressed {compressed} chunks in {time.perf_counter() - started:.1f}s"
+        )
+        self.report_storage(lmp_storage_stats())
+        after = self.time_queries(queries, options["runs"])
+        for name in queries:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: {before[name]:.1f} ms -> {after[name]:.1f} ms "
+                    f"({before[name] / max(after[name], 1e-9):.2f}x)"
+                )
+            )
+
+    def report_storage(self, stats):
+        self.stdout.write(
+            f"SubstationLMP: {filesizeformat(stats['total_bytes'])} "
+            f"in {stats['chunks']} chunks"
+        )
+        if stats["compressed_chunks"]:
+            before, after = (
+                stats["before_compression_bytes"],
+                stats["after_compression_bytes"],
+            )
+            self.stdout.write(
+                f"{stats['compressed_chunks']} compressed chunks: "
+                f"{filesizeformat(before)} -> {filesizeformat(after)} "
+                f"({before / max(after, 1):.1f}x smaller)"
+            )
+
+    def time_queries(self, queries, runs):
+        """Median milliseconds of each query over ``runs`` runs, after a warm-up"""
+        timings = {}
+        for name, query in queries.items():
+            rows = query()
+            durations = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                query()
+                durations.append((time.perf_counter() - started) * 1000)
+            timings[name] = statistics.median(durations)
+            self.stdout.write(f"{name}: {timings[name]:.1f} ms ({rows} rows)")
+        return timings
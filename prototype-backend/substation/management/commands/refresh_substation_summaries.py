@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from substation.summary import refresh_substation_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute SubstationSummary rows, e.g. to fill them after the 0007 "
+        "migration. Writes keep them current afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ids",
+            nargs="+",
+            type=int,
+            help="Only refresh these substations (all by default)",
+        )
+
+    def handle(self, *args, **options):
+        refreshed = refresh_substation_summaries(options["ids"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed {refreshed} substation summaries")
+        )
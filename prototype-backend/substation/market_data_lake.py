@@ -0,0 +1,290 @@
+"""
+Local Parquet store of raw market-data pulls (LMPs, queues, heatmaps).
+
+Frames are written as they were fetched, partitioned by dataset, ISO,
+market and date::
+
+    <root>/<dataset>/iso=<iso>/market=<market>/date=<YYYY-MM-DD>/<start>_<end>.parquet
+
+``manifest.jsonl`` at the root lists every file with its window and row
+count. Loaders look a window up here before calling gridstatus, so
+replays and full rebuilds run from local disk. A window without a file of
+its own is cut from the stored windows that cover it, so a backfill with a
+different window size still reads what earlier loads stored.
+"""
+import bisect
+import json
+import os
+import threading
+import logging
+
+from datetime import date
+from datetime import datetime
+from datetime import timezone
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import pandas as pd
+
+from project.env import ENV
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.jsonl"
+
+Key = Tuple[str, str, str, str, str]
+
+# (dataset, iso, market) of a key
+Partition = Tuple[str, str, str]
+
+# (start, end, key) of a stored window
+Window = Tuple[pd.Timestamp, pd.Timestamp, Key]
+
+
+def _timestamp(value) -> pd.Timestamp:
+    value = pd.Timestamp(value)
+    return value.tz_localize("UTC") if value.tzinfo is None else value.tz_convert("UTC")
+
+
+def _parquet_safe(frame: pd.DataFrame) -> pd.DataFrame:
+    """Mixed-type object columns (common in queue spreadsheets) as strings"""
+    mixed = [
+        column
+        for column in frame.columns[frame.dtypes == object]
+        if pd.api.types.infer_dtype(frame[column], skipna=True).startswith("mixed")
+    ]
+    if not mixed:
+        return frame
+    frame = frame.copy()
+    for column in mixed:
+        frame[column] = frame[column].where(
+            frame[column].isna(), frame[column].astype(str)
+        )
+    return frame
+
+
+def _cut(frame: pd.DataFrame, time_column: str, start, end) -> pd.DataFrame:
+    """The rows of ``frame`` whose ``time_column`` falls in ``[start, end)``"""
+    times = pd.to_datetime(frame[time_column], utc=True)
+    return frame[(times >= _timestamp(start)) & (times < _timestamp(end))]
+
+
+class MarketDataLake:
+    def __init__(self, root: str):
+        self.root = root
+        self.lock = threading.Lock()
+        self._manifest: Optional[Dict[Key, dict]] = None
+        # Stored windows of each partition sorted by start, and the longest
+        # window, which bounds how far before a start a covering file begins
+        self._windows: Dict[Partition, List[Window]] = {}
+        self._longest: Dict[Partition, pd.Timedelta] = {}
+
+    def _key(self, dataset, iso, market, start, end) -> Key:
+        return (
+            dataset,
+            iso,
+            market,
+            _timestamp(start).isoformat(),
+            _timestamp(end).isoformat(),
+        )
+
+    def _relative_path(self, dataset, iso, market, start, end) -> str:
+        start, end = _timestamp(start), _timestamp(end)
+        return os.path.join(
+            dataset,
+            f"iso={iso}",
+            f"market={market}",
+            f"date={start:%Y-%m-%d}",
+            f"{start:%Y%m%dT%H%M}_{end:%Y%m%dT%H%M}.parquet",
+        )
+
+    def _add(self, key: Key, entry: dict):
+        """Record an entry in the manifest and the window index; lock held"""
+        if key not in self._manifest:
+            partition, start, end = key[:3], _timestamp(key[3]), _timestamp(key[4])
+            bisect.insort(self._windows.setdefault(partition, []), (start, end, key))
+            self._longest[partition] = max(
+                self._longest.get(partition, pd.Timedelta(0)), end - start
+            )
+        self._manifest[key] = entry
+
+    def manifest(self) -> Dict[Key, dict]:
+        with self.lock:
+            if self._manifest is None:
+                self._manifest = {}
+                path = os.path.join(self.root, MANIFEST)
+                if os.path.exists(path):
+                    with open(path) as f:
+                        for line in f:
+                            if line.strip():
+                                entry = json.loads(line)
+                                self._add(tuple(entry["key"]), entry)
+            return self._manifest
+
+    def _read(self, entry: Optional[dict]) -> Optional[pd.DataFrame]:
+        if entry is None:
+            return None
+        path = os.path.join(self.root, entry["path"])
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
+
+    def get(self, dataset, iso, market, start, end) -> Optional[pd.DataFrame]:
+        """The frame stored for exactly this window"""
+        return self._read(
+            self.manifest().get(self._key(dataset, iso, market, start, end))
+        )
+
+    def _covering(self, dataset, iso, market, start, end) -> Optional[List[dict]]:
+        """
+        Entries whose windows together cover ``[start, end)`` without a gap,
+        in start order, or None when part of the window was never stored.
+        """
+        manifest = self.manifest()
+        start, end = _timestamp(start), _timestamp(end)
+        partition = (dataset, iso, market)
+        with self.lock:
+            windows = self._windows.get(partition, [])
+            earliest = start - self._longest.get(partition, pd.Timedelta(0))
+            lo = bisect.bisect_left(windows, (earliest,))
+            hi = bisect.bisect_left(windows, (end,))
+            candidates = windows[lo:hi]
+        entries, covered = [], start
+        for window_start, window_end, key in candidates:
+            if window_start > covered:
+                return None
+            if window_end > covered:
+                entries.append(manifest[key])
+                covered = window_end
+            if covered >= end:
+                return entries
+        return None
+
+    def covering(
+        self, dataset, iso, market, start, end, time_column: str = "Time"
+    ) -> Optional[pd.DataFrame]:
+        """
+        The frame for a window: its own file, or the rows of ``[start, end)``
+        from the stored windows covering it. None when part of the window was
+        never stored, the stored frames have no ``time_column`` to cut by, or
+        they have rows but none inside the window (a pull stored with shifted
+        times), so the window is fetched again.
+        """
+        frame = self.get(dataset, iso, market, start, end)
+        if frame is not None:
+            if frame.empty or time_column not in frame:
+                return frame
+            return None if _cut(frame, time_column, start, end).empty else frame
+        entries = self._covering(dataset, iso, market, start, end)
+        if entries is None:
+            return None
+        frames = [self._read(entry) for entry in entries]
+        if any(frame is None or time_column not in frame for frame in frames):
+            return None
+        frame = pd.concat(frames, ignore_index=True)
+        window = _cut(frame, time_column, start, end)
+        if window.empty and not frame.empty:
+            return None
+        # Overlapping stored windows hold the same rows twice
+        return window.drop_duplicates().reset_index(drop=True)
+
+    def put(self, dataset, iso, market, start, end, frame: pd.DataFrame) -> str:
+        """
+        Store a fetched frame (written to a temporary file and renamed, then
+        appended to the manifest).
+        """
+        relative_path = self._relative_path(dataset, iso, market, start, end)
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = f"{path}.{threading.get_ident()}.tmp"
+        _parquet_safe(frame).to_parquet(partial, index=False)
+        os.replace(partial, path)
+
+        key = self._key(dataset, iso, market, start, end)
+        entry = {
+            "key": list(key),
+            "path": relative_path,
+            "rows": len(frame),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.manifest()
+        with self.lock:
+            with open(os.path.join(self.root, MANIFEST), "a") as f:
+                f.write(json.dumps(entry) + "\n")
+            self._add(key, entry)
+        return path
+
+    def cached(
+        self,
+        dataset,
+        iso,
+        market,
+        start,
+        end,
+        fetch: Callable[[], pd.DataFrame],
+        time_column: str = "Time",
+    ) -> pd.DataFrame:
+        """
+        The stored frame for a window (see ``covering``), or ``fetch()`` stored
+        for next time. Empty results and windows that have not ended yet are
+        not stored, so they are fetched again later.
+        """
+        frame = self.covering(dataset, iso, market, start, end, time_column)
+        if frame is not None:
+            return frame
+        frame = fetch()
+        complete = _timestamp(end) <= pd.Timestamp.now(tz="UTC")
+        if frame is not None and not frame.empty and complete:
+            self.put(dataset, iso, market, start, end, frame)
+        return frame
+
+    def cached_snapshot(
+        self, dataset, iso, market, fetch: Callable, day: Optional[date] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Daily snapshot datasets (queues, heatmaps): ``day``'s stored pull, or
+        today's, fetched and stored on the first call of the day.
+        """
+        start = pd.Timestamp(day or datetime.now(timezone.utc).date())
+        end = start + pd.Timedelta(days=1)
+        frame = self.get(dataset, iso, market, start, end)
+        if frame is not None or day is not None:
+            return frame
+        frame = fetch()
+        if frame is not None and not frame.empty:
+            self.put(dataset, iso, market, start, end, frame)
+        return frame
+
+
+_lake: Optional[MarketDataLake] = None
+
+
+def market_data_lake() -> Optional[MarketDataLake]:
+    """The configured lake, or None when MARKET_DATA_LAKE_PATH is empty"""
+    global _lake
+    if not ENV.MARKET_DATA_LAKE_PATH:
+        return None
+    if _lake is None or _lake.root != ENV.MARKET_DATA_LAKE_PATH:
+        _lake = MarketDataLake(ENV.MARKET_DATA_LAKE_PATH)
+    return _lake
+
+
+def cached_snapshot(
+    dataset: str, iso: str, market: str, fetch: Callable, day: Optional[date] = None
+) -> Optional[pd.DataFrame]:
+    """
+    ``MarketDataLake.cached_snapshot`` on the configured lake, or ``fetch()``
+    when there is none.
+
+    :param day: Replay the snapshot stored for this day instead of fetching.
+    """
+    lake = market_data_lake()
+    if lake is None:
+        if day is not None:
+            raise ValueError("MARKET_DATA_LAKE_PATH is not set, nothing to replay")
+        return fetch()
+    return lake.cached_snapshot(dataset, iso, market, fetch, day)
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Only creates the table. The summaries are filled after `migrate` by the
+# post_migrate receiver in substation/recievers.py, and can be rebuilt at any
+# time with `manage.py refresh_substation_summaries`.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('substation', '0006_averagelmp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubstationSummary',
+            fields=[
+                ('substation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='substation.substation')),
+                ('status', models.JSONField(default=list)),
+                ('queue', models.JSONField(default=list)),
+                ('policy_portfolio', models.JSONField(default=list)),
+                ('heatmap_available_capacity', models.FloatField(blank=True, null=True)),
+                ('heatmap_no_of_constraints', models.IntegerField(blank=True, null=True)),
+                ('constraint_available_capacity', models.FloatField(blank=True, null=True)),
+                ('constraint_no_of_constraints', models.IntegerField(blank=True, null=True)),
+                ('queue_mw', models.FloatField(blank=True, null=True)),
+                ('no_of_projects', models.IntegerField(blank=True, null=True)),
+                ('policy_portfolio_mw', models.FloatField(blank=True, null=True)),
+                ('policy_portfolio_year', models.IntegerField(blank=True, null=True)),
+                ('has_lmp_data', models.BooleanField(default=False)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Substation Summary',
+                'verbose_name_plural': 'Substation Summaries',
+                'indexes': [models.Index(fields=['heatmap_available_capacity'], name='substation__heatmap_748ec4_idx'), models.Index(fields=['heatmap_no_of_constraints'], name='substation__heatmap_e36ad0_idx'), models.Index(fields=['constraint_available_capacity'], name='substation__constra_4abdd3_idx'), models.Index(fields=['constraint_no_of_constraints'], name='substation__constra_1999c4_idx'), models.Index(fields=['queue_mw'], name='substation__queue_m_aaf780_idx'), models.Index(fields=['no_of_projects'], name='substation__no_of_p_1d0dee_idx'), models.Index(fields=['policy_portfolio_mw'], name='substation__policy__e10b4f_idx'), models.Index(fields=['policy_portfolio_year'], name='substation__policy__9395cc_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def create_daily_lmp_aggregate(apps, schema_editor):
+    from substation.aggregates import create_daily_lmp_aggregate
+
+    create_daily_lmp_aggregate()
+
+
+def drop_daily_lmp_aggregate(apps, schema_editor):
+    from substation.aggregates import drop_daily_lmp_aggregate
+
+    drop_daily_lmp_aggregate()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('substation', '0007_substationsummary'),
+    ]
+
+    operations = [
+        # Skipped (with a warning) where continuous aggregates are unavailable;
+        # calculate_and_save_avg_lmp then computes the daily averages itself
+        migrations.RunPython(create_daily_lmp_aggregate, drop_daily_lmp_aggregate),
+    ]
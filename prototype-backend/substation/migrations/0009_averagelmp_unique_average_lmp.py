@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('substation', '0008_substation_lmp_daily'),
+    ]
+
+    operations = [
+        # Keep the latest of any duplicate averages so the constraint can be added
+        migrations.RunSQL(
+            """
+            DELETE FROM substation_averagelmp duplicate
+            USING substation_averagelmp kept
+            WHERE duplicate.substation_id = kept.substation_id
+            AND duplicate.type = kept.type
+            AND duplicate.time = kept.time
+            AND duplicate.id < kept.id
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='averagelmp',
+            constraint=models.UniqueConstraint(fields=('substation', 'type', 'time'), name='unique_average_lmp'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('substation', '0009_averagelmp_unique_average_lmp'),
+    ]
+
+    operations = [
+        # get_or_create matched on every column, so rows that differ only in
+        # prices may repeat a (substation, market, time); keep the latest
+        migrations.RunSQL(
+            """
+            DELETE FROM substation_substationlmp duplicate
+            USING substation_substationlmp kept
+            WHERE duplicate.substation_id = kept.substation_id
+            AND duplicate.market = kept.market
+            AND duplicate.time = kept.time
+            AND duplicate.id < kept.id
+            """,
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name='substationlmp',
+            constraint=models.UniqueConstraint(fields=('substation', 'market', 'time'), name='unique_substation_lmp'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('substation', '0010_substationlmp_unique_substation_lmp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LMPBackfillWindow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('iso', models.CharField(max_length=20)),
+                ('market', models.CharField(choices=[('DAM', 'Day-Ahead Market'), ('RTM_5min', 'Real-Time Market (5-min)')], max_length=50)),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('rows', models.IntegerField(default=0)),
+                ('completed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'LMP Backfill Window',
+                'constraints': [models.UniqueConstraint(fields=('iso', 'market', 'start', 'end'), name='unique_lmp_backfill_window')],
+            },
+        ),
+    ]
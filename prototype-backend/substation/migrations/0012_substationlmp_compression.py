@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def enable_lmp_compression(apps, schema_editor):
+    from substation.lmp_storage import enable_lmp_compression
+
+    enable_lmp_compression()
+
+
+def disable_lmp_compression(apps, schema_editor):
+    from substation.lmp_storage import disable_lmp_compression
+
+    disable_lmp_compression()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('substation', '0011_lmpbackfillwindow'),
+    ]
+
+    operations = [
+        # The (substation, market, time) unique index this relies on was added
+        # in 0010. Skipped (with a warning) where native compression is
+        # unavailable; the table then stays uncompressed
+        migrations.RunPython(enable_lmp_compression, disable_lmp_compression),
+    ]
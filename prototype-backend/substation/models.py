@@ -145,6 +145,54 @@ class SubstationPolicyPortfolio(CgBaseModel):
         ]
 
 
+class SubstationSummary(models.Model):
+    """
+    Denormalized active status, queue and policy portfolio of a substation.
+
+    Read by the substation list and its filters instead of joining the
+    related tables on every request. Kept current by ``substation.summary``.
+    """
+
+    substation = models.OneToOneField(
+        Substation,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="summary",
+    )
+    # Serialized as returned by the API
+    status = models.JSONField(default=list)
+    queue = models.JSONField(default=list)
+    policy_portfolio = models.JSONField(default=list)
+    # Filter columns
+    heatmap_available_capacity = models.FloatField(null=True, blank=True)
+    heatmap_no_of_constraints = models.IntegerField(null=True, blank=True)
+    constraint_available_capacity = models.FloatField(null=True, blank=True)
+    constraint_no_of_constraints = models.IntegerField(null=True, blank=True)
+    queue_mw = models.FloatField(null=True, blank=True)
+    no_of_projects = models.IntegerField(null=True, blank=True)
+    policy_portfolio_mw = models.FloatField(null=True, blank=True)
+    policy_portfolio_year = models.IntegerField(null=True, blank=True)
+    has_lmp_data = models.BooleanField(default=False)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.substation.name
+
+    class Meta:
+        verbose_name = "Substation Summary"
+        verbose_name_plural = "Substation Summaries"
+        indexes = [
+            models.Index(fields=["heatmap_available_capacity"]),
+            models.Index(fields=["heatmap_no_of_constraints"]),
+            models.Index(fields=["constraint_available_capacity"]),
+            models.Index(fields=["constraint_no_of_constraints"]),
+            models.Index(fields=["queue_mw"]),
+            models.Index(fields=["no_of_projects"]),
+            models.Index(fields=["policy_portfolio_mw"]),
+            models.Index(fields=["policy_portfolio_year"]),
+        ]
+
+
 class SubstationLMPMarket(models.TextChoices):
     DAM = "DAM", "Day-Ahead Market"
     RTM_5min = "RTM_5min", "Real-Time Market (5-min)"
@@ -166,6 +214,14 @@ class SubstationLMP(TimescaleModel):
     def __str__(self):
         return f"{self.substation.name}->{self.time}"
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["substation", "market", "time"],
+                name="unique_substation_lmp",
+            )
+        ]
+
 
 class TransmissionLine(CgBaseModel):
     name = models.CharField(max_length=150)
@@ -206,3 +262,34 @@ class AverageLMP(TimescaleModel):
 
     def __str__(self):
         return self.substation.name
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["substation", "type", "time"],
+                name="unique_average_lmp",
+            )
+        ]
+
+
+class LMPBackfillWindow(models.Model):
+    """A window of LMPs loaded by ``backfill_lmp``, skipped when it is rerun"""
+
+    iso = models.CharField(max_length=20)
+    market = models.CharField(max_length=50, choices=SubstationLMPMarket.choices)
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    rows = models.IntegerField(default=0)
+    completed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.iso} {self.market} {self.start}->{self.end}"
+
+    class Meta:
+        verbose_name = "LMP Backfill Window"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["iso", "market", "start", "end"],
+                name="unique_lmp_backfill_window",
+            )
+        ]
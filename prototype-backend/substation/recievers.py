@@ -0,0 +1,42 @@
+from django.dispatch import receiver
+
+from django.db.models.signals import post_save
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_migrate
+
+from substation.models import Substation
+from substation.models import SubstationQueue
+from substation.models import SubstationStatus
+from substation.models import SubstationPolicyPortfolio
+from substation.summary import refresh_substation_summaries
+
+
+@receiver(post_save, sender=Substation)
+def create_summary_on_substation_created(sender, instance: Substation, created, **kwargs):
+    if not created:
+        return
+    refresh_substation_summaries([instance.id])
+
+
+@receiver(post_save, sender=SubstationStatus)
+@receiver(post_delete, sender=SubstationStatus)
+@receiver(post_save, sender=SubstationQueue)
+@receiver(post_delete, sender=SubstationQueue)
+@receiver(post_save, sender=SubstationPolicyPortfolio)
+@receiver(post_delete, sender=SubstationPolicyPortfolio)
+def refresh_summary_on_substation_data_changed(sender, instance, **kwargs):
+    refresh_substation_summaries([instance.substation_id])
+
+
+@receiver(post_migrate)
+def fill_missing_summaries_after_migrate(sender, app_config, **kwargs):
+    """
+    Fill the summaries of substations that have none, e.g. right after 0007
+    creates the table. Done here rather than in the migration so it runs the
+    current summary code against the current models.
+    """
+    if app_config.label != "substation":
+        return
+    missing = Substation.objects.filter(summary__isnull=True)
+    if missing.exists():
+        refresh_substation_summaries(missing.values_list("id", flat=True))
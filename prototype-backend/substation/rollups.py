@@ -0,0 +1,194 @@
+"""
+Set-based daily LMP rollup, for databases without continuous aggregates.
+
+All pending substation-days are grouped in one query and upserted into
+``AverageLMP`` in batches, so run time follows the number of LMP rows
+rather than substations × days.
+"""
+import logging
+import time
+
+from datetime import datetime
+from datetime import timedelta
+
+from django.db.models import F
+from django.db.models import Avg
+from django.db.models import Value
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models.functions import Trunc
+from django.db.models.functions import Greatest
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.db_functions import First
+from core.db_functions import Last
+
+from substation.aggregates import LMP_DAY_TZINFO
+from substation.models import Substation
+from substation.models import AverageLMP
+from substation.models import AverageLMPType
+from substation.models import SubstationLMP
+from substation.models import SubstationLMPMarket
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+# Furthest back, in days, that the default rollup looks for prices to roll up
+LAST_DAY_FALLBACK = 100
+
+# Where ``pending_since`` searches from when its lookback is unlimited
+EPOCH = datetime(1970, 1, 1, tzinfo=LMP_DAY_TZINFO)
+
+UPDATE_FIELDS = [
+    "energy",
+    "congestion",
+    "loss",
+    "total_lmp",
+    "opening_price",
+    "closing_price",
+]
+
+
+def start_of_day(value: datetime) -> datetime:
+    return value.astimezone(LMP_DAY_TZINFO).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def pending_since(
+    today: datetime, lookback_days: int | None = LAST_DAY_FALLBACK
+) -> datetime:
+    """
+    Start of the earliest day with RTM prices not rolled up into an ACTUAL
+    average yet, going back at most ``lookback_days`` (pass an explicit
+    start to ``rollup_daily_avg_lmp`` to fill older gaps), or as far as the
+    prices go when it is None.
+
+    Each coded substation contributes the day of its first RTM price after
+    its last ACTUAL average, so substations without prices, or whose prices
+    stopped, do not hold the others back.
+    """
+    day_after_last_actual = OuterRef("last_actual") + timedelta(days=1)
+    if lookback_days is None:
+        # Substations without any ACTUAL average are searched from the start
+        after = Coalesce(day_after_last_actual, Value(EPOCH))
+    else:
+        # GREATEST ignores NULLs on PostgreSQL, so substations without any
+        # ACTUAL average are searched from the fallback
+        after = Greatest(
+            day_after_last_actual, Value(today - timedelta(days=lookback_days))
+        )
+    last_actual = (
+        AverageLMP.objects.filter(
+            substation_id=OuterRef("id"), type=AverageLMPType.ACTUAL
+        )
+        .order_by("-time")
+        .values("time")[:1]
+    )
+    next_price = (
+        SubstationLMP.timescale.filter(
+            substation_id=OuterRef("id"),
+            market=SubstationLMPMarket.RTM_5min,
+            time__gte=after,
+        )
+        .order_by("time")
+        .values("time")[:1]
+    )
+    next_prices = (
+        Substation.objects.filter(code__isnull=False)
+        .annotate(last_actual=Subquery(last_actual))
+        .annotate(next_price=Subquery(next_price))
+        .filter(next_price__isnull=False)
+        .values_list("next_price", flat=True)
+    )
+    return min([today] + [start_of_day(time) for time in next_prices])
+
+
+def daily_avg_lmp_rows(since: datetime, until: datetime):
+    """
+    Daily RTM means and opening/closing prices of every coded substation,
+    grouped by the database in one query.
+    """
+    total_lmp = F("energy") + F("congestion") + F("loss")
+    return (
+        SubstationLMP.timescale.filter(
+            market=SubstationLMPMarket.RTM_5min,
+            substation__code__isnull=False,
+            time__gte=since,
+            time__lt=until,
+        )
+        .annotate(day=Trunc("time", "day", tzinfo=LMP_DAY_TZINFO))
+        .values("substation_id", "day")
+        .annotate(
+            avg_energy=Avg("energy"),
+            avg_congestion=Avg("congestion"),
+            avg_loss=Avg("loss"),
+            opening_price=First(total_lmp, "time"),
+            closing_price=Last(total_lmp, "time"),
+        )
+        .order_by()
+    )
+
+
+def rollup_daily_avg_lmp(since: datetime | None = None) -> int:
+    """
+    Upsert ACTUAL ``AverageLMP`` rows for every complete day since ``since``
+    (the earliest pending day by default). Days already saved are
+    recomputed, so reruns and overlapping windows are safe.
+    """
+    today = start_of_day(timezone.now())
+    if since is None:
+        since = pending_since(today)
+    elif not isinstance(since, datetime):
+        since = datetime.combine(since, datetime.min.time(), tzinfo=LMP_DAY_TZINFO)
+    since = start_of_day(since)
+
+    started = time.perf_counter()
+    saved = 0
+    batch = []
+    for row in daily_avg_lmp_rows(since, today).iterator(chunk_size=BATCH_SIZE):
+        energy, congestion, loss = (
+            row["avg_energy"],
+            row["avg_congestion"],
+            row["avg_loss"],
+        )
+        if energy is None or congestion is None or loss is None:
+            continue
+        batch.append(
+            AverageLMP(
+                substation_id=row["substation_id"],
+                type=AverageLMPType.ACTUAL,
+                time=row["day"],
+                energy=energy,
+                congestion=congestion,
+                loss=loss,
+                total_lmp=energy + congestion + loss,
+                opening_price=row["opening_price"] or 0,
+                closing_price=row["closing_price"] or 0,
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            saved += _upsert(batch)
+            batch = []
+    if batch:
+        saved += _upsert(batch)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Rolled up {saved} daily average LMPs since {since:%Y-%m-%d} "
+        f"in {elapsed:.1f}s ({saved / max(elapsed, 1e-9):,.0f} rows/s)"
+    )
+    return saved
+
+
+def _upsert(averages) -> int:
+    AverageLMP.objects.bulk_create(
+        averages,
+        update_conflicts=True,
+        unique_fields=["substation", "type", "time"],
+        update_fields=UPDATE_FIELDS,
+    )
+    return len(averages)
@@ -67,18 +67,16 @@ class SubstationOut(serializers.ModelSerializer):
     county = CountyOut(read_only=True, many=False)
     geo_coordinates = serializers.SerializerMethodField()
     name = serializers.SerializerMethodField()
-    status = SubstationStatusOut(
-        source="substationstatus_set", many=True, read_only=True
+    # Active rows, as SubstationStatusOut, SubstationQueueOut and
+    # SubstationPolicyPortfolioOut, denormalized into the summary
+    status = serializers.JSONField(source="summary.status", read_only=True, default=list)
+    queue = serializers.JSONField(source="summary.queue", read_only=True, default=list)
+    policy_portfolio = serializers.JSONField(
+        source="summary.policy_portfolio", read_only=True, default=list
     )
-    queue = SubstationQueueOut(
-        source="substationqueue_set",
-        many=True,
-        read_only=True,
+    has_lmp_data = serializers.BooleanField(
+        source="summary.has_lmp_data", read_only=True, default=False
     )
-    policy_portfolio = SubstationPolicyPortfolioOut(
-        source="substationpolicyportfolio_set", many=True, read_only=True
-    )
-    has_lmp_data = serializers.BooleanField()
 
     class Meta:
         model = Substation
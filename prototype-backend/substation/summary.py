@@ -0,0 +1,157 @@
+from typing import Iterable
+from typing import Optional
+
+from django.contrib.postgres.aggregates import JSONBAgg
+from django.db.models import Exists
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models import JSONField
+from django.db.models.functions import Coalesce
+from django.db.models.functions import JSONObject
+
+from substation.models import Substation
+from substation.models import DatasourceType
+from substation.models import SubstationLMP
+from substation.models import SubstationQueue
+from substation.models import SubstationStatus
+from substation.models import SubstationSummary
+from substation.models import SubstationLMPMarket
+from substation.models import SubstationPolicyPortfolio
+
+
+BATCH_SIZE = 1000
+
+SUMMARY_FIELDS = [
+    "status",
+    "queue",
+    "policy_portfolio",
+    "heatmap_available_capacity",
+    "heatmap_no_of_constraints",
+    "constraint_available_capacity",
+    "constraint_no_of_constraints",
+    "queue_mw",
+    "no_of_projects",
+    "policy_portfolio_mw",
+    "policy_portfolio_year",
+    "has_lmp_data",
+]
+
+
+def _active(model, **filters):
+    return model.objects.filter(substation_id=OuterRef("id"), is_active=True, **filters)
+
+
+def _json_list(model, ordering, **fields):
+    """JSON array of the active rows of ``model``, as the nested serializers returned them"""
+    rows = (
+        _active(model)
+        .values("substation_id")
+        .annotate(data=JSONBAgg(JSONObject(**fields), ordering=ordering))
+        .values("data")
+    )
+    return Coalesce(Subquery(rows), Value([], output_field=JSONField()))
+
+
+def _value(model, field, **filters):
+    return Subquery(_active(model, **filters).values(field)[:1])
+
+
+def _has_lmp_data():
+    return Exists(
+        SubstationLMP.objects.filter(
+            substation_id=OuterRef("id"), market=SubstationLMPMarket.RTM_5min
+        )
+    )
+
+
+def refresh_substation_summaries(substation_ids: Optional[Iterable] = None) -> int:
+    """
+    Recompute the summaries of ``substation_ids`` (all substations if None).
+
+    The values are computed in one query and upserted in batches.
+    """
+    queryset = Substation.objects.all()
+    if substation_ids is not None:
+        queryset = queryset.filter(id__in=list(substation_ids))
+
+    rows = queryset.annotate(
+        status=_json_list(
+            SubstationStatus,
+            "type",
+            type="type",
+            available_capacity="available_capacity",
+            no_of_constraints="no_of_constraints",
+        ),
+        queue=_json_list(
+            SubstationQueue,
+            "created_at",
+            queue="queue",
+            no_of_projects="no_of_projects",
+        ),
+        policy_portfolio=_json_list(
+            SubstationPolicyPortfolio,
+            "year",
+            policy_portfolio="policy_portfolio",
+            year="year",
+        ),
+        heatmap_available_capacity=_value(
+            SubstationStatus, "available_capacity", type=DatasourceType.HEATMAP
+        ),
+        heatmap_no_of_constraints=_value(
+            SubstationStatus, "no_of_constraints", type=DatasourceType.HEATMAP
+        ),
+        constraint_available_capacity=_value(
+            SubstationStatus, "available_capacity", type=DatasourceType.CONSTRAINT
+        ),
+        constraint_no_of_constraints=_value(
+            SubstationStatus, "no_of_constraints", type=DatasourceType.CONSTRAINT
+        ),
+        queue_mw=_value(SubstationQueue, "queue"),
+        no_of_projects=_value(SubstationQueue, "no_of_projects"),
+        policy_portfolio_mw=_value(SubstationPolicyPortfolio, "policy_portfolio"),
+        policy_portfolio_year=_value(SubstationPolicyPortfolio, "year"),
+        has_lmp_data=_has_lmp_data(),
+    ).values("id", *SUMMARY_FIELDS)
+
+    refreshed = 0
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(SubstationSummary(substation_id=row.pop("id"), **row))
+        if len(batch) >= BATCH_SIZE:
+            refreshed += _upsert(batch)
+            batch = []
+    if batch:
+        refreshed += _upsert(batch)
+    return refreshed
+
+
+def _upsert(summaries) -> int:
+    SubstationSummary.objects.bulk_create(
+        summaries,
+        update_conflicts=True,
+        unique_fields=["substation"],
+        update_fields=SUMMARY_FIELDS + ["refreshed_at"],
+    )
+    return len(summaries)
+
+
+def refresh_has_lmp_data() -> int:
+    """
+    Flag summaries of substations that gained RTM LMP data.
+
+    One indexed ``UPDATE`` for use after LMP loads, which are too large to
+    trigger a summary refresh per row.
+    """
+    return (
+        SubstationSummary.objects.filter(has_lmp_data=False)
+        .filter(
+            Exists(
+                SubstationLMP.objects.filter(
+                    substation_id=OuterRef("substation_id"),
+                    market=SubstationLMPMarket.RTM_5min,
+                )
+            )
+        )
+        .update(has_lmp_data=True)
+    )
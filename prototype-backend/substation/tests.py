@@ -1,12 +1,57 @@
+import os
+import tempfile
+import threading
+
+from io import StringIO
+from unittest import mock
+
+import pandas as pd
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+from django.test import TransactionTestCase
+
 from core.tests.base_test import BaseAPITestCase
 
+from loaders.caiso_loader import load_queue_and_no_of_connections
+
 from substation.models import County
 from substation.models import Substation
+from substation.models import AverageLMP
+from substation.models import SubstationLMP
+from substation.models import AverageLMPType
+from substation.models import SubstationLMPMarket
 from substation.models import DatasourceType
 from substation.models import SubstationQueue
 from substation.models import SubstationStatus
+from substation.models import SubstationSummary
 from substation.models import TransmissionLine
 from substation.models import SubstationPolicyPortfolio
+from substation.models import LMPBackfillWindow
+
+from substation.aggregates import daily_lmp_aggregate_exists
+from substation.aggregates import calculate_and_save_avg_lmp_from_aggregate
+from substation.cron_jobs import load_caiso_queue_and_no_of_connections
+from substation.recievers import fill_missing_summaries_after_migrate
+from substation.rollups import pending_since
+from substation.rollups import LAST_DAY_FALLBACK
+from substation.rollups import rollup_daily_avg_lmp
+from substation.rollups import start_of_day
+from substation.lmp_storage import prune_raw_rtm_lmp
+from substation.lmp_writer import load_lmp_frame
+from substation.lmp_writer import substation_ids_by_code
+from substation.lmp_fetcher import RetryPolicy
+from substation.lmp_fetcher import FileCheckpoint
+from substation.lmp_fetcher import LMPFetchScheduler
+from substation.lmp_fetcher import FetchWindow
+from substation.lmp_fetcher import fetch_caiso_lmp
+from substation.market_data_lake import MarketDataLake
 
 
 class SubstationAPITestCase(BaseAPITestCase):
@@ -271,6 +316,75 @@ class SubstationFilterTestCase(BaseAPITestCase):
         self.request_and_assert_test_cases(self.URL, test_cases)
 
 
+class SubstationSummaryTestCase(BaseAPITestCase):
+    URL = "/api/v1/substations/"
+
+    def setUp(self):
+        super().setUp()
+        self.substation = Substation.objects.create(name="AIRWAYS", voltage=115)
+        self.status = SubstationStatus.objects.create(
+            substation=self.substation,
+            type=DatasourceType.HEATMAP,
+            available_capacity=100,
+            no_of_constraints=2,
+        )
+        SubstationQueue.objects.create(
+            substation=self.substation, queue=200, no_of_projects=3
+        )
+
+    def test_substation_list_reads_summary(self):
+        self.set_auth(self.user)
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        substation = response.data["data"][0]
+        self.assertEqual(
+            substation["status"],
+            [{"type": "heatmap", "available_capacity": 100, "no_of_constraints": 2}],
+        )
+        self.assertEqual(substation["queue"], [{"queue": 200, "no_of_projects": 3}])
+        self.assertEqual(substation["policy_portfolio"], [])
+        self.assertFalse(substation["has_lmp_data"])
+
+    def test_summary_follows_status_changes(self):
+        self.status.is_active = False
+        self.status.save()
+        self.substation.summary.refresh_from_db()
+        self.assertEqual(self.substation.summary.status, [])
+        self.assertIsNone(self.substation.summary.heatmap_available_capacity)
+
+        self.set_auth(self.user)
+        response = self.client.get(self.URL, {"available_capacity_min": 50})
+        self.assertEqual(len(response.data["data"]), 0)
+
+    def test_command_fills_missing_summaries(self):
+        SubstationSummary.objects.all().delete()
+        out = StringIO()
+        call_command("refresh_substation_summaries", stdout=out)
+        self.assertIn("Refreshed 1 substation summaries", out.getvalue())
+        summary = SubstationSummary.objects.get(substation=self.substation)
+        self.assertEqual(summary.heatmap_available_capacity, 100)
+
+    def test_migrate_fills_missing_summaries(self):
+        SubstationSummary.objects.all().delete()
+        fill_missing_summaries_after_migrate(
+            sender=None, app_config=apps.get_app_config("substation")
+        )
+        summary = SubstationSummary.objects.get(substation=self.substation)
+        self.assertEqual(summary.queue_mw, 200)
+
+    def test_queue_loader_update_refreshes_summary(self):
+        queue = pd.DataFrame(
+            {"Interconnection Location": ["AIRWAYS 115kV"], "Capacity (MW)": [50]}
+        )
+        with mock.patch(
+            "loaders.caiso_loader.fetch_interconnection_queue", return_value=queue
+        ):
+            load_queue_and_no_of_connections()
+        self.substation.summary.refresh_from_db()
+        self.assertEqual(self.substation.summary.queue_mw, 250)
+        self.assertEqual(self.substation.summary.no_of_projects, 4)
+
+
 class TransmissionLineAPITestCase(BaseAPITestCase):
     URL = "/api/v1/transmission-lines/"
 
@@ -296,3 +410,562 @@ class TransmissionLineAPITestCase(BaseAPITestCase):
         response = self.client.get(self.URL)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.data["data"]), len(self.transmission_lines))
+
+
+class AverageLMPAPITestCase(BaseAPITestCase):
+    URL = "/api/v1/average-lmp/"
+
+    def setUp(self):
+        super().setUp()
+        self.substations = Substation.objects.bulk_create(
+            [
+                Substation(name="AIRWAYS", voltage=115),
+                Substation(name="AIRCO", voltage=230),
+            ]
+        )
+        self.start = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+    def create_lmps(self, days):
+        AverageLMP.objects.bulk_create(
+            [
+                AverageLMP(
+                    substation=substation,
+                    type="actual",
+                    energy=30.5,
+                    congestion=-1.25,
+                    loss=0.75,
+                    total_lmp=30.0,
+                    opening_price=29.5,
+                    closing_price=31.0,
+                    time=self.start + timedelta(days=day),
+                )
+                for substation in self.substations
+                for day in range(days)
+            ]
+        )
+
+    def get_stream(self):
+        ids = ",".join(str(substation.id) for substation in self.substations)
+        response = self.client.get(self.URL, {"ids": ids, "type": "actual"})
+        self.assertEqual(response.status_code, 200)
+        return self.collect_stream_chunks(response)
+
+    def test_average_lmp_stream(self):
+        self.create_lmps(2)
+        self.set_auth(self.user)
+        data = self.get_stream()
+        self.assertEqual(data["columns"][0], "Substation")
+        self.assertEqual(len(data["rows"]), 4)
+        self.assertIn(
+            [
+                self.substations[0].name,
+                str(self.substations[0].id),
+                "30.5",
+                "-1.25",
+                "0.75",
+                "30",
+                "29.5",
+                "31",
+                str(self.start),
+            ],
+            data["rows"],
+        )
+
+    def test_average_lmp_stream_query_count_is_constant(self):
+        self.create_lmps(50)
+        self.set_auth(self.user)
+        # Authentication plus one joined query, however many rows are streamed
+        with self.assertNumQueries(2):
+            data = self.get_stream()
+        self.assertEqual(len(data["rows"]), 100)
+
+    def test_average_lmp_requires_ids(self):
+        self.set_auth(self.user)
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 400)
+
+
+class DailyLMPAggregateTestCase(TransactionTestCase):
+    # Refreshing a continuous aggregate cannot run inside a transaction
+
+    def setUp(self):
+        if not daily_lmp_aggregate_exists():
+            self.skipTest("Continuous aggregates are unavailable")
+        self.substation = Substation.objects.create(
+            name="AIRWAYS", voltage=115, code="AIRWAYS_1_N001"
+        )
+        # Midnight PST
+        self.start = datetime(2024, 6, 1, 8, tzinfo=timezone.utc)
+        SubstationLMP.objects.bulk_create(
+            [
+                SubstationLMP(
+                    substation=self.substation,
+                    market=SubstationLMPMarket.RTM_5min,
+                    energy=30 + hour,
+                    congestion=1,
+                    loss=0.5,
+                    time=self.start + timedelta(hours=hour),
+                )
+                for hour in range(48)
+            ]
+        )
+
+    def test_actual_average_lmp_from_aggregate(self):
+        self.assertEqual(calculate_and_save_avg_lmp_from_aggregate(), 2)
+        first_day = (
+            AverageLMP.objects.filter(type=AverageLMPType.ACTUAL)
+            .order_by("time")
+            .first()
+        )
+        self.assertEqual(first_day.time, self.start)
+        self.assertAlmostEqual(first_day.energy, 41.5)
+        self.assertAlmostEqual(first_day.total_lmp, 43)
+        self.assertAlmostEqual(first_day.opening_price, 31.5)
+        self.assertAlmostEqual(first_day.closing_price, 54.5)
+
+        # Days already saved are not saved again
+        self.assertEqual(calculate_and_save_avg_lmp_from_aggregate(), 0)
+
+
+class DailyLMPRollupTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.substation = Substation.objects.create(
+            name="AIRWAYS", voltage=115, code="AIRWAYS_1_N001"
+        )
+        # Midnight PST
+        self.start = datetime(2024, 6, 1, 8, tzinfo=timezone.utc)
+        SubstationLMP.objects.bulk_create(
+            [
+                SubstationLMP(
+                    substation=self.substation,
+                    market=market,
+                    energy=30 + hour,
+                    congestion=1,
+                    loss=0.5,
+                    time=self.start + timedelta(hours=hour),
+                )
+                for hour in range(48)
+                for market in SubstationLMPMarket.values
+            ]
+        )
+
+    def test_rollup_daily_avg_lmp(self):
+        self.assertEqual(rollup_daily_avg_lmp(self.start), 2)
+        averages = AverageLMP.objects.filter(type=AverageLMPType.ACTUAL).order_by(
+            "time"
+        )
+        self.assertEqual(
+            [average.time for average in averages],
+            [self.start, self.start + timedelta(days=1)],
+        )
+        first_day = averages[0]
+        # Only RTM rows are averaged
+        self.assertAlmostEqual(first_day.energy, 41.5)
+        self.assertAlmostEqual(first_day.total_lmp, 43)
+        self.assertAlmostEqual(first_day.opening_price, 31.5)
+        self.assertAlmostEqual(first_day.closing_price, 54.5)
+
+    def test_pending_since_skips_substations_without_new_prices(self):
+        today = start_of_day(self.start + timedelta(days=3))
+        # No prices at all, and prices that stopped after being rolled up
+        Substation.objects.create(name="BAHIA", voltage=230, code="BAHIA_1_N001")
+        stopped = Substation.objects.create(
+            name="CAYETANO", voltage=230, code="CAYETANO_1_N001"
+        )
+        SubstationLMP.objects.create(
+            substation=stopped,
+            market=SubstationLMPMarket.RTM_5min,
+            energy=30,
+            congestion=1,
+            loss=0.5,
+            time=self.start - timedelta(days=20),
+        )
+        AverageLMP.objects.create(
+            substation=stopped,
+            type=AverageLMPType.ACTUAL,
+            time=start_of_day(self.start - timedelta(days=20)),
+        )
+        self.assertEqual(pending_since(today), start_of_day(self.start))
+
+        rollup_daily_avg_lmp(self.start)
+        self.assertEqual(pending_since(today), today)
+
+    def test_rollup_is_idempotent(self):
+        rollup_daily_avg_lmp(self.start)
+        SubstationLMP.objects.filter(time=self.start).update(energy=60)
+        rollup_daily_avg_lmp(self.start)
+        averages = AverageLMP.objects.filter(type=AverageLMPType.ACTUAL)
+        self.assertEqual(averages.count(), 2)
+        self.assertAlmostEqual(averages.order_by("time")[0].opening_price, 61.5)
+
+
+class LMPWriterTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.substation = Substation.objects.create(
+            name="AIRWAYS", voltage=115, code="AIRWAYS_1_N001"
+        )
+        self.times = pd.date_range(
+            "2024-06-01", periods=3, freq="5min", tz="America/Los_Angeles"
+        )
+
+    def lmp_data(self, energy):
+        return pd.DataFrame(
+            {
+                "Time": list(self.times) * 2,
+                "Location": ["AIRWAYS_1_N001"] * 3 + ["UNKNOWN_NODE"] * 3,
+                "Energy": [energy] * 6,
+                "Congestion": [1.0] * 6,
+                "Loss": [None] * 6,
+            }
+        )
+
+    def test_load_lmp_frame(self):
+        substation_ids = substation_ids_by_code()
+        written = load_lmp_frame(
+            self.lmp_data(30.0), SubstationLMPMarket.RTM_5min, substation_ids
+        )
+        self.assertEqual(written, 3)
+        lmps = SubstationLMP.objects.filter(substation=self.substation)
+        self.assertEqual(lmps.count(), 3)
+        self.assertIsNone(lmps.first().loss)
+
+    def test_load_lmp_frame_updates_existing_rows(self):
+        substation_ids = substation_ids_by_code()
+        for energy, market in [
+            (30.0, SubstationLMPMarket.RTM_5min),
+            (45.0, SubstationLMPMarket.RTM_5min),
+            (20.0, SubstationLMPMarket.DAM),
+        ]:
+            load_lmp_frame(self.lmp_data(energy), market, substation_ids)
+        rtm = SubstationLMP.objects.filter(market=SubstationLMPMarket.RTM_5min)
+        self.assertEqual(rtm.count(), 3)
+        self.assertEqual(set(rtm.values_list("energy", flat=True)), {45.0})
+        self.assertEqual(SubstationLMP.objects.count(), 6)
+
+
+class LMPFetchSchedulerTestCase(SimpleTestCase):
+    START = "2024-06-01T00:00Z"
+    END = "2024-06-02T00:00Z"
+
+    def setUp(self):
+        self.fetched = []
+        self.written = []
+        self.failures = {}
+
+    def fetch(self, market, window):
+        self.fetched.append(window.key)
+        # The 03:00 window is throttled twice before succeeding
+        if window.start.hour == 3 and self.failures.get(window.key, 0) < 2:
+            self.failures[window.key] = self.failures.get(window.key, 0) + 1
+            raise RuntimeError("429 Too Many Requests")
+        return pd.DataFrame({"Location": ["AIRWAYS_1_N001"] * 12})
+
+    def write(self, frame):
+        # Only the calling thread writes to the database
+        self.assertIs(threading.current_thread(), threading.main_thread())
+        self.written.append(len(frame))
+        return len(frame)
+
+    def scheduler(self, **kwargs):
+        return LMPFetchScheduler(
+            SubstationLMPMarket.RTM_5min,
+            fetch=self.fetch,
+            write=self.write,
+            workers=4,
+            rate=0,
+            retry=RetryPolicy(attempts=3, backoff=0),
+            **kwargs,
+        )
+
+    def test_fetches_every_window_once_with_retries(self):
+        stats = self.scheduler().run(self.START, self.END)
+        self.assertEqual(stats.windows, 24)
+        self.assertEqual(stats.rows, 24 * 12)
+        self.assertEqual(stats.failed, [])
+        self.assertEqual(len(self.fetched), 26)
+
+    def test_failed_windows_are_reported(self):
+        scheduler = self.scheduler()
+        scheduler.retry = RetryPolicy(attempts=1, backoff=0)
+        stats = scheduler.run(self.START, self.END)
+        self.assertEqual(stats.windows, 23)
+        self.assertEqual([window.start.hour for window in stats.failed], [3])
+
+    def test_checkpoint_skips_completed_windows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = FileCheckpoint(os.path.join(directory, "lmp.jsonl"))
+            self.scheduler(checkpoint=checkpoint).run(self.START, "2024-06-01T12:00Z")
+            stats = self.scheduler(checkpoint=checkpoint).run(self.START, self.END)
+        self.assertEqual(stats.skipped, 12)
+        self.assertEqual(stats.windows, 12)
+
+    def test_lake_serves_stored_windows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.scheduler(lake=MarketDataLake(directory)).run(self.START, self.END)
+            self.fetched = []
+            lake = MarketDataLake(directory)
+            stats = self.scheduler(lake=lake).run(self.START, self.END)
+            self.assertEqual(len(lake.manifest()), 24)
+        self.assertEqual(self.fetched, [])
+        self.assertEqual(stats.rows, 24 * 12)
+
+    def test_naive_bounds_are_utc(self):
+        self.scheduler().run("2024-06-01T00:00", "2024-06-01T02:00")
+        self.assertEqual(
+            sorted(self.fetched),
+            [
+                "2024-06-01T00:00:00+00:00/2024-06-01T01:00:00+00:00",
+                "2024-06-01T01:00:00+00:00/2024-06-01T02:00:00+00:00",
+            ],
+        )
+
+    def test_caiso_fetch_passes_utc_bounds(self):
+        # A naive date string would be read by gridstatus as US/Pacific time
+        iso = mock.Mock()
+        window = FetchWindow(
+            pd.Timestamp("2024-06-01T00:00Z"), pd.Timestamp("2024-06-01T01:00Z")
+        )
+        with mock.patch("substation.lmp_fetcher.gridstatus.CAISO", return_value=iso):
+            with mock.patch("substation.lmp_fetcher._local", threading.local()):
+                fetch_caiso_lmp(SubstationLMPMarket.RTM_5min, window)
+        kwargs = iso.get_lmp.call_args.kwargs
+        self.assertEqual(kwargs["date"], window.start)
+        self.assertEqual(kwargs["end"], window.end)
+        self.assertEqual(str(kwargs["date"].tz), "UTC")
+
+
+class MarketDataLakeTestCase(SimpleTestCase):
+    START = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    END = datetime(2024, 6, 1, 1, tzinfo=timezone.utc)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        self.lake = MarketDataLake(self.root)
+
+    def test_put_is_partitioned_and_listed_in_manifest(self):
+        frame = pd.DataFrame({"Location": ["AIRWAYS_1_N001"], "LMP": [21.5]})
+        path = self.lake.put("lmp", "caiso", "DAM", self.START, self.END, frame)
+        self.assertIn(
+            os.path.join("lmp", "iso=caiso", "market=DAM", "date=2024-06-01"), path
+        )
+        lake = MarketDataLake(self.root)
+        stored = lake.get("lmp", "caiso", "DAM", self.START, self.END)
+        pd.testing.assert_frame_equal(stored, frame)
+        self.assertIsNone(lake.get("lmp", "caiso", "RTM_5min", self.START, self.END))
+
+    def test_cached_skips_empty_and_unfinished_windows(self):
+        def fetch():
+            return pd.DataFrame({"Location": ["AIRWAYS_1_N001"]})
+
+        self.lake.cached("lmp", "caiso", "DAM", self.START, self.END, pd.DataFrame)
+        now = datetime.now(timezone.utc)
+        self.lake.cached("lmp", "caiso", "DAM", now, now + timedelta(hours=1), fetch)
+        self.assertEqual(self.lake.manifest(), {})
+
+    def put_hour(self, hours, shift=timedelta(0)):
+        start = self.START + timedelta(hours=hours)
+        end = start + timedelta(hours=1)
+        frame = pd.DataFrame(
+            {
+                "Time": pd.date_range(
+                    start + shift, end + shift, freq="5min", inclusive="left"
+                ),
+                "Location": "AIRWAYS_1_N001",
+                "Energy": 30.0,
+            }
+        )
+        self.lake.put("lmp", "caiso", "RTM_5min", start, end, frame)
+
+    def test_window_is_cut_from_covering_windows(self):
+        self.put_hour(0)
+        self.put_hour(1)
+        lake = MarketDataLake(self.root)
+        for start, end in [
+            (self.START, self.START + timedelta(hours=2)),
+            (self.START + timedelta(minutes=30), self.START + timedelta(minutes=90)),
+        ]:
+            frame = lake.cached(
+                "lmp", "caiso", "RTM_5min", start, end, lambda: self.fail(start)
+            )
+            self.assertEqual(len(frame), (end - start) // timedelta(minutes=5))
+            self.assertEqual(frame["Time"].min(), start)
+        self.assertEqual(len(lake.manifest()), 2)
+
+    def test_window_with_a_gap_is_fetched(self):
+        self.put_hour(0)
+        self.put_hour(2)
+        end = self.START + timedelta(hours=3)
+        fetched = pd.DataFrame({"Time": [self.START], "Location": ["AIRWAYS_1_N001"]})
+        frame = self.lake.cached(
+            "lmp", "caiso", "RTM_5min", self.START, end, lambda: fetched
+        )
+        self.assertIs(frame, fetched)
+
+    def test_windows_without_the_requested_rows_are_fetched(self):
+        # Pulls stored with their times shifted by the Pacific offset
+        self.put_hour(0, shift=timedelta(hours=8))
+        self.put_hour(1, shift=timedelta(hours=8))
+        fetched = pd.DataFrame({"Time": [self.START], "Location": ["AIRWAYS_1_N001"]})
+        for start, end in [
+            (self.START, self.START + timedelta(hours=1)),
+            (self.START + timedelta(minutes=30), self.START + timedelta(minutes=90)),
+        ]:
+            frame = self.lake.cached(
+                "lmp", "caiso", "RTM_5min", start, end, lambda: fetched
+            )
+            self.assertIs(frame, fetched)
+
+    def test_snapshot_replays_stored_day(self):
+        queue = pd.DataFrame({"Capacity (MW)": [50, "TBD"]})
+        self.lake.cached_snapshot("interconnection_queue", "caiso", "all", lambda: queue)
+        replayed = self.lake.cached_snapshot(
+            "interconnection_queue",
+            "caiso",
+            "all",
+            self.fail,
+            datetime.now(timezone.utc).date(),
+        )
+        self.assertEqual(list(replayed["Capacity (MW)"]), ["50", "TBD"])
+
+    def test_queue_job_skips_missing_pull(self):
+        with mock.patch(
+            "loaders.caiso_loader.fetch_interconnection_queue", return_value=None
+        ):
+            load_caiso_queue_and_no_of_connections.call_local()
+
+
+class BackfillLMPCommandTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        Substation.objects.create(name="AIRWAYS", voltage=115, code="AIRWAYS_1_N001")
+        self.fetched = []
+        self.unavailable = set()
+
+    def fetch(self, market, window):
+        self.fetched.append(window.start.hour)
+        if window.start.hour in self.unavailable:
+            raise RuntimeError("503 Service Unavailable")
+        return pd.DataFrame(
+            {
+                "Time": pd.date_range(
+                    window.start, window.end, freq="5min", inclusive="left"
+                ),
+                "Location": "AIRWAYS_1_N001",
+                "Energy": 30.0,
+                "Congestion": 1.0,
+                "Loss": 0.5,
+            }
+        )
+
+    def backfill(self):
+        with mock.patch.dict(
+            "substation.management.commands.backfill_lmp.ISO_FETCHERS",
+            {"caiso": self.fetch},
+        ), mock.patch(
+            "substation.management.commands.backfill_lmp.market_data_lake",
+            return_value=None,
+        ):
+            call_command(
+                "backfill_lmp",
+                "--start=2024-06-01T00:00",
+                "--end=2024-06-01T06:00",
+                "--workers=3",
+                "--rate=0",
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+
+    def test_resumes_after_failed_windows(self):
+        self.unavailable = {2}
+        with mock.patch("substation.lmp_fetcher.RetryPolicy.delay", return_value=0):
+            with self.assertRaises(CommandError):
+                self.backfill()
+        self.assertEqual(LMPBackfillWindow.objects.count(), 5)
+        self.assertEqual(SubstationLMP.objects.count(), 5 * 12)
+
+        self.unavailable = set()
+        self.fetched = []
+        self.backfill()
+        self.assertEqual(self.fetched, [2])
+        self.assertEqual(LMPBackfillWindow.objects.count(), 6)
+        self.assertEqual(SubstationLMP.objects.count(), 6 * 12)
+
+
+class RawRTMRetentionTestCase(BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.substation = Substation.objects.create(
+            name="AIRWAYS", voltage=115, code="AIRWAYS_1_N001"
+        )
+        now = datetime.now(timezone.utc)
+        SubstationLMP.objects.bulk_create(
+            [
+                SubstationLMP(
+                    substation=self.substation,
+                    market=market,
+                    energy=30,
+                    congestion=1,
+                    loss=0.5,
+                    time=now - timedelta(days=days),
+                )
+                for market, days in [
+                    (SubstationLMPMarket.RTM_5min, 40),
+                    (SubstationLMPMarket.RTM_5min, 10),
+                    (SubstationLMPMarket.DAM, 40),
+                ]
+            ]
+        )
+
+    def test_prunes_rolled_up_rtm_past_retention(self):
+        AverageLMP.objects.create(
+            substation=self.substation,
+            type=AverageLMPType.ACTUAL,
+            time=start_of_day(datetime.now(timezone.utc)) - timedelta(days=1),
+        )
+        self.assertEqual(prune_raw_rtm_lmp(0), 0)
+        self.assertEqual(prune_raw_rtm_lmp(30), 1)
+        self.assertEqual(
+            SubstationLMP.objects.filter(market=SubstationLMPMarket.RTM_5min).count(),
+            1,
+        )
+        self.assertEqual(
+            SubstationLMP.objects.filter(market=SubstationLMPMarket.DAM).count(), 1
+        )
+
+    def test_keeps_days_not_rolled_up(self):
+        self.assertEqual(prune_raw_rtm_lmp(30), 0)
+        self.assertEqual(SubstationLMP.objects.count(), 3)
+
+    def test_keeps_days_not_rolled_up_past_the_rollup_lookback(self):
+        AverageLMP.objects.create(
+            substation=self.substation,
+            type=AverageLMPType.ACTUAL,
+            time=start_of_day(datetime.now(timezone.utc)) - timedelta(days=1),
+        )
+        # Never rolled up, and older than the rollup looks back
+        substation = Substation.objects.create(
+            name="BAHIA", voltage=230, code="BAHIA_1_N001"
+        )
+        SubstationLMP.objects.create(
+            substation=substation,
+            market=SubstationLMPMarket.RTM_5min,
+            energy=30,
+            congestion=1,
+            loss=0.5,
+            time=datetime.now(timezone.utc) - timedelta(days=LAST_DAY_FALLBACK + 50),
+        )
+        self.assertEqual(prune_raw_rtm_lmp(LAST_DAY_FALLBACK + 20), 0)
+        self.assertEqual(SubstationLMP.objects.count(), 4)
+
+    def test_substations_without_prices_do_not_hold_back_retention(self):
+        Substation.objects.create(name="BAHIA", voltage=230, code="BAHIA_1_N001")
+        AverageLMP.objects.create(
+            substation=self.substation,
+            type=AverageLMPType.ACTUAL,
+            time=start_of_day(datetime.now(timezone.utc)) - timedelta(days=1),
+        )
+        self.assertEqual(prune_raw_rtm_lmp(30), 1)
@@ -1,7 +1,5 @@
 import pytz
 import requests
-import gridstatus
-import pandas as pd
 
 from datetime import datetime
 from datetime import timedelta
@@ -12,6 +10,9 @@ from django.db.models import Avg
 from django.utils import timezone
 
 from substation import models
+from substation.summary import refresh_has_lmp_data
+from substation.lmp_fetcher import LMPFetchScheduler
+from substation.market_data_lake import market_data_lake
 
 from utils.cosmic_ai_requests import get_forecased_data
 from project.env import ENV
@@ -37,48 +38,23 @@ def get_last_lmp_date(
     return None
 
 
-def load_lmp_from_date_range(start_datetime: str, end_datetime: str, market: str):
-    iso = gridstatus.CAISO()
-    start = pd.Timestamp(start_datetime)
-    end = pd.Timestamp(end_datetime)
-    current = start
-    while current < end:
-        next_ = min(current + pd.Timedelta(hours=1), end)
-        print(f"Fetching data from {current} to {next_}")
-
-        lmp_data = iso.get_lmp(
-            locations="all",
-            market=(
-                gridstatus.Markets.DAY_AHEAD_HOURLY
-                if market == models.SubstationLMPMarket.DAM
-                else gridstatus.Markets.REAL_TIME_5_MIN
-            ),
-            date=current.strftime("%Y-%m-%dT%H:%M"),
-            end=next_.strftime("%Y-%m-%dT%H:%M"),
-        )
-        for _, row in lmp_data.iterrows():
-            try:
-                substation = models.Substation.objects.filter(
-                    code=row["Location"]
-                ).first()
-                if not substation:
-                    continue
-                models.SubstationLMP.objects.get_or_create(
-                    substation=substation,
-                    energy=row["Energy"],
-                    congestion=row["Congestion"],
-                    loss=row["Loss"],
-                    time=row["Time"],
-                    market=market,
-                )
-                logger.info(
-                    f"Substation LMP created: {row['Location']} ({row['Time']})"
-                )
-            except Exception as e:
-                logger.error(f"Error creating Substation LMP: {e}")
-                continue
-
-        current = next_
+def load_lmp_from_date_range(
+    start_datetime: str, end_datetime: str, market: str, checkpoint=None
+):
+    print(f"Fetching data from {start_datetime} to {end_datetime}")
+    scheduler = LMPFetchScheduler(
+        market, checkpoint=checkpoint, lake=market_data_lake()
+    )
+    stats = scheduler.run(start_datetime, end_datetime)
+    logger.info(
+        f"Substation LMPs saved: {stats.rows} in {stats.windows} windows "
+        f"({stats.rows_per_second:,.0f} rows/s, {stats.skipped} already loaded)"
+    )
+    for window in stats.failed:
+        logger.error(f"Substation LMPs not loaded for {window.key}")
+
+    if market == models.SubstationLMPMarket.RTM_5min:
+        refresh_has_lmp_data()
 
 
 def calculate_avg_lmp_from_date_range(
@@ -1,8 +1,8 @@
-from django.db.models import OuterRef
-from django.db.models import Prefetch
-from django.db.models import Exists
+from django.db.models import Value
+from django.db.models import TextField
+from django.db.models.functions import Cast
+from django.db.models.functions import Coalesce
 from django_filters import rest_framework as filters
-from django.http import StreamingHttpResponse
 
 
 from rest_framework import status
@@ -12,17 +12,13 @@ from rest_framework import filters as drf_filters
 from rest_framework.permissions import IsAuthenticated
 
 from core.base_views import BaseReadOnlyAPIView
-from core.renderers import generate_json_response
+from core.db_functions import ToChar
+from core.renderers import streaming_json_response
 
 from substation.models import County
 from substation.models import Substation
 from substation.models import AverageLMP
-from substation.models import SubstationLMP
-from substation.models import SubstationQueue
-from substation.models import SubstationStatus
 from substation.models import TransmissionLine
-from substation.models import SubstationLMPMarket
-from substation.models import SubstationPolicyPortfolio
 
 from substation.serializers import CountyOut
 from substation.serializers import SubstationOut
@@ -56,8 +52,27 @@ class AverageLMPListAPIView(BaseReadOnlyAPIView):
     filterset_class = AverageLMPFilter
     permission_classes = [IsAuthenticated]
 
+    # One joined query; values are stringified by the database so rows go
+    # straight from the cursor to the encoder
+    stream_columns = {
+        "Substation": Coalesce("substation__name", Value("")),
+        "Substation ID": Cast("substation_id", TextField()),
+        "Energy": Cast("energy", TextField()),
+        "Congestion": Cast("congestion", TextField()),
+        "Loss": Cast("loss", TextField()),
+        "LMP": Cast("total_lmp", TextField()),
+        "Opening Price": Cast("opening_price", TextField()),
+        "Closing Price": Cast("closing_price", TextField()),
+        # Same format as str() of a UTC datetime
+        "Time": ToChar("time", Value('YYYY-MM-DD HH24:MI:SS"+00:00"')),
+    }
+
     def list(self, request, *args, **kwargs):
-        substation_ids = request.query_params.get("ids", "").split(",")
+        substation_ids = [
+            substation_id
+            for substation_id in request.query_params.get("ids", "").split(",")
+            if substation_id.strip()
+        ]
         if not substation_ids:
             return Response(
                 {"error": "Please provide at least one substation ID."},
@@ -66,38 +81,11 @@ class AverageLMPListAPIView(BaseReadOnlyAPIView):
         queryset = self.filter_queryset(self.get_queryset())
         queryset = queryset.filter(substation_id__in=substation_ids)
 
-        column_headers = [
-            "Substation",
-            "Substation ID",
-            "Energy",
-            "Congestion",
-            "Loss",
-            "LMP",
-            "Opening Price",
-            "Closing Price",
-            "Time",
-        ]
-
-        def row_transform(obj):
-            return [
-                obj.substation.name if obj.substation else "",
-                str(obj.substation.id) if obj.substation else "",
-                str(obj.energy),
-                str(obj.congestion),
-                str(obj.loss),
-                str(obj.total_lmp),
-                str(obj.opening_price),
-                str(obj.closing_price),
-                str(obj.time),
-            ]
-
-        response_generator = generate_json_response(
-            queryset, column_headers, row_transform
-        )
-
-        return StreamingHttpResponse(
-            response_generator,
-            content_type="text/event-stream",
+        return streaming_json_response(
+            request,
+            queryset,
+            list(self.stream_columns),
+            fields=list(self.stream_columns.values()),
         )
 
 
@@ -113,30 +101,9 @@ class SubstationListAPIView(BaseReadOnlyAPIView):
 
     def get_queryset(self):
         return (
-            Substation.objects.all()
-            .prefetch_related(
-                Prefetch(
-                    "substationstatus_set",
-                    queryset=SubstationStatus.objects.filter(is_active=True),
-                ),
-                Prefetch(
-                    "substationqueue_set",
-                    queryset=SubstationQueue.objects.filter(is_active=True),
-                ),
-                Prefetch(
-                    "substationpolicyportfolio_set",
-                    queryset=SubstationPolicyPortfolio.objects.filter(is_active=True),
-                ),
-            )
-            .annotate(
-                has_lmp_data=Exists(
-                    SubstationLMP.objects.filter(
-                        substation_id=OuterRef("id"),
-                        market=SubstationLMPMarket.RTM_5min,
-                    )
-                )
-            )
-            .distinct("id")
+            Substation.objects.select_related("county", "summary")
+            .all()
+            .order_by("id")
         )
 
     def validate_substation_ids(self, substation_ids):
@@ -167,7 +134,7 @@ class SubstationListAPIView(BaseReadOnlyAPIView):
         if error_response:
             return error_response
 
-        substations = Substation.objects.filter(id__in=substation_ids)
+        substations = self.get_queryset().filter(id__in=substation_ids)
         serializer = self.get_serializer(substations, many=True)
         return Response({"data": serializer.data}, status=status.HTTP_200_OK)
 
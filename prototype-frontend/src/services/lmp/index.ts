@@ -102,27 +102,22 @@ export function useGetAverageLMPData(
         }
 
         let done = false;
+        let buffer = "";
         let tempData = { columns: [] as string[], rows: [] as string[][] };
 
+        // The response is NDJSON: one {"columns"} or {"rows"} object per line,
+        // and a read may end partway through a line
         while (!done && isMounted) {
           const { value, done: readerDone } = await reader.read();
           done = readerDone;
 
-          if (value) {
-            const chunk = decoder.decode(value, { stream: true });
-            let parsedChunk: LMPResponse = { columns: [], rows: [] };
-
-            try {
-              parsedChunk = JSON.parse(chunk);
-            } catch (error) {
-              // Handle split JSON chunks
-              const splitJson = chunk.split("}{").map((part, index, array) => {
-                if (index === 0) return part + "}";
-                if (index === array.length - 1) return "{" + part;
-                return "{" + part + "}";
-              });
-              parsedChunk = splitJson.map((json) => JSON.parse(json))[0];
-            }
+          buffer += decoder.decode(value, { stream: !readerDone });
+          const lines = buffer.split("\n");
+          buffer = done ? "" : lines.pop() ?? "";
+
+          for (const line of lines) {
+            if (!line.trim()) continue;
+            const parsedChunk: LMPResponse = JSON.parse(line);
 
             if (parsedChunk.columns) {
               tempData = { ...tempData, columns: parsedChunk.columns };
@@ -130,13 +125,13 @@ export function useGetAverageLMPData(
             if (parsedChunk.rows) {
               tempData = {
                 ...tempData,
-                rows: [...tempData.rows, ...parsedChunk.rows],
+                rows: tempData.rows.concat(parsedChunk.rows),
               };
             }
+          }
 
-            if (isMounted) {
-              setCurrentData(tempData);
-            }
+          if (isMounted) {
+            setCurrentData(tempData);
           }
         }
       } catch (err: any) {
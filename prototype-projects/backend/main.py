@@ -210,15 +210,18 @@ async def upload_file(file: UploadFile = File(...)):
     finally:
         file.file.close()  # Ensure the file is closed
 
-@app.get("/api/get_projects/{iso}")
+# Deprecated: the QueueInfo project API now lives in fastapi-backend under
+# /api/projects/ (cursor pagination on its pooled async engine). These offset
+# routes stay only until dashboard.html, ui.new.html and js/report.js move to it.
+@app.get("/api/get_projects/{iso}", deprecated=True)
 async def get_projects(iso: str, offset: Union[int, None] = 0, limit: Union[int, None] = 10):
     return get_project_internal(iso, offset, limit)
 
-@app.get("/api/get_projects")
+@app.get("/api/get_projects", deprecated=True)
 async def get_projects(iso: Union[str, None] = None, offset: Union[int, None] = 0, limit: Union[int, None] = 10):
     return get_project_internal(iso, offset, limit)
 
-@app.get("/api/get_project_details")
+@app.get("/api/get_project_details", deprecated=True)
 async def get_project_detail(isoId: Union[str, None] = None, queueId: Union[str, None] = None):
     return get_project_details_internal(isoId, queueId)
 
@@ -233,15 +236,14 @@ def get_project_internal(iso: str, offset: int, limit: int):
             if not iso:
                 cursor.execute("SELECT COUNT(*) FROM QueueInfo WHERE upper(Status) = 'ACTIVE'")
             else:
-                cursor.execute("SELECT COUNT(*) FROM QueueInfo WHERE upper(Status) = 'ACTIVE' AND IsoID = '" + iso + "'")
+                cursor.execute("SELECT COUNT(*) FROM QueueInfo WHERE upper(Status) = 'ACTIVE' AND IsoID = %s", (iso,))
 
             count = cursor.fetchone()
             count = count[0]
             if not iso:
-                stmt = "SELECT * FROM QueueInfo WHERE upper(Status) = 'ACTIVE' LIMIT " + str(limit) + " OFFSET " + str(offset)
+                cursor.execute("SELECT * FROM QueueInfo WHERE upper(Status) = 'ACTIVE' LIMIT %s OFFSET %s", (limit, offset))
             else:
-                stmt = "SELECT * FROM QueueInfo WHERE upper(Status) = 'ACTIVE' AND IsoID = '" + iso + "' LIMIT " + str(limit) + " OFFSET " + str(offset)
-            cursor.execute(stmt)
+                cursor.execute("SELECT * FROM QueueInfo WHERE upper(Status) = 'ACTIVE' AND IsoID = %s LIMIT %s OFFSET %s", (iso, limit, offset))
 
             results = cursor.fetchall()
                 
@@ -284,8 +286,7 @@ def get_project_details_internal(isoId: str, queueId: str):
                             port=POWERNOVA_PORT) as conn:
         with conn.cursor() as cursor:
             cursor = conn.cursor()
-            stmt = "SELECT * FROM QueueInfo WHERE IsoId = '" + isoId + "' AND QueueId='" + queueId + "'"
-            cursor.execute(stmt)
+            cursor.execute("SELECT * FROM QueueInfo WHERE IsoId = %s AND QueueId = %s", (isoId, queueId))
 
             row = cursor.fetchone()
                 